@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Asyncio facade over SileroTTS for embedding in async services.
+
+Model loading and inference run on a dedicated, bounded thread pool, so
+the event loop never blocks on ``torch.jit.load`` or ``apply_tts``. At most
+``max_pending`` calls may be queued or running at once. Further callers wait
+for a slot, which gives natural backpressure. Each call has a timeout. All
+callers share one engine and therefore one set of loaded models.
+
+    async with AsyncSileroTTS(models_dir="models/tts") as tts:
+        await tts.load_model("v3_en")
+        audio = await tts.speak("Hello", speaker="en_0", model_name="v3_en")
+        async for chunk in tts.speak_stream(long_text, model_name="v3_en"):
+            ...
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional
+import numpy as np
+from text_utils import split_sentences
+
+DEFAULT_TIMEOUT = 120.0
+LOAD_TIMEOUT = 300.0
+
+
+class AsyncSileroTTS:
+    def __init__(self, tts=None, models_dir: str = 'models/tts', max_workers: int = 2,
+                 max_pending: int = 16, timeout: Optional[float] = DEFAULT_TIMEOUT):
+        if tts is None:
+            from tts_engine import SileroTTS
+            tts = SileroTTS(models_dir)
+        self.tts = tts
+        self.timeout = timeout
+        self.max_pending = max(max_workers, max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts-async")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def supported_models(self) -> dict:
+        return self.tts.supported_models
+
+    @property
+    def pending(self) -> int:
+        """Calls currently queued or running on the executor"""
+        return self._pending
+
+    async def _run(self, timeout: Optional[float], fn, *args, **kwargs):
+        if self._closed:
+            raise RuntimeError("AsyncSileroTTS is closed")
+        loop = asyncio.get_running_loop()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        slots = self._slots
+
+        await slots.acquire()
+        try:
+            job = self._executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            slots.release()
+            raise
+        self._pending += 1
+
+        # The slot is held until the worker is really done. A call that timed
+        # out keeps its slot until the model returns, so timeouts cannot
+        # overcommit the executor.
+        def finished():
+            self._pending -= 1
+            slots.release()
+
+        def release(_):
+            try:
+                loop.call_soon_threadsafe(finished)
+            except RuntimeError:
+                pass  # loop already closed
+        job.add_done_callback(release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{getattr(fn, '__name__', 'call')} timed out after {timeout}s")
+
+    async def load_model(self, model_name: str, activate: bool = True,
+                         timeout: Optional[float] = LOAD_TIMEOUT) -> bool:
+        """Load a model off the event loop; concurrent loads of one model share a single load"""
+        lock = self._load_locks.setdefault(model_name, asyncio.Lock())
+        async with lock:
+            if model_name in self.tts.models:
+                if activate:
+                    self.tts.current_model = model_name
+                return True
+            return await self._run(timeout, self.tts.load_model, model_name, activate)
+
+    async def speak(self, text: str, speaker: str = None, ssml: bool = False,
+                    sample_rate: Optional[int] = None, model_name: Optional[str] = None,
+                    timeout: Optional[float] = None) -> np.ndarray:
+        # Resolve the model now so a later load_model() can't change what this call uses
+        model_name = model_name or self.tts.current_model
+        return await self._run(timeout or self.timeout, self.tts.speak, text, speaker=speaker,
+                               ssml=ssml, sample_rate=sample_rate, model_name=model_name)
+
+    async def speak_stream(self, text: str, speaker: str = None, ssml: bool = False,
+                           sample_rate: Optional[int] = None, model_name: Optional[str] = None,
+                           timeout: Optional[float] = None) -> AsyncIterator[np.ndarray]:
+        """Yield audio per sentence, synthesizing the next sentence while the caller consumes one"""
+        model_name = model_name or self.tts.current_model
+        if ssml and self.tts.supports_ssml(model_name):
+            yield await self.speak(text, speaker, True, sample_rate, model_name, timeout)
+            return
+
+        chunks = split_sentences(text)
+        if not chunks:
+            raise ValueError("Empty text input")
+
+        def start(chunk):
+            return asyncio.ensure_future(
+                self.speak(chunk, speaker, False, sample_rate, model_name, timeout))
+
+        upcoming = start(chunks[0])
+        try:
+            for index in range(len(chunks)):
+                current = upcoming
+                upcoming = start(chunks[index + 1]) if index + 1 < len(chunks) else None
+                yield await current
+        finally:
+            if upcoming is not None and not upcoming.done():
+                upcoming.cancel()
+
+    async def close(self):
+        """Stop accepting work and wait for running calls to finish"""
+        if self._closed:
+            return
+        self._closed = True
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self._executor.shutdown, wait=True))
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import os
+import hashlib
+import threading
+import numpy as np
+from pathlib import Path
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from lazy_imports import lazy_import
+import metrics
+
+sf = lazy_import("soundfile")
+
+
+class AudioCache:
+    """Disk-backed cache of synthesized clips, stored as FLAC.
+
+    Entries are grouped into namespaces (one subdirectory each, e.g. per
+    model) so stale entries can be pruned without scanning the whole cache.
+    A small in-memory LRU keeps recently used clips decoded.
+    """
+
+    def __init__(self, cache_dir: str, name: str = "audio", memory_items: int = 32):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Stable key from arbitrary parts (text, speaker, timestamps...)"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()[:32]
+
+    def _path(self, namespace: str, key: str) -> Path:
+        return self.cache_dir / namespace / f"{key}.flac"
+
+    def contains(self, namespace: str, key: str) -> bool:
+        return (namespace, key) in self._memory or self._path(namespace, key).exists()
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[np.ndarray, int]]:
+        """Return (audio, sample_rate) or None on a miss"""
+        with self._lock:
+            entry = self._memory.get((namespace, key))
+            if entry is not None:
+                self._memory.move_to_end((namespace, key))
+        if entry is None:
+            path = self._path(namespace, key)
+            try:
+                audio, sample_rate = sf.read(str(path), dtype='float32')
+                entry = (audio, sample_rate)
+                self._remember(namespace, key, entry)
+            except Exception:
+                entry = None
+        metrics.record_cache(self.name, entry is not None)
+        return entry
+
+    def put(self, namespace: str, key: str, audio: np.ndarray, sample_rate: int) -> bool:
+        """Write a clip atomically so readers never see a partial file"""
+        path = self._path(namespace, key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            audio = np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0)
+            sf.write(str(tmp_path), audio, sample_rate, format='FLAC')
+            os.replace(tmp_path, path)
+            self._remember(namespace, key, (audio, sample_rate))
+            return True
+        except Exception as e:
+            print(f"Failed to cache audio: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return False
+
+    def _remember(self, namespace: str, key: str, entry: Tuple[np.ndarray, int]):
+        with self._lock:
+            self._memory[(namespace, key)] = entry
+            self._memory.move_to_end((namespace, key))
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def prune(self, namespace: str, keep: Callable[[str], bool]) -> int:
+        """Delete entries in a namespace whose key fails `keep`; returns count removed"""
+        removed = 0
+        directory = self.cache_dir / namespace
+        if not directory.exists():
+            return 0
+        for path in directory.glob("*.flac"):
+            if not keep(path.stem):
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+                with self._lock:
+                    self._memory.pop((namespace, path.stem), None)
+        return removed
+
+    def trim(self, namespace: str, max_items: int, keep: Callable[[str], bool] = lambda key: False) -> int:
+        """Delete the oldest entries of a namespace beyond `max_items`, sparing keys `keep`
+        accepts; returns count removed"""
+        directory = self.cache_dir / namespace
+        if not directory.exists():
+            return 0
+        entries = []
+        for path in directory.glob("*.flac"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                pass
+        excess = len(entries) - max_items
+        if excess <= 0:
+            return 0
+        entries.sort()
+        oldest = set([path.stem for _, path in entries if not keep(path.stem)][:excess])
+        return self.prune(namespace, lambda key: key not in oldest)
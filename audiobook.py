@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""Long-document (audiobook) rendering with checkpoint/resume.
+
+The input is split into chapters and sentence-sized chunks. Each chunk is
+synthesized and appended to the chapter's raw PCM part file as soon as it is
+ready. The manifest records the committed chunk count and byte offset, so an
+interrupted run picks up at the next chunk. When a chapter is finished, its
+part file is encoded to FLAC (or Ogg Vorbis) in fixed-size blocks. Memory use
+therefore stays flat no matter how long the book is.
+
+Within a chapter, synthesis, PCM encoding, the checkpointed write and
+progress reporting run as pipeline stages. The model does not sit idle
+while a chunk is being fsynced.
+
+    python audiobook.py book.md --out book_audio --model v3_en --speaker en_12
+"""
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from lazy_imports import lazy_import
+from pipeline import Pipeline, Stage
+from text_utils import split_sentences
+from tracing import get_logger
+
+logger = get_logger("audiobook")
+sf = lazy_import("soundfile")
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+SENTENCE_PAUSE = 0.25     # seconds of silence between chunks
+ENCODE_BLOCK = 1 << 16    # frames per block when encoding a finished chapter
+
+_MD_HEADING = re.compile(r'^\s{0,3}#{1,3}\s+(.+?)\s*#*\s*$')
+_CHAPTER_LINE = re.compile(
+    r'^\s*((?:chapter|глава)\s+\S+.*|(?:part|book|часть|книга)\s+(?:[0-9]+|[ivxlcdm]+)\b.*)$',
+    re.IGNORECASE
+)
+MAX_HEADING_CHARS = 80
+_MD_LINK = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_MD_EMPHASIS = re.compile(r'(\*\*|__|\*|_|`+|~~)')
+_MD_LIST = re.compile(r'^\s*(?:[-*+]|\d+\.)\s+', re.MULTILINE)
+_MD_QUOTE = re.compile(r'^\s*>\s?', re.MULTILINE)
+
+
+class Chapter:
+    def __init__(self, title: str, text: str):
+        self.title = title
+        self.text = text
+
+    def chunks(self) -> List[str]:
+        return split_sentences(self.text)
+
+
+def read_document(path: str) -> Tuple[str, bool]:
+    """Return (text, is_markdown) for .txt/.md files (or text extracted from an epub)"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        text = f.read()
+    return text, Path(path).suffix.lower() in ('.md', '.markdown')
+
+
+def strip_markdown(text: str) -> str:
+    text = _MD_LINK.sub(r'\1', text)
+    text = _MD_LIST.sub('', text)
+    text = _MD_QUOTE.sub('', text)
+    return _MD_EMPHASIS.sub('', text)
+
+
+def split_chapters(text: str, markdown: bool = False) -> List[Chapter]:
+    """Split on markdown headings or "Chapter N"/"Глава N" lines.
+
+    Paragraph breaks are turned into sentence breaks so that headings and
+    paragraphs without final punctuation aren't merged into one chunk.
+    """
+    chapters = []
+    title = None
+    paragraphs: List[str] = []
+    current: List[str] = []
+
+    def flush_paragraph():
+        if current:
+            paragraphs.append(' '.join(current))
+            current.clear()
+
+    def flush_chapter():
+        flush_paragraph()
+        body = '\n'.join(p if re.search(r'[.!?…:;]$', p) else f"{p}." for p in paragraphs)
+        if body.strip():
+            chapters.append(Chapter(title or f"Chapter {len(chapters) + 1}", body))
+        paragraphs.clear()
+
+    for line in text.splitlines():
+        heading = _MD_HEADING.match(line) if markdown else None
+        chapter_line = (_CHAPTER_LINE.match(line)
+                        if not heading and len(line.strip()) <= MAX_HEADING_CHARS else None)
+        if heading or chapter_line:
+            flush_chapter()
+            title = (heading or chapter_line).group(1).strip()
+            # Read the heading aloud at the start of the chapter
+            paragraphs.append(strip_markdown(title) if markdown else title)
+            continue
+        if not line.strip():
+            flush_paragraph()
+            continue
+        current.append(strip_markdown(line.strip()) if markdown else line.strip())
+    flush_chapter()
+    return chapters
+
+
+def _file_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _safe_name(title: str) -> str:
+    name = re.sub(r'[^\w\- ]+', '', title, flags=re.UNICODE).strip().replace(' ', '_')
+    return name[:40] or "chapter"
+
+
+class AudiobookRenderer:
+    def __init__(self, tts, output_dir: str, speaker: Optional[str] = None,
+                 sample_rate: Optional[int] = None, audio_format: str = "flac",
+                 progress_callback: Optional[Callable[[dict], None]] = None,
+                 stop_event: Optional[threading.Event] = None, model_name: Optional[str] = None):
+        self.tts = tts
+        self.model_name = model_name
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.speaker = speaker
+        self.sample_rate = sample_rate
+        self.audio_format = audio_format.lower()
+        if self.audio_format not in ("flac", "ogg"):
+            raise ValueError(f"Unsupported audio format: {audio_format}")
+        self.progress_callback = progress_callback
+        self.stop_event = stop_event or threading.Event()
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+
+    # ----- Manifest -----
+    def _new_manifest(self, source: str, source_hash: str, chapters: List[Chapter]) -> dict:
+        return {
+            "version": MANIFEST_VERSION,
+            "source": str(source),
+            "source_sha256": source_hash,
+            "model": self.model_name,
+            "speaker": self.speaker,
+            "sample_rate": self.sample_rate,
+            "format": self.audio_format,
+            "chapters": [
+                {
+                    "index": i,
+                    "title": chapter.title,
+                    "file": f"{i + 1:03d}_{_safe_name(chapter.title)}.{self.audio_format}",
+                    "total_chunks": len(chapter.chunks()),
+                    "completed_chunks": 0,
+                    "pcm_bytes": 0,
+                    "done": False
+                }
+                for i, chapter in enumerate(chapters)
+            ]
+        }
+
+    def _load_manifest(self) -> Optional[dict]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save_manifest(self, manifest: dict):
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def _settings_match(self, manifest: dict, source_hash: str) -> bool:
+        return (manifest.get("version") == MANIFEST_VERSION and
+                manifest.get("source_sha256") == source_hash and
+                manifest.get("model") == self.model_name and
+                manifest.get("speaker") == self.speaker and
+                manifest.get("sample_rate") == self.sample_rate and
+                manifest.get("format") == self.audio_format)
+
+    # ----- Rendering -----
+    def render_file(self, path: str, restart: bool = False) -> dict:
+        text, markdown = read_document(path)
+        return self.render_text(text, source=path, markdown=markdown,
+                                source_hash=_file_sha256(path), restart=restart)
+
+    def render_text(self, text: str, source: str = "<text>", markdown: bool = False,
+                    source_hash: Optional[str] = None, restart: bool = False) -> dict:
+        """Render (or resume rendering) a document; returns the manifest"""
+        self.model_name = self.model_name or self.tts.current_model
+        if not self.model_name:
+            raise ValueError("No model loaded")
+        config = self.tts.supported_models[self.model_name]
+        self.speaker = self.speaker or config["speakers"][0]
+        self.sample_rate = self.sample_rate or config["default_rate"]
+
+        chapters = split_chapters(text, markdown)
+        source_hash = source_hash or hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+        manifest = self._load_manifest()
+        if manifest and not restart and not self._settings_match(manifest, source_hash):
+            raise ValueError(
+                f"{self.manifest_path} belongs to a different source or settings; "
+                f"use restart=True to discard it"
+            )
+        if manifest is None or restart:
+            manifest = self._new_manifest(source, source_hash, chapters)
+            self._save_manifest(manifest)
+        else:
+            logger.info(f"Resuming {source} from {self.manifest_path}")
+
+        for chapter, entry in zip(chapters, manifest["chapters"]):
+            if self.stop_event.is_set():
+                break
+            if not entry["done"]:
+                self._render_chapter(chapter, entry, manifest)
+        return manifest
+
+    def _render_chapter(self, chapter: Chapter, entry: dict, manifest: dict):
+        chunks = chapter.chunks()
+        part_path = self.output_dir / f"{entry['file']}.pcm.part"
+        pause = np.zeros(int(SENTENCE_PAUSE * self.sample_rate), dtype=np.int16)
+
+        size = part_path.stat().st_size if part_path.exists() else 0
+        if size < entry["pcm_bytes"]:
+            # Truncating would pad the gap with silence; the checkpoint can't be trusted
+            logger.warning(f"{part_path.name} has {size} of {entry['pcm_bytes']} checkpointed bytes, "
+                           f"re-rendering chapter {entry['index'] + 1}")
+            entry["completed_chunks"] = entry["pcm_bytes"] = 0
+            self._save_manifest(manifest)
+
+        with open(part_path, 'ab') as part:
+            # Drop anything written after the last checkpoint
+            part.truncate(entry["pcm_bytes"])
+            part.seek(entry["pcm_bytes"])
+
+            def synthesize(index: int):
+                return index, self.tts.speak(chunks[index], speaker=self.speaker,
+                                             sample_rate=self.sample_rate, model_name=self.model_name)
+
+            def encode(item):
+                index, audio = item
+                pcm = (np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0) * 32767).astype(np.int16)
+                return index, pcm
+
+            def write(item):
+                index, pcm = item
+                part.write(pcm.tobytes())
+                part.write(pause.tobytes())
+                part.flush()
+                os.fsync(part.fileno())
+
+                entry["completed_chunks"] = index + 1
+                entry["pcm_bytes"] = part.tell()
+                self._save_manifest(manifest)
+                return index
+
+            def report(index: int):
+                self._report(entry, manifest)
+                return index
+
+            pipeline = Pipeline([Stage("inference", synthesize), Stage("encode", encode),
+                                 Stage("sink", write), Stage("report", report)],
+                                stop_event=self.stop_event, name="audiobook")
+            pipeline.run(range(entry["completed_chunks"], len(chunks)))
+            logger.info(f"Chapter {entry['index'] + 1}: {pipeline.report()}")
+            if entry["completed_chunks"] < len(chunks):
+                return   # stopped; the checkpoint already covers every written chunk
+
+        self._encode_chapter(part_path, self.output_dir / entry["file"])
+        part_path.unlink()
+        entry["done"] = True
+        self._save_manifest(manifest)
+        self._report(entry, manifest)
+
+    def _encode_chapter(self, part_path: Path, output_path: Path):
+        """Stream the raw PCM part file into a compressed chapter file"""
+        tmp_path = output_path.with_suffix(f".{self.audio_format}.tmp")
+        subtype = "PCM_16" if self.audio_format == "flac" else "VORBIS"
+        with open(part_path, 'rb') as source, sf.SoundFile(
+            str(tmp_path), 'w', samplerate=self.sample_rate, channels=1,
+            format=self.audio_format.upper(), subtype=subtype
+        ) as target:
+            while block := source.read(ENCODE_BLOCK * 2):
+                target.write(np.frombuffer(block, dtype=np.int16))
+        os.replace(tmp_path, output_path)
+
+    def _report(self, entry: dict, manifest: dict):
+        if not self.progress_callback:
+            return
+        chapters = manifest["chapters"]
+        self.progress_callback({
+            "chapter": entry["index"] + 1,
+            "chapters": len(chapters),
+            "title": entry["title"],
+            "chunk": entry["completed_chunks"],
+            "chunks": entry["total_chunks"],
+            "done_chunks": sum(c["completed_chunks"] for c in chapters),
+            "total_chunks": sum(c["total_chunks"] for c in chapters)
+        })
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from tts_engine import SileroTTS
+
+    parser = argparse.ArgumentParser(description="Render a document to per-chapter audio files")
+    parser.add_argument("input", help="Text or markdown file")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--model", default="v3_en")
+    parser.add_argument("--speaker", default=None)
+    parser.add_argument("--sample-rate", type=int, default=None)
+    parser.add_argument("--format", default="flac", choices=["flac", "ogg"])
+    parser.add_argument("--models-dir", default=str(Path(__file__).parent / "models" / "tts"))
+    parser.add_argument("--restart", action="store_true", help="Discard an existing manifest")
+    args = parser.parse_args(argv)
+
+    tts = SileroTTS(args.models_dir)
+    if not tts.load_model(args.model):
+        print(f"Could not load model {args.model}")
+        return 1
+
+    started = time.time()
+
+    def show_progress(progress):
+        print(f"\r[{progress['chapter']}/{progress['chapters']}] {progress['title'][:30]:<30} "
+              f"{progress['done_chunks']}/{progress['total_chunks']} chunks", end="", flush=True)
+
+    renderer = AudiobookRenderer(tts, args.out, speaker=args.speaker, sample_rate=args.sample_rate,
+                                 audio_format=args.format, progress_callback=show_progress)
+    try:
+        manifest = renderer.render_file(args.input, restart=args.restart)
+    except KeyboardInterrupt:
+        print("\nInterrupted; run again with the same arguments to resume")
+        return 130
+    done = sum(1 for c in manifest["chapters"] if c["done"])
+    print(f"\nRendered {done}/{len(manifest['chapters'])} chapters in {time.time() - started:.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
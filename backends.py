@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""Inference backends for SileroTTS.
+
+A backend does three things:
+- loads a model file and returns a handle
+- runs synthesis on that handle, returning a float32 numpy array
+- reports the capabilities of a model config
+
+Text preparation, locking, metrics and the model table stay in SileroTTS,
+so every backend behaves the same towards callers.
+
+- ``TorchScriptBackend``: the Silero ``.pt`` files, through torch.jit or
+  torch.package, optionally frozen (see model_optimizer.py).
+- ``OnnxBackend``: ONNX Runtime on CPU. It uses a model exported to
+  ``<model>.onnx`` with a ``<model>.onnx.json`` sidecar.
+- ``StubBackend``: deterministic tones, with no model files or torch.
+  Used for tests, CI and benchmarks.
+
+    VOXIOM_BACKEND=onnx     torchscript (default), onnx or stub
+"""
+import os
+import json
+import math
+import zlib
+import numpy as np
+from typing import Dict, List, Optional
+import model_optimizer
+from lazy_imports import lazy_import
+
+torch = lazy_import("torch")
+ort = lazy_import("onnxruntime")
+
+
+class InferenceBackend:
+    """Interface every backend implements"""
+
+    name = "base"
+    needs_model_file = True
+
+    @property
+    def device(self) -> str:
+        return "cpu"
+
+    def load(self, model_name: str, model_path: str, sha256: Optional[str] = None):
+        """Load a model file and return a handle for synthesize()"""
+        raise NotImplementedError
+
+    def synthesize(self, handle, speaker: str, sample_rate: int,
+                   text: Optional[str] = None, ssml_text: Optional[str] = None) -> np.ndarray:
+        """Render prepared text (or SSML) to mono float32 audio"""
+        raise NotImplementedError
+
+    def capabilities(self, config: dict) -> dict:
+        return {
+            "ssml": bool(config.get("supports_ssml")),
+            "sample_rates": list(config["sample_rates"]),
+            "device": str(self.device),
+        }
+
+
+class TorchScriptBackend(InferenceBackend):
+    name = "torchscript"
+
+    def __init__(self):
+        self._device = None
+
+    @property
+    def device(self):
+        """Inference device, resolved on first use"""
+        if self._device is None:
+            self._device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        return self._device
+
+    def load(self, model_name: str, model_path: str, sha256: Optional[str] = None):
+        # Clear CUDA cache before loading
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+        # Try standard loading first
+        try:
+            if sha256:
+                model = model_optimizer.load_optimized(model_path, model_name, sha256, self.device)
+            else:
+                model = torch.jit.load(model_path, map_location=self.device)
+        except Exception:
+            # Fallback to PackageImporter
+            importer = torch.package.PackageImporter(model_path)
+            model = importer.load_pickle("tts_models", "model")
+
+        model.to(self.device)
+        return model
+
+    def synthesize(self, handle, speaker: str, sample_rate: int,
+                   text: Optional[str] = None, ssml_text: Optional[str] = None) -> np.ndarray:
+        text_args = {"ssml_text": ssml_text} if ssml_text is not None else {"text": text}
+        with torch.no_grad():
+            audio = handle.apply_tts(speaker=speaker, sample_rate=sample_rate, **text_args)
+        return audio.detach().cpu().numpy().astype(np.float32, copy=False).reshape(-1)
+
+
+class _OnnxModel:
+    def __init__(self, session, symbols: Dict[str, int], speakers: List[str], inputs: Dict[str, str]):
+        self.session = session
+        self.symbols = symbols
+        self.speakers = speakers
+        self.inputs = inputs
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime on CPU.
+
+    ``<model>.onnx.json`` describes the exported graph. It holds:
+    - "symbols": the tokenizer alphabet
+    - "speakers": speaker names in embedding order
+    - "inputs" (optional): a map from "tokens", "speaker" and
+      "sample_rate" to the graph's input names
+
+    Characters outside the alphabet are dropped. SSML is not supported,
+    because the markup is interpreted by the TorchScript text frontend.
+    """
+
+    name = "onnx"
+    DEFAULT_INPUTS = {"tokens": "input", "speaker": "speaker", "sample_rate": "sample_rate"}
+
+    def __init__(self, threads: Optional[int] = None):
+        self.threads = threads
+
+    @staticmethod
+    def onnx_path(model_path: str) -> str:
+        return os.path.splitext(model_path)[0] + ".onnx"
+
+    def load(self, model_name: str, model_path: str, sha256: Optional[str] = None):
+        path = self.onnx_path(model_path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No ONNX export for {model_name}: {path}")
+        with open(path + ".json", 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        options = ort.SessionOptions()
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        symbols = {symbol: index for index, symbol in enumerate(spec["symbols"])}
+        return _OnnxModel(session, symbols, spec["speakers"], {**self.DEFAULT_INPUTS, **spec.get("inputs", {})})
+
+    def synthesize(self, handle: _OnnxModel, speaker: str, sample_rate: int,
+                   text: Optional[str] = None, ssml_text: Optional[str] = None) -> np.ndarray:
+        if ssml_text is not None:
+            raise ValueError("SSML is not supported by the ONNX backend")
+        if speaker not in handle.speakers:
+            raise ValueError(f"Speaker {speaker} is not in the ONNX export")
+        tokens = [handle.symbols[c] for c in text.lower() if c in handle.symbols]
+        if not tokens:
+            raise ValueError("Text has no characters the model can pronounce")
+        feeds = {
+            handle.inputs["tokens"]: np.asarray([tokens], dtype=np.int64),
+            handle.inputs["speaker"]: np.asarray([handle.speakers.index(speaker)], dtype=np.int64),
+            handle.inputs["sample_rate"]: np.asarray([sample_rate], dtype=np.int64),
+        }
+        audio = handle.session.run(None, feeds)[0]
+        return np.asarray(audio, dtype=np.float32).reshape(-1)
+
+    def capabilities(self, config: dict) -> dict:
+        return {**super().capabilities(config), "ssml": False}
+
+
+class StubBackend(InferenceBackend):
+    """Deterministic stand-in for a Silero model: a tone whose pitch depends on the speaker"""
+
+    name = "stub"
+    needs_model_file = False
+    SECONDS_PER_CHAR = 0.06
+
+    def load(self, model_name: str, model_path: str, sha256: Optional[str] = None):
+        return model_name
+
+    def synthesize(self, handle, speaker: str, sample_rate: int,
+                   text: Optional[str] = None, ssml_text: Optional[str] = None) -> np.ndarray:
+        source = text if text is not None else ssml_text
+        num_samples = max(1, int(len(source) * self.SECONDS_PER_CHAR * sample_rate))
+        pitch = 110.0 + zlib.crc32(speaker.encode('utf-8')) % 220
+        t = np.arange(num_samples, dtype=np.float32) / sample_rate
+        return (0.5 * np.sin(2 * math.pi * pitch * t)).astype(np.float32)
+
+
+BACKENDS = {
+    TorchScriptBackend.name: TorchScriptBackend,
+    OnnxBackend.name: OnnxBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+def create_backend(name: Optional[str] = None) -> InferenceBackend:
+    """Backend by name, defaulting to VOXIOM_BACKEND and then TorchScript"""
+    name = (name or os.environ.get("VOXIOM_BACKEND") or TorchScriptBackend.name).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""Synthesis benchmark suite for SileroTTS.
+
+Runs a matrix of models, speakers, text lengths, sample rates and thread
+counts and writes a JSON report. Use ``--stub`` to run without model files
+(e.g. in CI, without torch or model downloads) and ``--compare`` to diff a report against a previous release.
+
+    python benchmark.py --output bench.json
+    python benchmark.py --stub --quick --output bench.json
+    python benchmark.py --compare old.json bench.json
+    python benchmark.py --optimization --output optimization.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import statistics
+from pathlib import Path
+from typing import Dict, List, Optional
+import model_optimizer
+from backends import StubBackend
+from lazy_imports import lazy_import
+from tts_engine import SileroTTS
+
+torch = lazy_import("torch")
+
+DEFAULT_LENGTHS = [1, 100, 1000, 10000]
+QUICK_LENGTHS = [1, 100]
+
+SAMPLE_TEXTS = {
+    "en": ("Speech synthesis turns written words into sound. "
+           "The quick brown fox jumps over the lazy dog. "
+           "Every benchmark run should use the same input text. "),
+    "ru": ("Съешьте ещё этих мягких французских булок, да выпейте чаю. "
+           "Широкая электрификация южных губерний даст мощный толчок подъёму сельского хозяйства. "
+           "В чащах юга жил бы цитрус? Да, но фальшивый экземпляр! ")
+}
+
+
+def make_text(language: str, length: int) -> str:
+    """Build benchmark input of roughly `length` characters (a single word at minimum)"""
+    base = SAMPLE_TEXTS.get(language, SAMPLE_TEXTS["en"])
+    first_word = base.split()[0]
+    if length <= len(first_word):
+        return first_word
+    text = (base * (length // len(base) + 1))[:length]
+    # Avoid ending mid-word
+    return text.rsplit(' ', 1)[0] if ' ' in text.strip() else text
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, if the platform reports it"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Summarize a list of latencies in seconds"""
+    ordered = sorted(values)
+
+    def pick(q):
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    return {
+        "min": ordered[0],
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered)
+    }
+
+
+def model_language(tts: SileroTTS, model_name: str) -> str:
+    speakers = tts.supported_models[model_name]["speakers"]
+    return "en" if speakers and speakers[0].startswith("en_") else "ru"
+
+
+def load_models(tts: SileroTTS, model_names: List[str]) -> Dict[str, dict]:
+    """Load each model once, recording how long it took"""
+    results = {}
+    for model_name in model_names:
+        start = time.perf_counter()
+        loaded = tts.load_model(model_name)
+        results[model_name] = {
+            "loaded": loaded,
+            "load_time_s": time.perf_counter() - start
+        }
+    return results
+
+
+def run_case(tts: SileroTTS, model_name: str, speaker: str, text: str,
+             sample_rate: int, repeats: int) -> dict:
+    """Benchmark a single (model, speaker, text, sample rate) combination"""
+    tts.current_model = model_name
+    latencies = []
+    first_audio = []
+    audio_seconds = 0.0
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        num_samples = 0
+        for i, chunk in enumerate(tts.speak_stream(text, speaker=speaker, sample_rate=sample_rate)):
+            if i == 0:
+                first_audio.append(time.perf_counter() - start)
+            num_samples += chunk.shape[-1]
+        latencies.append(time.perf_counter() - start)
+        audio_seconds = num_samples / sample_rate
+
+    latency = percentiles(latencies)
+    return {
+        "latency_s": latency,
+        "time_to_first_audio_s": percentiles(first_audio),
+        "audio_seconds": audio_seconds,
+        "real_time_factor": latency["p50"] / audio_seconds if audio_seconds else None,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def run_benchmark(models: List[str], speakers: Optional[List[str]], lengths: List[int],
+                  sample_rates: Optional[List[int]], threads: List[int],
+                  repeats: int = 3, warmup: int = 1, stub: bool = False,
+                  models_dir: str = 'models/tts') -> dict:
+    """Run the full benchmark matrix and return the report as a dict"""
+    tts = SileroTTS(models_dir, backend=StubBackend() if stub else None)
+    models = models or list(tts.supported_models)
+    load_results = load_models(tts, models)
+
+    cases = []
+    for model_name in models:
+        if not load_results[model_name]["loaded"]:
+            print(f"Skipping {model_name}: model failed to load")
+            continue
+
+        config = tts.supported_models[model_name]
+        language = model_language(tts, model_name)
+        model_speakers = [s for s in speakers if s in config["speakers"]] if speakers else config["speakers"][:1]
+        model_rates = [r for r in sample_rates if r in config["sample_rates"]] if sample_rates else [config["default_rate"]]
+
+        for num_threads in threads:
+            if not stub:
+                torch.set_num_threads(num_threads)
+            for speaker in model_speakers:
+                for sample_rate in model_rates:
+                    for _ in range(warmup):
+                        tts.current_model = model_name
+                        tts.speak(make_text(language, 50), speaker=speaker, sample_rate=sample_rate)
+                    for length in lengths:
+                        text = make_text(language, length)
+                        print(f"{model_name} {speaker} {sample_rate}Hz {num_threads}T {len(text)} chars...")
+                        result = run_case(tts, model_name, speaker, text, sample_rate, repeats)
+                        result.update({
+                            "model": model_name,
+                            "speaker": speaker,
+                            "sample_rate": sample_rate,
+                            "threads": num_threads,
+                            "text_chars": len(text)
+                        })
+                        cases.append(result)
+
+    return {
+        "meta": {
+            "version": _read_version(),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "torch": None if stub else torch.__version__,
+            "backend": tts.backend.name,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "device": str(tts.device),
+            "stub": stub,
+            "repeats": repeats
+        },
+        "models": load_results,
+        "cases": cases
+    }
+
+
+def optimization_benchmark(models: List[str], models_dir: str, repeats: int = 5) -> dict:
+    """First-call and steady-state latency of raw vs frozen TorchScript models.
+
+    "optimized_first_load" builds the optimized cache if it is missing;
+    "optimized_cached" is what later start-ups see.
+    """
+    results = {}
+    for model_name in models:
+        runs = {}
+        for label, optimize in (("raw", False), ("optimized_first_load", True), ("optimized_cached", True)):
+            tts = SileroTTS(models_dir)
+            tts.optimize_models = optimize
+            start = time.perf_counter()
+            if not tts.load_model(model_name):
+                print(f"Skipping {model_name}: model failed to load")
+                break
+            load_time = time.perf_counter() - start
+            config = tts.supported_models[model_name]
+            text = make_text(model_language(tts, model_name), 100)
+            speaker = config["speakers"][0]
+
+            start = time.perf_counter()
+            tts.speak(text, speaker=speaker)
+            first_call = time.perf_counter() - start
+            steady = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                tts.speak(text, speaker=speaker)
+                steady.append(time.perf_counter() - start)
+            runs[label] = {
+                "load_time_s": load_time,
+                "first_call_s": first_call,
+                "steady_state_s": percentiles(steady),
+            }
+            print(f"{model_name} {label}: load {load_time:.2f}s, first call {first_call * 1000:.0f}ms, "
+                  f"steady p50 {runs[label]['steady_state_s']['p50'] * 1000:.0f}ms")
+        if runs:
+            cached = model_optimizer.cache_path(models_dir, model_name, tts.model_hash(model_name), tts.device)
+            results[model_name] = {"optimizable": os.path.exists(cached), "runs": runs}
+    return {
+        "meta": {
+            "version": _read_version(),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "torch": torch.__version__,
+            "device": str(SileroTTS(models_dir).device),
+            "repeats": repeats
+        },
+        "models": results
+    }
+
+
+def _read_version() -> str:
+    try:
+        return (Path(__file__).parent / "version.txt").read_text().strip().strip('"')
+    except OSError:
+        return "unknown"
+
+
+def _case_key(case: dict) -> tuple:
+    return (case["model"], case["speaker"], case["sample_rate"], case["threads"], case["text_chars"])
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float = 0.10) -> List[str]:
+    """List cases whose p50 latency regressed by more than `threshold` (fractional)"""
+    previous = {_case_key(c): c for c in baseline.get("cases", [])}
+    regressions = []
+    for case in current.get("cases", []):
+        old = previous.get(_case_key(case))
+        if not old:
+            continue
+        old_p50 = old["latency_s"]["p50"]
+        new_p50 = case["latency_s"]["p50"]
+        if old_p50 > 0 and (new_p50 - old_p50) / old_p50 > threshold:
+            regressions.append(
+                f"{case['model']} {case['speaker']} {case['sample_rate']}Hz "
+                f"{case['threads']}T {case['text_chars']} chars: "
+                f"p50 {old_p50 * 1000:.1f}ms -> {new_p50 * 1000:.1f}ms"
+            )
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v]
+
+
+def _str_list(value: str) -> List[str]:
+    return [v for v in value.split(',') if v]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Voxiom TTS synthesis")
+    parser.add_argument("--models", type=_str_list, default=None, help="Comma-separated model names")
+    parser.add_argument("--speakers", type=_str_list, default=None, help="Comma-separated speakers")
+    parser.add_argument("--lengths", type=_int_list, default=None, help="Text lengths in characters")
+    parser.add_argument("--sample-rates", type=_int_list, default=None)
+    parser.add_argument("--threads", type=_int_list, default=None,
+                        help="Torch thread counts (default: torch's current setting)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--models-dir", default=str(Path(__file__).parent / "models" / "tts"))
+    parser.add_argument("--stub", action="store_true", help="Use a stub model instead of real weights")
+    parser.add_argument("--quick", action="store_true", help="Short texts only")
+    parser.add_argument("--optimization", action="store_true",
+                        help="Compare raw and frozen TorchScript latency instead of the full matrix")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Compare two reports instead of running")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Fractional p50 slowdown treated as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.compare[1], 'r', encoding='utf-8') as f:
+            current = json.load(f)
+        regressions = compare_reports(baseline, current, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        print(f"{len(regressions)} regression(s) found")
+        return 1 if regressions else 0
+
+    if args.optimization:
+        if args.stub:
+            parser.error("--optimization needs real model weights")
+        report = optimization_benchmark(args.models or list(SileroTTS(args.models_dir).supported_models),
+                                        args.models_dir, max(args.repeats, 1))
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Wrote optimization report for {len(report['models'])} model(s) to {args.output}")
+        return 0
+
+    lengths = args.lengths or (QUICK_LENGTHS if args.quick else DEFAULT_LENGTHS)
+    report = run_benchmark(
+        models=args.models,
+        speakers=args.speakers,
+        lengths=lengths,
+        sample_rates=args.sample_rates,
+        threads=args.threads or [1 if args.stub else torch.get_num_threads()],
+        repeats=args.repeats,
+        warmup=args.warmup,
+        stub=args.stub,
+        models_dir=args.models_dir
+    )
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {len(report['cases'])} cases to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,74 +1,85 @@
 # -*- coding: utf-8 -*-
 import os
 import hashlib
+import threading
 import requests
-import torch
 from pathlib import Path
 from tqdm import tqdm
-from typing import Dict, List, Optional
-
-MODELS = {
-    "v3_en": {
-        "url": "https://models.silero.ai/models/tts/en/v3_en.pt",
-        "file": "v3_en.pt",
-        "sha256": "02B71034D9F13BC4001195017BAC9DB1C6BB6115E03FEA52983E8ABCFF13B665",
-        "language": "English"
-    },
-    "v3_1_ru": {
-        "url": "https://models.silero.ai/models/tts/ru/v3_1_ru.pt",
-        "file": "v3_1_ru.pt",
-        "sha256": "CF60B47EC8A9C31046021D2D14B962EA56B8A5BF7061C98ACCAAACA428522F85",
-        "language": "Russian"
-    },
-    "v4_ru": {
-        "url": "https://models.silero.ai/models/tts/ru/v4_ru.pt",
-        "file": "v4_ru.pt",
-        "sha256": "896AB96347D5BD781AB97959D4FD6885620E5AAB52405D3445626EB7C1414B00",
-        "language": "Russian (SSML)",
-        "supports_ssml": True
-    }
-}
+from typing import Callable, Dict, List, Optional
+from model_registry import get_registry
+
+CHUNK_SIZE = 1 << 20
+
+# progress(done_bytes, total_bytes); total is 0 when the server doesn't say
+Progress = Optional[Callable[[int, int], None]]
+
+class DownloadCancelled(Exception):
+    pass
+
 
 class ModelUpdater:
     def __init__(self, models_dir: str = "models/tts"):
         self.models_dir = Path(models_dir)
         self.models_dir.mkdir(parents=True, exist_ok=True)
+        self.registry = get_registry(str(self.models_dir))
 
-    def _calculate_sha256(self, file_path: Path) -> str:
-        """Calculate SHA256 hash of a file"""
+    def _calculate_sha256(self, file_path: Path, progress: Progress = None,
+                          cancel: Optional[threading.Event] = None) -> Optional[str]:
+        """Upper-case SHA256 of a file, or None if cancelled"""
         sha256 = hashlib.sha256()
+        total = file_path.stat().st_size
+        done = 0
         with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
+            while chunk := f.read(CHUNK_SIZE):
+                if cancel is not None and cancel.is_set():
+                    return None
                 sha256.update(chunk)
-        return sha256.hexdigest()
-
-    def _download_with_progress(self, url: str, destination: Path) -> bool:
-        """Download with progress bar and hash verification"""
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+        return sha256.hexdigest().upper()
+
+    def _download_with_progress(self, url: str, destination: Path, progress: Progress = None,
+                                cancel: Optional[threading.Event] = None) -> bool:
+        """Download to a .part file and move it into place once complete"""
+        partial = destination.with_name(destination.name + ".part")
         try:
-            response = requests.get(url, stream=True)
+            response = requests.get(url, stream=True, timeout=30)
             response.raise_for_status()
 
             total_size = int(response.headers.get('content-length', 0))
-            with open(destination, 'wb') as f, tqdm(
+            done = 0
+            with open(partial, 'wb') as f, tqdm(
                 desc=f"Downloading {destination.name}",
                 total=total_size,
                 unit='B',
                 unit_scale=True,
                 unit_divisor=1024,
+                disable=progress is not None,
             ) as bar:
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if cancel is not None and cancel.is_set():
+                        raise DownloadCancelled()
                     f.write(chunk)
                     bar.update(len(chunk))
+                    done += len(chunk)
+                    if progress:
+                        progress(done, total_size)
+            os.replace(partial, destination)
             return True
+        except DownloadCancelled:
+            raise
         except Exception as e:
             print(f"Download failed: {e}")
-            if destination.exists():
-                destination.unlink()
             return False
-
-    def check_model(self, model_name: str) -> Dict[str, str]:
-        """Check model status with detailed info"""
-        model_info = MODELS[model_name]
+        finally:
+            if partial.exists():
+                partial.unlink()
+
+    def check_model(self, model_name: str, load: bool = True, progress: Progress = None,
+                    cancel: Optional[threading.Event] = None) -> Dict[str, str]:
+        """Check model status with detailed info; load=False skips the torch load test"""
+        model_info = self.registry.get(model_name)
         model_path = self.models_dir / model_info["file"]
 
         status = {
@@ -76,49 +87,74 @@ class ModelUpdater:
             "installed": False,
             "valid": False,
             "path": str(model_path),
-            "language": model_info.get("language", "Unknown"),
+            "language": model_info.get("label", "Unknown"),
             "features": []
         }
 
         if model_path.exists():
             status["installed"] = True
-            if self._calculate_sha256(model_path) == model_info["sha256"]:
+            expected = model_info.get("sha256", "").upper()
+            if not expected:
+                # e.g. a models.yml URL override without a checksum: nothing to verify against
+                status["valid"] = True
+                status["features"].append("Unverified")
+            elif self._calculate_sha256(model_path, progress, cancel) == expected:
                 status["valid"] = True
                 status["features"].append("Verified")
 
             # Additional validation by trying to load
-            try:
-                torch.jit.load(model_path, map_location='cpu')
-                status["features"].append("Loadable")
-            except Exception:
-                status["features"].append("Corrupted")
+            if load:
+                try:
+                    import torch
+                    torch.jit.load(model_path, map_location='cpu')
+                    status["features"].append("Loadable")
+                except Exception:
+                    status["features"].append("Corrupted")
 
         if model_info.get("supports_ssml"):
             status["features"].append("SSML")
 
         return status
 
-    def update_models(self, selected_models: List[str], force: bool = False) -> Dict[str, str]:
-        """Update selected models with verification"""
+    def update_models(self, selected_models: List[str], force: bool = False,
+                      progress: Optional[Callable[[str, int, int], None]] = None,
+                      cancel: Optional[threading.Event] = None) -> Dict[str, str]:
+        """Update selected models with verification.
+
+        progress(model_name, done_bytes, total_bytes) is called while hashing
+        and downloading. Setting `cancel` stops at the next chunk; the model
+        being downloaded and any remaining ones are reported as "Cancelled".
+        """
         results = {}
 
         for model_name in selected_models:
-            if model_name not in MODELS:
+            if cancel is not None and cancel.is_set():
+                results[model_name] = "Cancelled"
+                continue
+            if model_name not in self.registry or not self.registry.get(model_name).get("url"):
                 results[model_name] = "Error: Unknown model"
                 continue
 
-            model_info = MODELS[model_name]
+            model_info = self.registry.get(model_name)
+            expected = model_info.get("sha256", "").upper()
             model_path = self.models_dir / model_info["file"]
 
+            report = (lambda done, total, name=model_name: progress(name, done, total)) if progress else None
+
             # Skip if already valid and not forced
             if not force and model_path.exists():
-                if self._calculate_sha256(model_path) == model_info["sha256"]:
+                if expected and self._calculate_sha256(model_path, report, cancel) == expected:
                     results[model_name] = "Already up-to-date"
                     continue
 
             # Download and verify
-            if self._download_with_progress(model_info["url"], model_path):
-                if self._calculate_sha256(model_path) == model_info["sha256"]:
+            try:
+                downloaded = self._download_with_progress(model_info["url"], model_path, report, cancel)
+            except DownloadCancelled:
+                results[model_name] = "Cancelled"
+                continue
+            if downloaded:
+                if not expected or self._calculate_sha256(model_path) == expected:
                     results[model_name] = "Successfully updated"
                 else:
                     results[model_name] = "Error: Hash mismatch"
@@ -129,13 +165,13 @@ class ModelUpdater:
         return results
 
 # GUI Integration Example (to be called from your Settings Tab)
-def get_available_models() -> List[Dict]:
+def get_available_models(models_dir: str = "models/tts") -> List[Dict]:
     return [
         {
             "name": name,
-            "language": info["language"],
+            "language": info["label"],
             "supports_ssml": info.get("supports_ssml", False),
             "selected": False  # Default checkbox state
         }
-        for name, info in MODELS.items()
+        for name, info in get_registry(models_dir).synthesis_models().items() if info.get("url")
     ]
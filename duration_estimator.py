@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Speech duration estimates calibrated from real synthesis output.
+
+Text is reduced to three additive features:
+- letters
+- digits, which expand to several spoken words
+- pause punctuation
+Duration is modelled as a weighted sum of these. Every synthesis adds an
+observation, and the weights are refit with ridge-regularised least squares.
+The fit is pulled towards the parent level's weights, so a speaker with few
+samples falls back to its model, and a model with few samples falls back to
+all observations. The sufficient statistics are persisted to JSON, so
+calibration survives restarts.
+
+Because the features are additive, `TextStats` can track an editor's text
+from insert/delete deltas instead of rescanning it.
+"""
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PAUSE_CHARS = frozenset(",.;:!?—–…")
+FEATURES = ("letters", "digits", "pauses")
+
+# Seconds per letter, per digit and per pause mark before any calibration
+# (about 0.35 s per word and 0.75 s per ", — ")
+DEFAULT_WEIGHTS = (0.065, 0.3, 0.375)
+# The prior counts as a few sentences of this shape
+PRIOR_SENTENCES = 3.0
+TYPICAL_SENTENCE = (80.0, 1.0, 4.0)
+SAVE_INTERVAL = 30.0
+ALL = "*"
+
+
+def text_features(text: str) -> List[float]:
+    letters = digits = pauses = 0
+    for char in text:
+        if char.isalpha():
+            letters += 1
+        elif char.isdigit():
+            digits += 1
+        elif char in PAUSE_CHARS:
+            pauses += 1
+    return [float(letters), float(digits), float(pauses)]
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """Gaussian elimination for the small normal-equation systems"""
+    n = len(vector)
+    a = [row[:] + [vector[i]] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        a[col], a[pivot] = a[pivot], a[col]
+        if abs(a[col][col]) < 1e-12:
+            raise ValueError("singular system")
+        for r in range(col + 1, n):
+            factor = a[r][col] / a[col][col]
+            for c in range(col, n + 1):
+                a[r][c] -= factor * a[col][c]
+    x = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        x[r] = (a[r][n] - sum(a[r][c] * x[c] for c in range(r + 1, n))) / a[r][r]
+    return x
+
+
+class _Stats:
+    """Sufficient statistics (XᵀX, Xᵀy) for one (model, speaker) level"""
+
+    def __init__(self, data: Optional[dict] = None):
+        size = len(FEATURES)
+        data = data or {}
+        self.xtx = data.get("xtx") or [[0.0] * size for _ in range(size)]
+        self.xty = data.get("xty") or [0.0] * size
+        self.samples = data.get("samples", 0)
+        self.seconds = data.get("seconds", 0.0)
+
+    def add(self, x: Sequence[float], seconds: float):
+        for i, xi in enumerate(x):
+            self.xty[i] += xi * seconds
+            for j, xj in enumerate(x):
+                self.xtx[i][j] += xi * xj
+        self.samples += 1
+        self.seconds += seconds
+
+    def fit(self, prior: Sequence[float]) -> Tuple[float, ...]:
+        if not self.samples:
+            return tuple(prior)
+        matrix = [row[:] for row in self.xtx]
+        vector = self.xty[:]
+        for i, typical in enumerate(TYPICAL_SENTENCE):
+            strength = PRIOR_SENTENCES * typical * typical
+            matrix[i][i] += strength
+            vector[i] += strength * prior[i]
+        try:
+            return tuple(max(0.0, w) for w in _solve(matrix, vector))
+        except ValueError:
+            return tuple(prior)
+
+    def to_dict(self) -> dict:
+        return {"xtx": self.xtx, "xty": self.xty, "samples": self.samples, "seconds": self.seconds}
+
+
+class DurationEstimator:
+    def __init__(self, stats_path: Optional[str] = None):
+        self.stats_path = Path(stats_path) if stats_path else None
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], _Stats] = {}
+        self._weights: Dict[Tuple[str, str], Tuple[float, ...]] = {}
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._load()
+
+    def observe(self, model: str, speaker: str, text: str, audio_seconds: float):
+        """Record one synthesis: the text sent to the model and the audio length it produced"""
+        x = text_features(text)
+        if audio_seconds <= 0 or not any(x):
+            return
+        with self._lock:
+            for key in ((ALL, ALL), (model, ALL), (model, speaker)):
+                self._stats.setdefault(key, _Stats()).add(x, audio_seconds)
+            self._weights.clear()
+            self._dirty = True
+        if time.monotonic() - self._last_save > SAVE_INTERVAL:
+            self.save()
+
+    def weights(self, model: Optional[str] = None, speaker: Optional[str] = None) -> Tuple[float, ...]:
+        """Seconds per letter, digit and pause mark for the most specific calibrated level"""
+        key = (model or ALL, speaker or ALL) if model else (ALL, ALL)
+        with self._lock:
+            cached = self._weights.get(key)
+            if cached is None:
+                cached = DEFAULT_WEIGHTS
+                for level in ((ALL, ALL), (key[0], ALL), key):
+                    stats = self._stats.get(level)
+                    if stats is not None:
+                        cached = stats.fit(cached)
+                    if level == key:
+                        break
+                self._weights[key] = cached
+            return cached
+
+    def estimate_features(self, features: Sequence[float], model: Optional[str] = None,
+                          speaker: Optional[str] = None) -> float:
+        return sum(w * x for w, x in zip(self.weights(model, speaker), features))
+
+    def estimate(self, text: str, model: Optional[str] = None, speaker: Optional[str] = None) -> float:
+        """Predicted audio length of `text` in seconds"""
+        return self.estimate_features(text_features(text), model, speaker)
+
+    def samples(self, model: Optional[str] = None, speaker: Optional[str] = None) -> int:
+        stats = self._stats.get((model or ALL, speaker or ALL))
+        return stats.samples if stats else 0
+
+    # ----- Persistence -----
+    def _load(self):
+        if self.stats_path is None or not self.stats_path.exists():
+            return
+        try:
+            with open(self.stats_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for entry in data.get("levels", []):
+                self._stats[(entry["model"], entry["speaker"])] = _Stats(entry)
+        except Exception as e:
+            print(f"Failed to load duration stats: {e}")
+
+    def save(self):
+        if self.stats_path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"features": FEATURES, "levels": [
+                {"model": model, "speaker": speaker, **stats.to_dict()}
+                for (model, speaker), stats in self._stats.items()
+            ]}
+            self._dirty = False
+            self._last_save = time.monotonic()
+        tmp_path = f"{self.stats_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.stats_path)
+        except Exception as e:
+            print(f"Failed to save duration stats: {e}")
+
+
+class TextStats:
+    """Running feature totals of an edited text, maintained from edit deltas"""
+
+    def __init__(self, text: str = ""):
+        self.features = text_features(text)
+
+    def reset(self, text: str):
+        self.features = text_features(text)
+
+    def insert(self, text: str):
+        for i, value in enumerate(text_features(text)):
+            self.features[i] += value
+
+    def delete(self, text: str):
+        for i, value in enumerate(text_features(text)):
+            self.features[i] = max(0.0, self.features[i] - value)
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""Synthesis engine in a child process.
+
+Inside the GUI process, torch work and Python-side post-processing compete
+with the Tk event loop for the GIL, which makes the UI stutter.
+``EngineProcess`` runs SileroTTS in a separate process instead:
+- requests and replies are small dicts sent over a multiprocessing Pipe
+- audio comes back in a ``multiprocessing.shared_memory`` block, so large
+  arrays are never pickled
+- a supervisor thread restarts the child if it dies; models are reloaded
+  as they are used again
+
+``RemoteSileroTTS`` is a SileroTTS whose model loading and synthesis happen
+in the child. The planner, caches and audiobook renderer use it unchanged.
+Everything else (model table, presets, voices, streaming, galleries) stays
+in the calling process.
+
+    tts = RemoteSileroTTS("models/tts")
+    tts.load_model("v3_en")
+    audio = tts.speak("Hello", speaker="en_0")    # float32 numpy array
+    tts.close()
+"""
+import os
+import time
+import itertools
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as CallTimeout
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+import numpy as np
+import metrics
+from tts_engine import SileroTTS, SynthesisError
+from tracing import get_logger, tracer
+
+logger = get_logger("engine")
+
+CALL_TIMEOUT = 600.0       # seconds; a hung child is treated like a crashed one
+MAX_RESTARTS = 5           # restarts allowed within RESTART_WINDOW before giving up
+RESTART_WINDOW = 60.0
+
+
+class EngineCrashed(RuntimeError):
+    """The engine process died while a request was outstanding"""
+
+
+# ----- Child process -----
+class _ObservationRelay:
+    """Stands in for the duration estimator in the child and hands observations back per request"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def observe(self, model: str, speaker: str, text: str, audio_seconds: float):
+        self._local.observed = text
+
+    def take(self) -> Optional[str]:
+        observed = getattr(self._local, "observed", None)
+        self._local.observed = None
+        return observed
+
+
+def _export_audio(audio) -> Tuple[str, tuple]:
+    """Copy audio into a new shared memory block; the parent unlinks it"""
+    array = np.ascontiguousarray(audio, dtype=np.float32)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        np.ndarray(array.shape, dtype=np.float32, buffer=block.buf)[...] = array
+    finally:
+        block.close()
+    return block.name, array.shape
+
+
+def _import_audio(name: str, shape: tuple) -> np.ndarray:
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=np.float32, buffer=block.buf).copy()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _worker_main(conn, models_dir: str, threads: int):
+    tts = SileroTTS(models_dir)
+    relay = _ObservationRelay()
+    tts.duration_estimator = relay
+    send_lock = threading.Lock()
+
+    def reply(message: dict):
+        with send_lock:
+            conn.send(message)
+
+    def handle(request: dict):
+        call_id, op, kwargs = request["id"], request["op"], request["kwargs"]
+        try:
+            if op == "load_model":
+                reply({"id": call_id, "ok": True,
+                       "result": tts.load_model(kwargs["model_name"], activate=False)})
+            elif op == "speak":
+                model_name = kwargs["model_name"]
+                # After a restart models come back on first use
+                if model_name not in tts.models and not tts.load_model(model_name, activate=False):
+                    raise ValueError(f"Model {model_name} could not be loaded")
+                relay.take()
+                audio = tts.speak(**kwargs)
+                chars, elapsed = tts.last_synthesis()
+                name, shape = _export_audio(audio)
+                reply({"id": call_id, "ok": True, "shm": name, "shape": shape,
+                       "observed": relay.take(), "chars": chars, "seconds": elapsed})
+            elif op == "configure":
+                tts.text_normalization = kwargs["text_normalization"]
+                reply({"id": call_id, "ok": True, "result": True})
+            else:
+                raise ValueError(f"Unknown engine request '{op}'")
+        except Exception as e:
+            reply({"id": call_id, "ok": False, "error": str(e),
+                   "value_error": isinstance(e, ValueError),
+                   "synthesis_error": isinstance(e, SynthesisError)})
+
+    pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="engine")
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request.get("op") == "shutdown":
+            break
+        pool.submit(handle, request)
+    pool.shutdown(wait=False)
+
+
+# ----- Parent process -----
+class EngineProcess:
+    """Request/response client for the engine child, with crash supervision"""
+
+    def __init__(self, models_dir: str, threads: int = 2, timeout: Optional[float] = CALL_TIMEOUT):
+        self.models_dir = models_dir
+        self.threads = threads
+        self.timeout = timeout
+        self.on_restart = None          # called on the supervisor thread after a restart
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._restarts = deque()
+        self._generation = 0
+        self._conn = None
+        self._process = None
+        self._closed = False
+        with self._lock:
+            self._start()
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def _start(self):
+        """Launch a child; called with the lock held"""
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, name="tts-engine", daemon=True,
+                                    args=(child_conn, self.models_dir, self.threads))
+        process.start()
+        child_conn.close()
+        self._generation += 1
+        self._conn, self._process = parent_conn, process
+        threading.Thread(target=self._supervise, args=(parent_conn, process, self._generation),
+                         name="tts-engine-supervisor", daemon=True).start()
+        logger.info(f"Engine process started (pid {process.pid})")
+
+    def call(self, op: str, **kwargs):
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Engine process is closed")
+            if self._conn is None:
+                raise EngineCrashed("Engine process is not running")
+            call_id = next(self._ids)
+            self._pending[call_id] = future
+            # The child this request went to; by the time it times out, a restart may
+            # already have replaced self._process with a healthy one
+            process = self._process
+            try:
+                self._conn.send({"id": call_id, "op": op, "kwargs": kwargs})
+            except (OSError, EOFError) as e:
+                self._pending.pop(call_id, None)
+                raise EngineCrashed(f"Engine process is not running: {e}")
+        try:
+            return future.result(self.timeout)
+        except CallTimeout:
+            # A hung child holds its model lock forever; kill it and let the supervisor restart it
+            logger.error(f"Engine request '{op}' timed out after {self.timeout}s, restarting the engine")
+            process.kill()
+            raise
+
+    def speak(self, **kwargs) -> Tuple[np.ndarray, Optional[str], int, float]:
+        """Returns (audio, text as observed for calibration, characters sent to the model,
+        seconds the model spent on them)"""
+        message = self.call("speak", **kwargs)
+        return message["audio"], message["observed"], message["chars"], message["seconds"]
+
+    def _supervise(self, conn, process, generation: int):
+        """Route replies to their callers; restart the child when it exits"""
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                future = self._pending.pop(message["id"], None)
+            try:
+                if "shm" in message:
+                    # Always claim the block, even if nobody is waiting for it any more
+                    message["audio"] = _import_audio(message.pop("shm"), tuple(message["shape"]))
+            except Exception as e:
+                message = {"ok": False, "error": f"Audio transfer failed: {e}", "value_error": False}
+            if future is None:
+                continue
+            if message["ok"]:
+                future.set_result(message if "audio" in message else message["result"])
+            elif message.get("synthesis_error"):
+                future.set_exception(SynthesisError(message["error"]))
+            elif message["value_error"]:
+                future.set_exception(ValueError(message["error"]))
+            else:
+                future.set_exception(RuntimeError(message["error"]))
+
+        process.join(timeout=5)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._conn = None
+            pending, self._pending = self._pending, {}
+            closed = self._closed
+        for future in pending.values():
+            future.set_exception(EngineCrashed(f"Engine process exited with code {process.exitcode}"))
+        if not closed:
+            self._restart(process.exitcode)
+
+    def _restart(self, exitcode):
+        now = time.monotonic()
+        while self._restarts and now - self._restarts[0] > RESTART_WINDOW:
+            self._restarts.popleft()
+        if len(self._restarts) >= MAX_RESTARTS:
+            logger.error(f"Engine process keeps crashing (exit code {exitcode}); not restarting")
+            return
+        self._restarts.append(now)
+        logger.warning(f"Engine process exited with code {exitcode}, restarting")
+        time.sleep(min(0.5 * 2 ** (len(self._restarts) - 1), 5.0))
+        with self._lock:
+            if self._closed:
+                return
+            self._start()
+        metrics.record_engine_restart()
+        if self.on_restart:
+            try:
+                self.on_restart()
+            except Exception as e:
+                logger.warning(f"Engine restart hook failed: {e}")
+
+    def close(self, timeout: float = 5.0):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            conn, process = self._conn, self._process
+            if conn is not None:
+                try:
+                    conn.send({"id": 0, "op": "shutdown", "kwargs": {}})
+                except (OSError, EOFError):
+                    pass
+        if process is not None:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+
+class RemoteSileroTTS(SileroTTS):
+    """SileroTTS whose models live in a supervised child process"""
+
+    def __init__(self, models_dir: str = 'models/tts', threads: int = 2):
+        super().__init__(models_dir)
+        self.engine = EngineProcess(self.models_dir, threads)
+        self.engine.on_restart = self._on_engine_restart
+
+    @property
+    def text_normalization(self) -> bool:
+        return self._text_normalization
+
+    @text_normalization.setter
+    def text_normalization(self, value: bool):
+        self._text_normalization = value
+        if getattr(self, "engine", None) is not None:
+            self.engine.call("configure", text_normalization=value)
+
+    def load_model(self, model_name: str, activate: bool = True) -> bool:
+        if model_name in self.models:
+            if activate:
+                self.current_model = model_name
+            return True
+        with self._model_lock(model_name), tracer.span("tts.load_model", model=model_name):
+            success = model_name in self.models   # loaded by another thread while this one waited
+            if not success:
+                start = time.perf_counter()
+                try:
+                    success = bool(self.engine.call("load_model", model_name=model_name))
+                except Exception as e:
+                    print(f"Model loading failed: {str(e)}")
+                metrics.record_model_load(model_name, time.perf_counter() - start, success)
+            if success:
+                self.models[model_name] = model_name   # the model object itself lives in the child
+                if activate:
+                    self.current_model = model_name
+        return success
+
+    def speak(self, text: str, speaker: str = None, ssml: bool = False,
+              sample_rate: Optional[int] = None, model_name: Optional[str] = None) -> np.ndarray:
+        model_name = model_name or self.current_model
+        if not model_name:
+            raise ValueError("No model loaded")
+        if model_name not in self.models:
+            raise ValueError(f"Model {model_name} is not loaded")
+        speaker = speaker or self.supported_models[model_name]["speakers"][0]
+        sample_rate = sample_rate or self.supported_models[model_name]["default_rate"]
+
+        with tracer.span("tts.remote_speak", model=model_name, speaker=speaker, chars=len(text)):
+            try:
+                audio, observed, chars, seconds = self.engine.speak(
+                    text=text, speaker=speaker, ssml=ssml, sample_rate=sample_rate, model_name=model_name)
+            except SynthesisError:
+                # Recorded in the child's metrics, which the parent never sees
+                metrics.record_failure(model_name, speaker)
+                raise
+            except ValueError:
+                raise
+            except Exception as e:
+                metrics.record_failure(model_name, speaker)
+                raise ValueError(f"Speech generation failed: {str(e)}")
+
+        audio_seconds = audio.shape[-1] / sample_rate
+        # Counted like SileroTTS.speak does: the normalized text the model read
+        metrics.record_synthesis(model_name, speaker, chars, audio_seconds, seconds)
+        if self.duration_estimator is not None and observed:
+            self.duration_estimator.observe(model_name, speaker, observed, audio_seconds)
+        self._warm_voices.add((model_name, speaker))
+        return audio
+
+    def _on_engine_restart(self):
+        # The new child starts cold; bring the active model back before it is asked for
+        self._warm_voices.clear()
+        if not self._text_normalization:
+            self.engine.call("configure", text_normalization=False)
+        if self.current_model:
+            self.engine.call("load_model", model_name=self.current_model)
+
+    def close(self):
+        self.engine.close()
+
+
+def create_engine(models_dir: str):
+    """Engine for the GUI: out of process unless VOXIOM_INPROCESS_ENGINE is set"""
+    if os.environ.get("VOXIOM_INPROCESS_ENGINE"):
+        return SileroTTS(models_dir)
+    return RemoteSileroTTS(models_dir)
@@ -2,8 +2,7 @@
 import os
 import sys
 import time
-import json
-import torch
+import logging
 import numpy as np
 import threading
 import traceback
@@ -16,13 +15,36 @@ import customtkinter as ctk
 # from tkinter import PhotoImage
 from tkinter import simpledialog
 from tkinter import ttk, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from download_models import ModelUpdater, get_available_models # MUSE
-from tts_engine import SileroTTS
-import sounddevice as sd
-import soundfile as sf
+from engine_process import create_engine
+from preset_cache import PresetAudioCache
+from voice_previews import VoicePreviewCache
+from duration_estimator import DurationEstimator, TextStats
+from presets import get_store, memory_store, preset_fields
+from preset_search import PresetSearchIndex
+from audiobook import AudiobookRenderer
+from synthesis_planner import SynthesisPlanner
+from model_registry import get_registry
+from script_renderer import ScriptRenderer, looks_like_script, parse_script
+from language_router import LanguageRouter, is_mixed
+from tracing import tracer, get_logger, setup_logging
+from lazy_imports import lazy_import, preload
+import metrics
+
+# Heavy modules are imported on first use (or by the start-up thread) so the
+# window can appear before torch, matplotlib and the audio libraries have loaded
+torch = lazy_import("torch")
+plt = lazy_import("matplotlib.pyplot")
+mpl_figure = lazy_import("matplotlib.figure")
+backend_tkagg = lazy_import("matplotlib.backends.backend_tkagg")
+download_models = lazy_import("download_models")  # MUSE
+sd = lazy_import("sounddevice")
+sf = lazy_import("soundfile")
+
+logger = get_logger("gui")
+
+WAVEFORM_BIN = 256    # samples per min/max column of the waveform view
+LEAD_IN = 0.05        # seconds of silence added before synthesized audio
+BOOK_STOP_WAIT = 10.0 # seconds closing the window waits for a book render to checkpoint
 
 class Tooltip:
     def __init__(self, widget, text):
@@ -69,39 +91,53 @@ class Tooltip:
         self.tip_window = None
 
 class IconManager:
+    """Icon atlas: each PNG is decoded once, each (name, size, theme) variant is resized once"""
+
     def __init__(self, assets_dir="assets/icons"):
         self.assets_dir = Path(assets_dir)
-        self._cache = {}
+        self._cache = {}      # (name, size, dark) -> CTkImage
+        self._sources = {}    # file stem -> decoded RGBA image, or None if there is no such file
         self._dark_mode = True  # Default to dark mode
 
     def set_dark_mode(self, is_dark: bool):
-        """Update mode and clear cache when theme changes"""
-        if self._dark_mode != is_dark:
-            self._dark_mode = is_dark
-            self._cache.clear()
+        """Switch theme; variants of both themes stay cached, so switching back is free"""
+        self._dark_mode = is_dark
 
     def get(self, icon_name: str, size=(24, 24)) -> ctk.CTkImage:
-        """Load theme-appropriate icon with fallbacks"""
-        mapped_name = self._map_icon_name(icon_name)
+        """Theme-appropriate icon; a dict lookup once the variant has been built"""
+        key = (icon_name, size if isinstance(size, tuple) else tuple(size), self._dark_mode)
+        icon = self._cache.get(key)
+        if icon is None:
+            icon = self._cache[key] = self._build(icon_name, key[1], key[2])
+        return icon
+
+    def preload(self, icon_names, sizes=((16, 16), (24, 24))):
+        """Build variants ahead of time, e.g. for the buttons the playback path toggles"""
+        for icon_name in icon_names:
+            for size in sizes:
+                self.get(icon_name, size)
+
+    def _source(self, name: str):
+        if name not in self._sources:
+            img_path = self.assets_dir / f"{name}.png"
+            source = None
+            if img_path.exists():
+                try:
+                    with Image.open(img_path) as img:
+                        source = img.convert("RGBA")
+                except Exception as e:
+                    print(f"Could not load icon {img_path}: {e}")
+            self._sources[name] = source
+        return self._sources[name]
 
+    def _build(self, icon_name: str, size, dark: bool) -> ctk.CTkImage:
         # Try theme-specific version first
-        theme_suffix = "-dark" if self._dark_mode else ""
-        themed_name = f"{icon_name}{theme_suffix}"
-
-        # Try all possible variations
-        for name in [themed_name, icon_name]:
-            try:
-                img_path = self.assets_dir / f"{name}.png"
-                if img_path.exists():
-                    with Image.open(img_path) as img:
-                        img = img.resize(size, Image.Resampling.LANCZOS)
-                        return ctk.CTkImage(
-                            light_image=img,
-                            dark_image=img,
-                            size=size
-                        )
-            except:
-                continue
+        theme_suffix = "-dark" if dark else ""
+        for name in [f"{icon_name}{theme_suffix}", icon_name]:
+            source = self._source(name)
+            if source is not None:
+                img = source.resize(size, Image.Resampling.LANCZOS)
+                return ctk.CTkImage(light_image=img, dark_image=img, size=size)
 
         # Fallback to simple colored circle
         return self._get_fallback_icon(size, "red")
@@ -167,31 +203,22 @@ class VoxiomTTSApp(ctk.CTk):
         self._setup_methods()     # Ensures all methods exist
 
         # === Phase 5: TTS Engine ===
-        # 7. Initialize TTS engine with proper error handling
+        # 7. The engine is cheap to construct; torch is imported by the first model load
         self._setup_tts()
-        self._verify_models_with_checksum()
+        self.available_models = self._installed_models()
 
         # === Phase 6: UI Construction ===
         # 8. Build the user interface
         self._create_ui()  # Creates all tabs, controls, and status bar
 
         # === Phase 7: Final Initialization ===
-        # 9. Load initial data
-        if self.available_models:
-            self._load_model(self.available_models[0])
-            self._update_presets_for_model(self.available_models[0])
-
-        # 10. Set up window close handler
+        # 9. Set up window close handler
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
-        # 11. Load initial model and presets
-        if self.available_models:
-            initial_model = self.available_models[0]
-            self._load_model(initial_model)
-            self._update_presets_for_model(initial_model)  # This will properly initialize presets
-            self._load_first_preset_in_category(self.category_var.get())  # Load first preset in category
+        # 10. Checksums, torch and the initial model load run once the window is up
+        self.after_idle(self._start_background_init)
 
-        # 12. Initial debug output if enabled
+        # 11. Initial debug output if enabled
         if self.debug_mode:
             self._debug_state()
             print("Initialization complete")
@@ -305,9 +332,8 @@ class VoxiomTTSApp(ctk.CTk):
 
     def _setup_icon_theming(self):
         """Preload and theme essential icons"""
-        # Preload common icons
-        for icon in ["play", "stop", "pause", "export", "save", "synth"]:
-            self.icons.get(icon)
+        # Preload common icons, including the 16px variants the playback buttons swap between
+        self.icons.preload(["play", "stop", "pause", "export", "save", "synth", "loading"])
 
         # Set initial icons for buttons
         if hasattr(self, 'play_btn'):
@@ -428,6 +454,9 @@ class VoxiomTTSApp(ctk.CTk):
     def _setup_attributes(self):
         """Initialize all class attributes with checksums"""
         self.debug_mode = True
+        setup_logging(log_file=str(self.base_dir / "error_log.txt"),
+                      level=logging.DEBUG if self.debug_mode else logging.INFO)
+        tracer.enable(self.debug_mode or tracer.enabled)
         self.dark_bg = "#1e1e1e"
         self.dark_frame = "#2d2d2d"
         self.dark_text = "#ffffff"
@@ -436,8 +465,32 @@ class VoxiomTTSApp(ctk.CTk):
         # State variables
         self._presets = {}
         self.audio_data = None
+        self.audio_sample_rate = 48000
         self.playback_start_time = None
         self.is_playing = False
+        # Foreground engine jobs (synthesis, previews, gallery, book) that are running;
+        # a count because they overlap and each one ends on its own thread
+        self._engine_jobs = 0
+        self._engine_jobs_lock = threading.Lock()
+        self.preset_cache = None
+        self.planner = None
+        self.script_renderer = None
+        self.language_router = None
+        self.preset_search = None
+        self._search_after_id = None
+        self._book_stop = None
+        self._book_thread = None
+        self._close_deadline = None
+        self.voice_preview_cache = None
+        self.duration_estimator = DurationEstimator(str(self.base_dir / "duration_stats.json"))
+        self.text_stats = TextStats()
+        self._timing_after_id = None
+        self._gallery_stop = None
+        self._envelope = None      # per-bin waveform summary of the displayed audio
+        self._shown_take = None    # planner take behind the displayed audio, if any
+        self.audio_gain = 1.0      # normalization applied to the displayed audio
+        self._settings_built = False
+        self._model_job = None     # cancel event of the running verify/download job
         self.available_models = []
         self.tooltips = []
 
@@ -452,42 +505,9 @@ class VoxiomTTSApp(ctk.CTk):
         self.synthesis_state = ctk.StringVar(value="ready")
         self.playback_pos = ctk.DoubleVar(value=0.0)
 
-        # Model checksums (SHA256) - add your actual checksums here
-        self.model_checksums = {
-            "v3_en.pt": "02b71034d9f13bc4001195017bac9db1c6bb6115e03fea52983e8abcff13b665",
-            "v3_1_ru.pt": "cf60b47ec8a9c31046021d2d14b962ea56b8a5bf7061c98accaaaca428522f85",
-            "v4_ru.pt": "896ab96347d5bd781ab97959d4fd6885620e5aab52405d3445626eb7c1414b00"
-        }
-
-        self.supported_models = {
-            "v3_en": {
-                "file": "v3_en.pt",
-                "sample_rates": [8000, 24000, 48000],
-                "supports_sample_rate": True,  # Explicit flag
-                "speakers": [f'en_{i}' for i in range(118)],
-                "default_rate": 48000,
-                "language": "en",
-                "supports_ssml": False
-            },
-            "v3_1_ru": {
-                "file": "v3_1_ru.pt",
-                "sample_rates": [8000, 24000, 48000],
-                "supports_sample_rate": True,  # Explicit flag
-                "speakers": ['aidar', 'baya', 'kseniya', 'xenia', 'eugene'],
-                "default_rate": 48000,
-                "language": "ru",
-                "supports_ssml": False
-            },
-            "v4_ru": {
-                "file": "v4_ru.pt",
-                "sample_rates": [8000, 24000, 48000],
-                "supports_sample_rate": True,  # Explicit flag
-                "speakers": ['aidar', 'baya', 'kseniya', 'xenia', 'eugene'],
-                "default_rate": 48000,
-                "language": "ru",
-                "supports_ssml": True
-            }
-        }
+        registry = get_registry(str(self.models_dir))
+        self.model_checksums = registry.checksums()
+        self.supported_models = registry.synthesis_models()
 
         self.just_buttons = []  # Initialize empty list for SSML buttons
 
@@ -580,31 +600,15 @@ class VoxiomTTSApp(ctk.CTk):
                 )
 
     def _load_presets_file(self):
-        """Load presets from file or create default structure"""
+        """Load presets from the shared preset store"""
         try:
-            if os.path.exists(self.presets_file):
-                with open(self.presets_file, 'r', encoding='utf-8') as f:
-                    self.presets = json.load(f)
-            else:
-                self.presets = {
-                    "Russian": {},
-                    "English": {}
-                }
-                self._save_presets_to_file()
+            self.presets = get_store()
         except Exception as e:
             print(f"Error loading presets: {e}")
-            self.presets = {
+            self.presets = memory_store({
                 "Russian": {},
                 "English": {}
-            }
-
-    def _save_presets_to_file(self):
-        """Save presets to JSON file"""
-        try:
-            with open(self.presets_file, 'w', encoding='utf-8') as f:
-                json.dump(self.presets, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error saving presets: {e}")
+            })
 
     def _verify_presets(self):
         print(f"\n=== Presets Verification ===")
@@ -613,36 +617,32 @@ class VoxiomTTSApp(ctk.CTk):
         print(f"Loaded presets: {self.presets}")
         print(f"==========================\n")
 
-    def _update_preset_options(self, *args):
-        """Safely update presets dropdown"""
-        try:
-            category = self.category_var.get()
-            if not hasattr(self, 'presets') or category not in self.presets:
-                self.preset_menu.configure(values=[])
-                return
-
-            presets = self.presets[category]
-            preset_names = []
-
-            for name, content in presets.items():
-                if isinstance(content, dict):  # New format
-                    # Only show presets matching current language
-                    if (category == "Russian" and content.get("language") == "ru") or \
-                       (category == "English" and content.get("language") == "en"):
-                        preset_names.append(name)
-                else:  # Legacy format - include all
-                    preset_names.append(name)
+    def _on_preset_search_changed(self, event=None):
+        """Debounce keystrokes so fast typing runs one search"""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(30, self._apply_preset_search)
+
+    def _apply_preset_search(self):
+        """Show ranked search hits for the current category in the preset dropdown"""
+        self._search_after_id = None
+        query = self.preset_search_var.get().strip()
+        if not query or self.preset_search is None:
+            self._update_preset_options()
+            return
 
-            self.preset_menu.configure(values=preset_names)
-            if preset_names:
-                self.preset_var.set(preset_names[0])
+        try:
+            results = self.preset_search.search(query, category=self.category_var.get())
+            names = [name for _, name in results]
+            self.preset_menu.configure(values=names or ["No matches"])
+            if names:
+                self.preset_var.set(names[0])
         except Exception as e:
-            print(f"Preset update error: {e}")
-            self.preset_menu.configure(values=[])
+            logger.debug(f"Preset search error: {e}")
 
     def _load_preset(self, choice):
         try:
-            if choice == "Untitled":
+            if choice in ("Untitled", "No matches"):
                 return  # Don't try to load an untitled preset
 
             category = self.category_var.get()
@@ -666,80 +666,123 @@ class VoxiomTTSApp(ctk.CTk):
 
             # Update SSML button states
             self._toggle_ssml()
+            self._show_cached_preset()
 
         except Exception as e:
             if choice != "Untitled":  # Only show errors for real presets
                 self._handle_error(f"Failed to load preset '{choice}'", e)
 
-    def _update_waveform(self, audio_data):
-        """Update waveform display with proper mono/stereo handling"""
-        try:
-            # Clear previous plots
-            self.ax_left.clear()
-            self.ax_right.clear()
+    def _update_waveform(self, audio_data, changed=None, gain=None):
+        """Update waveform display; `changed` limits the work to that sample range.
 
-            # Configure axes
-            for ax in [self.ax_left, self.ax_right]:
-                ax.grid(True, color='#333333', linestyle='--', alpha=0.5)
-                ax.set_ylim(-1.1, 1.1)
-                ax.set_xticklabels([])
-                ax.set_yticklabels([])
+        The figure and its Tk canvas are only built and drawn on the Tk thread;
+        a call from any other thread is re-posted there.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            self.after(0, self._update_waveform, audio_data, changed, gain)
+            return
+        with tracer.span("gui.waveform", samples=len(audio_data), partial=changed is not None):
+            self._render_waveform(audio_data, changed, gain)
+
+    def _waveform_envelope(self, audio_data, changed=None, gain=None):
+        """Min, max and energy per WAVEFORM_BIN samples.
+
+        With `changed` (a sample range) and the gain the audio was normalized
+        with, bins before and after the range are taken from the previous
+        envelope, rescaled if the gain moved, and only the edited bins are
+        recomputed.
+        """
+        channels = audio_data.shape[1]
+        total_bins = -(-len(audio_data) // WAVEFORM_BIN)
+        previous = self._envelope
+        first, last = 0, total_bins
+        if (changed is not None and gain is not None and previous is not None
+                and previous["channels"] == channels and previous["gain"]):
+            first = min(changed[0] // WAVEFORM_BIN, len(previous["lo"]), total_bins)
+            last = max(first, min(-(-changed[1] // WAVEFORM_BIN), total_bins))
+            if previous["samples"] != len(audio_data):
+                last = total_bins   # the tail moved, so its bins no longer line up
+        else:
+            previous = None
 
+        block = audio_data[first * WAVEFORM_BIN:last * WAVEFORM_BIN]
+        pad = (last - first) * WAVEFORM_BIN - len(block)
+        if pad:
+            block = np.concatenate((block, np.zeros((pad, channels), dtype=block.dtype)))
+        block = block.reshape(last - first, WAVEFORM_BIN, channels)
+        fresh = (block.min(axis=1), block.max(axis=1), np.square(block).sum(axis=1))
+
+        if previous is None:
+            lo, hi, energy = fresh
+        else:
+            scale = gain / previous["gain"]
+            tail = total_bins - last
+            keep = lambda values, factor: (values[:first] * factor,
+                                           values[len(values) - tail:] * factor if tail else values[:0])
+            parts = [keep(previous[name], factor) for name, factor in
+                     (("lo", scale), ("hi", scale), ("energy", scale * scale))]
+            lo, hi, energy = (np.concatenate((head, new, end))
+                              for (head, end), new in zip(parts, fresh))
+
+        self._envelope = {"lo": lo, "hi": hi, "energy": energy, "channels": channels,
+                          "samples": len(audio_data), "gain": gain}
+        return self._envelope
+
+    def _render_waveform(self, audio_data, changed=None, gain=None):
+        self._ensure_waveform()
+        try:
             # Ensure audio_data is 2D (samples, channels)
             if len(audio_data.shape) == 1:
                 audio_data = np.expand_dims(audio_data, axis=1)
-
-            # Get number of channels
             num_channels = audio_data.shape[1]
+            envelope = self._waveform_envelope(audio_data, changed, gain)
 
-            # Plot based on output mode and available channels
+            # Mono display shows the same data on both channels
             if self.output_mode.get() == "mono" or num_channels == 1:
-                # Mono display - same data on both channels
-                mono_data = audio_data[:,0] if num_channels > 1 else audio_data[:,0]
-                self.line_left, = self.ax_left.plot(mono_data, color='#4CAF50')
-                self.line_right, = self.ax_right.plot(mono_data, color='#4CAF50')
+                shown = (0, 0)
             else:
-                # Stereo display
-                self.line_left, = self.ax_left.plot(audio_data[:,0], color='#4CAF50')
-                if num_channels > 1:
-                    self.line_right, = self.ax_right.plot(audio_data[:,1], color='#4CAF50')
-                else:
-                    self.line_right, = self.ax_right.plot(audio_data[:,0], color='#4CAF50')
-
-            # Add RMS visualization
-            for ax, channel in zip([self.ax_left, self.ax_right],
-                                 [audio_data[:,0],
-                                  audio_data[:,1] if num_channels > 1 else audio_data[:,0]]):
-                rms = np.sqrt(np.mean(channel**2))
-                ax.fill_betweenx(
+                shown = (0, 1)
+
+            # One vertical min-max stroke per bin
+            x = np.repeat(np.arange(len(envelope["lo"])) * WAVEFORM_BIN, 2)
+            total = max(len(audio_data), 1)
+            bands = getattr(self, '_rms_bands', [])
+            for band in bands:
+                band.remove()
+            self._rms_bands = []
+            for ax, line, channel in zip([self.ax_left, self.ax_right],
+                                         [self.line_left, self.line_right], shown):
+                y = np.column_stack((envelope["lo"][:, channel], envelope["hi"][:, channel])).ravel()
+                line.set_data(x, y)
+                ax.set_xlim(0, total)
+
+                # RMS visualization
+                rms = np.sqrt(envelope["energy"][:, channel].sum() / total)
+                self._rms_bands.append(ax.fill_betweenx(
                     [-1.1, -1.1 + rms*2.2],
-                    0, len(channel),
+                    0, total,
                     color='#4CAF50',
                     alpha=0.1
-                )
+                ))
 
-            # Initialize or update cursor lines
-            # self.cursor_left = self.ax_left.axvline(x=0, color='red', linewidth=1.5, alpha=0.9)
-            # self.cursor_right = self.ax_right.axvline(x=0, color='red', linewidth=1.5, alpha=0.9)
-            # Initialize or update cursor lines with higher visibility
-            self.cursor_left = self.ax_left.axvline(x=0, color='red', linewidth=2, alpha=0.9)
-            self.cursor_right = self.ax_right.axvline(x=0, color='red', linewidth=2, alpha=0.9)
+            # Cursors back to the start, visible
+            for cursor in (self.cursor_left, self.cursor_right):
+                cursor.set_xdata([0, 0])
+                cursor.set_alpha(0.9)
 
             # Update duration display
-            duration = len(audio_data) / 48000
+            duration = len(audio_data) / self.audio_sample_rate
             self.time_text.set_text(f"00:00.000 / {self._format_duration(duration)}")
 
-            self.canvas.draw()
+            self.canvas.draw_idle()
 
         except Exception as e:
             print(f"Waveform update error: {e}")
             # Fallback to empty display
-            self.ax_left.clear()
-            self.ax_right.clear()
-            for ax in [self.ax_left, self.ax_right]:
-                ax.grid(True, color='#333333', linestyle='--', alpha=0.5)
-                ax.set_ylim(-1.1, 1.1)
-            self.canvas.draw()
+            self._envelope = None
+            self.line_left.set_data([], [])
+            self.line_right.set_data([], [])
+            self.canvas.draw_idle()
 
     def _format_duration(self, seconds):
         """Format seconds to MM:SS.mmm"""
@@ -785,8 +828,31 @@ class VoxiomTTSApp(ctk.CTk):
             print(f" - {f.name} ({f.stat().st_size/1024/1024:.2f} MB)")
 
         try:
-            # Initialize WITHOUT default_sample_rate
-            self.tts = SileroTTS(str(self.models_dir))
+            # Inference runs in a supervised child process so it never competes with Tk for the GIL
+            self.tts = create_engine(str(self.models_dir))
+            self.planner = SynthesisPlanner(self.tts)
+            self.tts.duration_estimator = self.duration_estimator
+            self.script_renderer = ScriptRenderer(self.tts)
+            self.language_router = LanguageRouter(self.tts)
+            metrics.registry.start_from_env()
+            store = get_store()
+            store.subscribe(self._on_presets_changed)
+
+            # Search index is built off the main thread, then kept current by the store
+            self.preset_search = PresetSearchIndex()
+            store.subscribe(self.preset_search.on_preset_changed)
+            threading.Thread(target=self.preset_search.rebuild, args=(store,), daemon=True).start()
+            self.preset_cache = PresetAudioCache(
+                self.tts,
+                str(self.base_dir / "cache" / "presets"),
+                presets_provider=lambda: self.presets,
+                is_idle=self._is_engine_idle
+            )
+            self.voice_preview_cache = VoicePreviewCache(
+                self.tts,
+                str(self.base_dir / "cache" / "voices"),
+                is_idle=self._is_engine_idle
+            )
             # Check what parameters the engine supports
             self.tts.SUPPORTS_SAMPLE_RATE = hasattr(self.tts, 'sample_rate')
             self.status_var.set(f"TTS engine ready")
@@ -814,11 +880,8 @@ class VoxiomTTSApp(ctk.CTk):
             # Get voices for the loaded model
             voices = self.tts.get_voices()
 
-            # Add these debug prints
-            print(f"\n=== Voice Loading Debug ===")
-            print(f"Loaded voices for {model_name}: {voices}")
-            print(f"Voice menu exists: {hasattr(self, 'voice_menu')}")
-            print(f"==========================\n")
+            logger.debug(f"Loaded voices for {model_name}: {voices} "
+                         f"(voice menu exists: {hasattr(self, 'voice_menu')})")
 
             # Update voice menu if it exists
             if hasattr(self, 'voice_menu'):
@@ -828,7 +891,7 @@ class VoxiomTTSApp(ctk.CTk):
                     self._update_presets_for_language(voices[0].split('_')[0])
 
         except Exception as e:
-            print(f"UI update error: {e}")
+            logger.warning(f"UI update error: {e}")
             self.status_var.set(f"UI update failed: {str(e)}")
 
     def _update_presets_for_language(self, language: str):
@@ -836,14 +899,18 @@ class VoxiomTTSApp(ctk.CTk):
         if not hasattr(self, 'tts') or not hasattr(self.tts, 'presets'):
             return
 
-        available_presets = []
-        for category, presets in self.tts.presets.items():
-            # Check for language-specific or default preset
-            if language in presets or 'default' in presets:
-                available_presets.append(category)
+        if hasattr(self.tts.presets, 'categories'):
+            # Served from the preset store's language index
+            available_presets = self.tts.presets.categories(language)
+        else:
+            available_presets = []
+            for category, presets in self.tts.presets.items():
+                # Check for language-specific or default preset
+                if language in presets or 'default' in presets:
+                    available_presets.append(category)
 
         # Update UI if components exist
-        if hasattr(self, 'category_menu'):
+        if hasattr(self, 'category_menu') and available_presets:
             self.category_menu.configure(values=available_presets)
             if available_presets:
                 self.category_var.set(available_presets[0])
@@ -872,11 +939,75 @@ class VoxiomTTSApp(ctk.CTk):
             return
 
         sample_text = "This is a voice preview"
+        model_name = self.tts.current_model
+        speaker = self.voice_var.get()
+
+        preview = None
+        if self.voice_preview_cache is not None and model_name:
+            preview = self.voice_preview_cache.lookup(model_name, speaker)
+        if preview is not None:
+            sd.play(*preview)
+            self.status_var.set(f"Previewing {speaker}")
+            return
         threading.Thread(
-            target=lambda: self._generate_and_play(sample_text),
+            target=self._generate_and_play,
+            args=(sample_text, model_name, speaker, self._selected_sample_rate(model_name)),
             daemon=True
         ).start()
 
+    def _on_voice_changed(self, speaker):
+        """Warm the newly selected voice up in the background"""
+        self._schedule_timing_update()
+        self._schedule_background_renders()
+        model_name = self.tts.current_model
+        if model_name and hasattr(self.tts, 'warm_voice'):
+            threading.Thread(target=self._warm_voice, args=(speaker, model_name), daemon=True).start()
+
+    def _warm_voice(self, speaker, model_name):
+        try:
+            if self.tts.warm_voice(speaker, model_name):
+                logger.debug(f"Warmed up voice {model_name}:{speaker}")
+        except Exception as e:
+            logger.debug(f"Voice warm-up failed for {speaker}: {e}")
+
+    def _render_voice_gallery(self):
+        """Render previews for all voices of the current model in one background pass"""
+        if self._gallery_stop is not None:
+            self._gallery_stop.set()
+            return
+        model_name = self.tts.current_model
+        if not model_name or self.voice_preview_cache is None:
+            return
+
+        previews = self.voice_preview_cache
+        speakers = previews.missing(model_name, self.tts.get_voices(model_name))
+        if not speakers:
+            self.status_var.set("Voice gallery ready")
+            return
+
+        self._gallery_stop = threading.Event()
+        self.gallery_btn.configure(text="Stop")
+        self._begin_engine_job()
+
+        def run():
+            done = 0
+            try:
+                for speaker, audio in self.tts.render_gallery(
+                        speakers, model_name=model_name, sample_rate=previews.sample_rate,
+                        stop_event=self._gallery_stop):
+                    previews.store(model_name, speaker, np.asarray(audio))
+                    done += 1
+                    self.after(0, lambda s=speaker, n=done: self.status_var.set(
+                        f"Voice gallery: {n}/{len(speakers)} ({s})"))
+            except Exception as e:
+                self.after(0, lambda err=e: self._handle_error("Voice gallery failed", err))
+            finally:
+                self._end_engine_job()
+                self._gallery_stop = None
+                self.after(0, lambda: self.gallery_btn.configure(text="Gallery"))
+
+        threading.Thread(target=run, daemon=True).start()
+
     def _update_voices(self, *args):
         """Update voice list when language changes"""
         language = self.language_var.get()
@@ -885,65 +1016,96 @@ class VoxiomTTSApp(ctk.CTk):
         if voices:
             self.voice_var.set(voices[0])
 
-    def _verify_models_with_checksum(self):
-        """Case-insensitive checksum verification"""
-        self.available_models = []
-        for model_name, config in self.tts.supported_models.items():
-            model_file = config.get("file")
-            model_path = self.models_dir / model_file
-
-            if model_path.exists():
-                # Case-insensitive comparison
-                if model_file in self.model_checksums:
-                    with open(model_path, 'rb') as f:
-                        file_hash = hashlib.sha256(f.read()).hexdigest().upper()  # Force uppercase
+    def _installed_models(self) -> list:
+        """Models whose files are present; checksums are verified in the background"""
+        return [name for name, config in self.tts.supported_models.items()
+                if config.get("file") and (self.models_dir / config["file"]).exists()]
+
+    def _verify_models_with_checksum(self) -> list:
+        """Case-insensitive checksum verification; runs off the main thread"""
+        verified = []
+        for model_name in self._installed_models():
+            expected = self.model_checksums.get(self.tts.supported_models[model_name]["file"])
+            if expected is None:
+                # Accept if no checksum defined; hash anyway, previews and preset clips are keyed by it
+                self.tts.model_hash(model_name)
+                verified.append(model_name)
+            elif (self.tts.model_hash(model_name) or "").upper() == expected.upper():
+                verified.append(model_name)
+        return verified
+
+    def _start_background_init(self):
+        """Verify models, import torch and load the initial model off the main thread"""
+        self.status_var.set(f"Loading TTS engine...")
+        threading.Thread(target=self._background_init, name="startup", daemon=True).start()
+
+    def _background_init(self):
+        started = time.perf_counter()
+        # Playback and the waveform view are needed by the first synthesis
+        preload("sounddevice", "soundfile", "matplotlib.pyplot", "matplotlib.figure",
+                "matplotlib.backends.backend_tkagg")
+        verified, initial = [], None
+        try:
+            verified = self._verify_models_with_checksum()
+            if verified:
+                initial = verified[0]
+                with tracer.span("gui.startup_model_load", model=initial):
+                    if not self.tts.load_model(initial):
+                        initial = None
+        except Exception as e:
+            logger.error(f"Background start-up failed: {e}")
+        logger.info(f"Engine ready {time.perf_counter() - started:.2f}s after the window")
+        self.after(0, self._finish_startup, verified, initial)
 
-                    if file_hash == self.model_checksums[model_file].upper():  # Compare uppercase
-                        self.available_models.append(model_name)
-                else:
-                    self.available_models.append(model_name)  # Accept if no checksum defined
+    def _finish_startup(self, verified: list, initial: str):
+        self.available_models = verified
+        if not verified:
+            self.status_var.set(f"No valid models found. Please download models.")
+            self._handle_missing_models()
+            return
+        # The model is already in memory, so this only updates voices and presets
+        if initial and self._load_model(initial):
+            self._load_first_preset_in_category(self.category_var.get())
 
     def _verify_models(self):
         """Enhanced model verification with detailed debugging"""
         if not hasattr(self, 'tts'):
-            print(f"TTS engine not initialized in _verify_models")
+            logger.warning("TTS engine not initialized in _verify_models")
             self.available_models = []
             return
 
         if not hasattr(self.tts, 'supported_models'):
-            print(f"No supported_models attribute in TTS engine")
+            logger.warning("No supported_models attribute in TTS engine")
             self.available_models = []
             return
 
         self.available_models = []
-        print(f"\n=== Model Verification ===")
 
         for model_name, config in self.tts.supported_models.items():
             model_file = config.get("file")
             if not model_file:
-                print(f"Skipping {model_name} - no file specified")
+                logger.debug(f"Skipping {model_name} - no file specified")
                 continue
 
             model_path = self.models_dir / model_file
-            print(f"Checking model: {model_name} at {model_path}")
+            logger.debug(f"Checking model: {model_name} at {model_path}")
 
             if not model_path.exists():
-                print(f" - File not found: {model_path}")
+                logger.debug(f"File not found: {model_path}")
                 continue
 
             try:
                 # Verify the model can be loaded
                 if self._verify_model(str(model_path)):
-                    print(f" - Model verified: {model_name}")
+                    logger.debug(f"Model verified: {model_name}")
                     self.available_models.append(model_name)
                 else:
-                    print(f" - Model verification failed: {model_name}")
+                    logger.warning(f"Model verification failed: {model_name}")
             except Exception as e:
-                print(f" - Error verifying model {model_name}: {str(e)}")
+                logger.warning(f"Error verifying model {model_name}: {str(e)}")
                 continue
 
-        print(f"Available models: {self.available_models}")
-        print(f"=======================\n")
+        logger.info(f"Available models: {self.available_models}")
 
         # Update UI
         if hasattr(self, 'model_menu'):
@@ -982,7 +1144,6 @@ class VoxiomTTSApp(ctk.CTk):
         """Configure dark theme"""
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("dark-blue")
-        plt.style.use('dark_background')
 
         self.style = ttk.Style()
         self.style.theme_use('default')
@@ -1009,9 +1170,9 @@ class VoxiomTTSApp(ctk.CTk):
         self._create_settings_tab()
         self._create_status_bar()  # Now status_var exists when this is called
 
-            # Initialize with first model if available
-        if hasattr(self, 'tts') and self.available_models:
-            self._update_model_ui(self.available_models[0])
+        # The model itself is loaded in the background once the window is up
+        if self.available_models:
+            self.model_var.set(self.available_models[0])
 
     def _on_model_selected(self, event=None):
         """Handle model selection changes with integrated model indicator updates"""
@@ -1052,6 +1213,8 @@ class VoxiomTTSApp(ctk.CTk):
             # Update all dependent components
             self._update_model_dependent_ui(model_name)
 
+            self._schedule_background_renders()
+
             # Success feedback
             self.status_var.set(f"Model loaded: {model_name}")
             self.status_icon.configure(image=self.status_icons["ready"])
@@ -1123,41 +1286,9 @@ class VoxiomTTSApp(ctk.CTk):
         print(f"==========================")
 
     def _create_waveform_display(self, parent):
-        frame = ctk.CTkFrame(parent, height=120, fg_color=self.dark_frame)
-        frame.pack(fill="x", padx=5, pady=(0,5), expand=False)
-
-        self.fig = Figure(figsize=(10, 1.5), dpi=100, facecolor=self.dark_frame)
-        gs = self.fig.add_gridspec(2, 1, height_ratios=[1, 1])
-
-        # Waveform channels
-        self.ax_left = self.fig.add_subplot(gs[0], facecolor=self.dark_frame)
-        self.ax_right = self.fig.add_subplot(gs[1], facecolor=self.dark_frame)
-
-        # Configure axes
-        for ax, label in zip([self.ax_left, self.ax_right], ["L", "R"]):
-            ax.grid(True, color='#333333', linestyle=':', alpha=0.3)
-            ax.set_ylim(-1.1, 1.1)
-            ax.set_yticks([])
-            ax.set_xticklabels([])
-            ax.text(0.01, 0.9, label, transform=ax.transAxes,
-                   color='white', fontsize=10, fontweight='bold')
-
-        # Initialize empty waveforms
-        self.line_left, = self.ax_left.plot([], [], color='#4CAF50', linewidth=1.5)
-        self.line_right, = self.ax_right.plot([], [], color='#4CAF50', linewidth=1.5)
-
-        # Initialize cursors
-        self.cursor_left = self.ax_left.axvline(x=0, color='#FF0000', linewidth=2, alpha=0)
-        self.cursor_right = self.ax_right.axvline(x=0, color='#FF0000', linewidth=2, alpha=0)
-
-        # Initialize time text
-        self.time_text = self.fig.text(0.5, 0.02, "00:00.000 / 00:00.000",
-                                     ha='center', color='white', fontsize=10)
-
-        self.canvas = FigureCanvasTkAgg(self.fig, master=frame)
-        self.canvas.get_tk_widget().pack(fill="x", expand=False)
-        self.canvas.mpl_connect('button_press_event', self._on_waveform_click)
-
+        self.waveform_frame = ctk.CTkFrame(parent, height=120, fg_color=self.dark_frame)
+        self.waveform_frame.pack(fill="x", padx=5, pady=(0,5), expand=False)
+        # The matplotlib figure is created by _ensure_waveform when there is audio to show
         # Time display frame below waveform
         time_frame = ctk.CTkFrame(parent, height=28, fg_color="#252525")
         time_frame.pack(fill="x", padx=5, pady=(0,5))
@@ -1202,6 +1333,44 @@ class VoxiomTTSApp(ctk.CTk):
         )
         self.large_time.pack(side="right", padx=10)
 
+    def _ensure_waveform(self):
+        """Create the waveform figure on first use"""
+        if hasattr(self, 'fig'):
+            return
+        with tracer.span("gui.waveform_init"):
+            plt.style.use('dark_background')
+            self.fig = mpl_figure.Figure(figsize=(10, 1.5), dpi=100, facecolor=self.dark_frame)
+            gs = self.fig.add_gridspec(2, 1, height_ratios=[1, 1])
+
+            # Waveform channels
+            self.ax_left = self.fig.add_subplot(gs[0], facecolor=self.dark_frame)
+            self.ax_right = self.fig.add_subplot(gs[1], facecolor=self.dark_frame)
+
+            # Configure axes
+            for ax, label in zip([self.ax_left, self.ax_right], ["L", "R"]):
+                ax.grid(True, color='#333333', linestyle=':', alpha=0.3)
+                ax.set_ylim(-1.1, 1.1)
+                ax.set_yticks([])
+                ax.set_xticklabels([])
+                ax.text(0.01, 0.9, label, transform=ax.transAxes,
+                       color='white', fontsize=10, fontweight='bold')
+
+            # Initialize empty waveforms
+            self.line_left, = self.ax_left.plot([], [], color='#4CAF50', linewidth=1.5)
+            self.line_right, = self.ax_right.plot([], [], color='#4CAF50', linewidth=1.5)
+
+            # Initialize cursors
+            self.cursor_left = self.ax_left.axvline(x=0, color='#FF0000', linewidth=2, alpha=0)
+            self.cursor_right = self.ax_right.axvline(x=0, color='#FF0000', linewidth=2, alpha=0)
+
+            # Initialize time text
+            self.time_text = self.fig.text(0.5, 0.02, "00:00.000 / 00:00.000",
+                                         ha='center', color='white', fontsize=10)
+
+            self.canvas = backend_tkagg.FigureCanvasTkAgg(self.fig, master=self.waveform_frame)
+            self.canvas.get_tk_widget().pack(fill="x", expand=False)
+            self.canvas.mpl_connect('button_press_event', self._on_waveform_click)
+
     def _on_waveform_click(self, event):
         if not hasattr(self, 'audio_data') or self.audio_data is None:
             return
@@ -1215,8 +1384,8 @@ class VoxiomTTSApp(ctk.CTk):
             # If currently playing, stop and seek
             if self.is_playing:
                 sd.stop()
-                self.playback_start_time = time.time() - (x_pos/48000)
-                sd.play(self.audio_data[x_pos:], 48000, blocking=False)
+                self.playback_start_time = time.time() - (x_pos/self.audio_sample_rate)
+                sd.play(self.audio_data[x_pos:], self.audio_sample_rate, blocking=False)
             else:
                 # Just move the cursor if not playing
                 self._draw_playback_cursor(x_pos/total_samples)
@@ -1265,13 +1434,9 @@ class VoxiomTTSApp(ctk.CTk):
             self.status_var.set(error_msg)
             self.status_icon.configure(image=self.status_icons["error"])
 
-            # Detailed logging
+            # Detailed logging (written to error_log.txt by a background thread)
             error_details = traceback.format_exc()
-            print(f"ERROR: {error_msg}\n{error_details}")
-
-            # Log to file
-            with open("error_log.txt", "a") as f:
-                f.write(f"[{time.ctime()}] {error_msg}\n{error_details}\n\n")
+            logger.error(f"ERROR: {error_msg}\n{error_details}")
 
         except Exception as e:
             print(f"Error handling failed: {str(e)}")
@@ -1310,6 +1475,14 @@ class VoxiomTTSApp(ctk.CTk):
             self.sample_rate_var.set("48000")
             return 48000
 
+    def _selected_sample_rate(self, model_name):
+        """Rate a synthesis with `model_name` produces: the chosen one if the model lets
+        the user choose, else its default. Reads Tk variables, so Tk thread only."""
+        model_info = self.supported_models.get(model_name, {})
+        if model_info.get('supports_sample_rate', False):
+            return self._validate_sample_rate(model_info)
+        return model_info.get('default_rate', 48000)
+
     def _synthesize(self):
         if self.synthesis_state.get() == "synthesizing":
             return
@@ -1320,13 +1493,23 @@ class VoxiomTTSApp(ctk.CTk):
             return
 
         self.synthesis_state.set(f"synthesizing")
+        self._begin_engine_job()
         self.play_btn.configure(state="disabled")
         self.status_var.set(f"Synthesizing...")
 
-        threading.Thread(target=self._run_synthesis, args=(text,), daemon=True).start()
-
-    def _run_synthesis(self, text):
-        """Handle the complete synthesis process with proper parameter handling"""
+        # Read every setting here and pin it: a switch while this runs must not change
+        # it, and the worker thread must not touch Tk variables
+        model_name = self.tts.current_model
+        sample_rate = self._selected_sample_rate(model_name)
+        threading.Thread(target=self._run_synthesis,
+                         args=(text, model_name, self.voice_var.get()),
+                         kwargs={'ssml': self._is_ssml_mode(), 'sample_rate': sample_rate,
+                                 'preset': self._preset_selection()},
+                         daemon=True).start()
+
+    def _run_synthesis(self, text, model_name=None, speaker=None, ssml=False, sample_rate=None,
+                       preset=None):
+        """Synthesize on a worker thread; all settings come from the Tk thread as arguments"""
         try:
             # Validate input
             text = text.strip()
@@ -1337,21 +1520,19 @@ class VoxiomTTSApp(ctk.CTk):
             # Prepare base parameters
             params = {
                 'text': text,
-                'speaker': self.voice_var.get()
+                'speaker': speaker,
+                'model_name': model_name
             }
 
-            # Check if model supports SSML
-            if self._is_ssml_mode():
+            if ssml:
                 params['ssml'] = True
 
-            # Check if sample rate should be included
-            current_model = self.model_var.get()
-            if current_model in self.supported_models:
-                model_info = self.supported_models[current_model]
-
-                # Only add sample_rate if the model explicitly supports it
-                if model_info.get('supports_sample_rate', False):
-                    params['sample_rate'] = int(self.sample_rate_var.get())
+            # Only passed on when the model explicitly supports choosing the rate
+            current_model = model_name or self.tts.current_model
+            model_info = self.supported_models.get(current_model, {})
+            if model_info.get('supports_sample_rate', False):
+                params['sample_rate'] = sample_rate
+            sample_rate = sample_rate or model_info.get('default_rate', 48000)
 
             # Update UI for synthesis start
             self.after(0, lambda: [
@@ -1366,24 +1547,52 @@ class VoxiomTTSApp(ctk.CTk):
                 if param in inspect.signature(self.tts.speak).parameters:
                     valid_params[param] = value
 
-            audio = self.tts.speak(**valid_params)
-
-            # Convert to numpy and process audio
-            audio_np = audio.numpy()
-            if len(audio_np.shape) == 1:  # Mono audio
-                audio_np = np.expand_dims(audio_np, axis=1)  # Convert to 2D
-
-            # Normalize audio with headroom
-            max_amp = np.max(np.abs(audio_np))
-            if max_amp > 0:
-                audio_np = (audio_np / max_amp) * 0.95  # 5% headroom
-
-            # Add small silence at beginning
-            silence = np.zeros((int(0.05 * 48000), audio_np.shape[1]))
-            self.audio_data = np.concatenate((silence, audio_np))
+            # Presets rendered in the background play back without synthesis
+            audio_np = self._cached_preset_audio(text, sample_rate, current_model, speaker, preset)
+            if audio_np is None and self.script_renderer and not valid_params.get('ssml') \
+                    and looks_like_script(text, self.tts.supported_models, current_model):
+                # "[speaker] text" lines: one voice per line, rendered in one pass
+                lines = parse_script(text, self.tts.supported_models, current_model, valid_params.get('speaker'))
+                audio_np, sample_rate = self.script_renderer.render(lines, valid_params.get('sample_rate'))
+            elif audio_np is None and self.language_router and not valid_params.get('ssml') and is_mixed(
+                    text, self.tts.supported_models.get(current_model, {}).get("language")):
+                # Letters the selected model can't read: each sentence (or run within one)
+                # goes to a model of its language, rendered side by side
+                audio_np, sample_rate = self.language_router.render(
+                    text, valid_params.get('speaker'), valid_params.get('sample_rate'), current_model)
+            changed = None
+            shown_take, self._shown_take = self._shown_take, None
+            plan = None
+            if audio_np is None and self.planner and not valid_params.get('ssml'):
+                # Chunked with the normalizer's sentence split, so abbreviations stay in
+                # their sentence; a single sentence is synthesized as it is
+                plan = self.planner.plan(text, speaker=valid_params.get('speaker'))
+                if plan.total_chunks < 2:
+                    plan = None
+            if plan is not None:
+                # Sentences repeated in the text, or unchanged since the last take, are
+                # synthesized once; an edit only re-renders the sentences it touched
+                previous_take = self.planner.last_take
+                audio_np, changed = self.planner.render_incremental(
+                    plan, valid_params.get('sample_rate'), current_model,
+                    progress=lambda done, total: self.after(
+                        0, self.status_var.set, f"Synthesizing... {done}/{total} sentences"))
+                if previous_take is None or previous_take is not shown_take:
+                    changed = None  # the waveform on screen is not what this take was diffed against
+                self._shown_take = self.planner.last_take
+                sample_rate = self.planner.last_take.sample_rate
+                logger.info(f"Synthesis plan: {plan.describe()}; {self.planner.last_pipeline.report()}")
+            if audio_np is None:
+                audio_np = np.asarray(self.tts.speak(**valid_params))
+
+            self.audio_data = self._postprocess_audio(audio_np, sample_rate)
+            self.audio_sample_rate = sample_rate
+            if changed is not None:
+                lead = int(LEAD_IN * sample_rate)
+                changed = (changed[0] + lead, changed[1] + lead)
 
             # Update UI on completion
-            self.after(0, self._on_synthesis_complete)
+            self.after(0, self._on_synthesis_complete, changed)
 
         except Exception as error:
             error_msg = str(error) or "Unknown error"
@@ -1392,8 +1601,90 @@ class VoxiomTTSApp(ctk.CTk):
                 self.play_btn.configure(state="normal"),
                 self.status_icon.configure(image=self.status_icons["error"])
             ])
+        finally:
+            self._end_engine_job()
 
-    def _on_synthesis_complete(self):
+    def _postprocess_audio(self, audio_np, sample_rate):
+        """Normalize mono engine output and add a short lead-in silence"""
+        with tracer.span("gui.postprocess"):
+            if len(audio_np.shape) == 1:  # Mono audio
+                audio_np = np.expand_dims(audio_np, axis=1)  # Convert to 2D
+
+            # Normalize audio with headroom
+            max_amp = np.max(np.abs(audio_np))
+            self.audio_gain = 0.95 / max_amp if max_amp > 0 else 1.0  # 5% headroom
+            audio_np = audio_np * self.audio_gain
+
+            # Add small silence at beginning
+            silence = np.zeros((int(LEAD_IN * sample_rate), audio_np.shape[1]), dtype=audio_np.dtype)
+            return np.concatenate((silence, audio_np))
+
+    def _preset_selection(self):
+        """(category, name) of the selected preset; read on the Tk thread"""
+        return self.category_var.get(), self.preset_var.get()
+
+    def _cached_preset_audio(self, text, sample_rate, model_name, speaker, selection):
+        """Return precomputed audio if `text` is the `selection` preset, unedited.
+
+        Safe on any thread: the selection and speaker are passed in, not read from Tk.
+        """
+        if getattr(self, 'preset_cache', None) is None or not selection or not speaker:
+            return None
+        try:
+            category, name = selection
+            preset = self.presets.get(category, {}).get(name)
+            if preset is None or preset_fields(preset)[0].strip() != text.strip():
+                return None
+            return self.preset_cache.lookup(
+                model_name or self.tts.current_model, category, name, speaker, sample_rate
+            )
+        except Exception as e:
+            logger.debug(f"Preset cache lookup failed: {e}")
+            return None
+
+    def _show_cached_preset(self):
+        """Make a freshly selected preset playable immediately if it's been precomputed"""
+        text = self.text_input.get("1.0", "end-1c").strip()
+        sample_rate = self._selected_sample_rate(self.tts.current_model)
+        audio_np = self._cached_preset_audio(text, sample_rate, self.tts.current_model,
+                                             self.voice_var.get(), self._preset_selection())
+        if audio_np is not None:
+            self._shown_take = None
+            self.audio_data = self._postprocess_audio(audio_np, sample_rate)
+            self.audio_sample_rate = sample_rate
+            self._on_synthesis_complete()
+
+    def _on_presets_changed(self, event, category, name, preset):
+        """Preset store listener; may be called from any thread"""
+        self.after(0, self._schedule_background_renders)
+
+    def _begin_engine_job(self):
+        with self._engine_jobs_lock:
+            self._engine_jobs += 1
+
+    def _end_engine_job(self):
+        with self._engine_jobs_lock:
+            self._engine_jobs -= 1
+
+    def _is_engine_idle(self):
+        """Called from the precompute thread, so only plain attributes are read"""
+        return not self._engine_jobs and not self.is_playing
+
+    def _schedule_background_renders(self):
+        """Render voice previews and presets for the loaded model in the background"""
+        if getattr(self, 'preset_cache', None) is None or not getattr(self.tts, 'current_model', None):
+            return
+        if self.voice_preview_cache is not None:
+            self.voice_preview_cache.schedule(self.tts.current_model, preferred_speaker=self.voice_var.get())
+        # Presets are only rendered for the selected voice, at the rate synthesis would use
+        self.preset_cache.schedule(
+            self.tts.current_model,
+            self.voice_var.get(),
+            self._selected_sample_rate(self.tts.current_model)
+        )
+
+    def _on_synthesis_complete(self, changed=None):
+        """`changed` is the sample range that differs from the previous take, if known"""
         try:
             if not hasattr(self, 'audio_data') or self.audio_data is None:
                 self.status_var.set(f"Error: No audio generated")
@@ -1401,7 +1692,7 @@ class VoxiomTTSApp(ctk.CTk):
                 return
 
             # Force waveform update
-            self._update_waveform(self.audio_data)
+            self._update_waveform(self.audio_data, changed, self.audio_gain)
 
             # Make sure cursors are visible
             if hasattr(self, 'cursor_left') and hasattr(self, 'cursor_right'):
@@ -1423,7 +1714,7 @@ class VoxiomTTSApp(ctk.CTk):
 
             # Reset time displays
             if hasattr(self, 'audio_data'):
-                duration = len(self.audio_data) / 48000
+                duration = len(self.audio_data) / self.audio_sample_rate
                 mins, secs = divmod(duration, 60)
                 if hasattr(self, 'time_display1'):
                     self.time_display1.configure(text=f"00:00.000 / {int(mins):02d}:{secs:06.3f}")
@@ -1455,7 +1746,7 @@ class VoxiomTTSApp(ctk.CTk):
 
         try:
             current_time = time.time() - self.playback_start_time
-            duration = len(self.audio_data) / 48000
+            duration = len(self.audio_data) / self.audio_sample_rate
             progress = min(1.0, current_time / duration)
 
             # Update cursor position
@@ -1485,8 +1776,8 @@ class VoxiomTTSApp(ctk.CTk):
             self.cursor_right.set_alpha(0.9)  # Always visible
 
             # Update time displays
-            current_time = position * (total_samples / 48000)
-            total_time = total_samples / 48000
+            current_time = position * (total_samples / self.audio_sample_rate)
+            total_time = total_samples / self.audio_sample_rate
 
             # Format as MM:SS.mmm
             mins, secs = divmod(current_time, 60)
@@ -1500,79 +1791,59 @@ class VoxiomTTSApp(ctk.CTk):
         except Exception as e:
             print(f"Cursor update error: {e}")
 
-    def _generate_and_play(self, text):
-        try:
-            # Initial state - yellow "preparing" state
-            self.status_var.set(f"Preparing synthesis...")
-            self.update_idletasks()
+    def _generate_and_play(self, text, model_name, speaker, sample_rate, ssml=False, preset=None):
+        """Synthesize on a worker thread and hand the audio to the Tk thread for playback.
 
-            # Validate input
+        Every setting is passed in from the Tk thread; UI updates go through `after`.
+        """
+        self._begin_engine_job()
+        try:
             text = text.strip()
             if not text:
-                self.status_var.set(f"Error: No text to synthesize")
+                self.after(0, self.status_var.set, "Error: No text to synthesize")
                 return
+            self.after(0, lambda: [
+                self.status_var.set("Synthesizing..."),
+                self.play_btn.configure(state="disabled", image=self.icons.get("loading", (16, 16)))
+            ])
 
-            # Synthesis phase - yellow progress
-            self.status_var.set(f"Synthesizing...")
-            self.play_btn.configure(state="disabled",
-                       image=self.icons.get("loading", (16,16)))
-            self.update_idletasks()
-
-            # Generate audio
-            audio = self.tts.speak(
-                text=text,
-                speaker=self.voice_var.get(),
-                # Change this line in _generate_and_play:
-                ssml=self._is_ssml_mode()  # Instead of ssml=use_ssml
-            )
-
-            # Processing phase - orange progress
-            self.status_var.set(f"Processing...")
-            self.play_btn.configure(state="disabled",
-                       image=self.icons.get("loading", (16,16)))
-            self.update_idletasks()
+            # Generate audio, unless this preset was already rendered in the background
+            audio_np = self._cached_preset_audio(text, sample_rate, model_name, speaker, preset)
+            if audio_np is None:
+                # Models without a rate choice produce their default rate, which is what we were given
+                chosen = self.supported_models.get(model_name, {}).get('supports_sample_rate', False)
+                audio_np = np.asarray(self.tts.speak(
+                    text=text,
+                    speaker=speaker,
+                    ssml=ssml,
+                    sample_rate=sample_rate if chosen else None,
+                    model_name=model_name
+                ))
 
-            audio_np = audio.numpy()
             max_amp = np.max(np.abs(audio_np))
             if max_amp > 0:
                 audio_np = audio_np / max_amp
-            self.audio_data = audio_np
-            self._update_waveform(audio_np)
-
-            # Playback phase - green animated progress
-            self.play_btn.configure(
-                image=self.icons.get("stop", (16, 16)),
-                text="Stop",                            # Text label
-                compound="left",                        # Icon on left
-                fg_color="#FF5252",
-                state="normal"
-            )
-            self.status_var.set(f"Playing audio...")
-            self.update_idletasks()
-
-            # Animation during playback
-            def update_progress():
-                duration = len(audio_np) / 48000  # Approximate duration in seconds
-                step = 0.01 / duration  # Small step for smooth animation
-
-                while self.is_playing and self.progress_value.get() < 1.0:
-                    self.progress_value.set(self.progress_value.get() + step)
-                    self.update_idletasks()
-                    time.sleep(0.01)
-
-            self.is_playing = True
-            threading.Thread(target=update_progress, daemon=True).start()
-
-            sd.play(audio_np, 48000)
-            sd.wait()
-
-            # Completion
-            self.status_var.set(f"Playback complete")
+            self.after(0, self._play_generated, audio_np, sample_rate)
 
         except Exception as e:
-            self._handle_error(f"Synthesis failed", e)
+            self.after(0, lambda err=e: [
+                self._handle_error("Synthesis failed", err),
+                self.play_btn.configure(state="normal", image=self.icons.get("play", (16, 16)))
+            ])
         finally:
+            self._end_engine_job()
+
+    def _play_generated(self, audio_np, sample_rate):
+        """Show and play audio from `_generate_and_play`; runs on the Tk thread"""
+        self.audio_data = audio_np
+        self.audio_sample_rate = sample_rate
+        self._shown_take = None
+        self._update_waveform(audio_np)
+        self.play_btn.configure(state="normal")
+        if self.is_playing:
+            sd.stop()
             self.is_playing = False
+        self._play_audio()
 
     def _toggle_ssml(self):
         """Enable/disable justification controls based on context"""
@@ -1650,6 +1921,17 @@ class VoxiomTTSApp(ctk.CTk):
         )
         self.save_btn.grid(row=0, column=4, padx=5, sticky="w")
 
+        # Search-as-you-type over preset names and texts
+        self.preset_search_var = ctk.StringVar()
+        self.preset_search_entry = ctk.CTkEntry(
+            controls_frame,
+            textvariable=self.preset_search_var,
+            placeholder_text="Search presets…",
+            width=160
+        )
+        self.preset_search_entry.grid(row=0, column=5, padx=5, sticky="w")
+        self.preset_search_entry.bind("<KeyRelease>", self._on_preset_search_changed)
+
         # ===== Justification Controls =====
         # self._create_just_controls(controls_frame)
 
@@ -1707,6 +1989,7 @@ class VoxiomTTSApp(ctk.CTk):
         )
         self.text_input.pack(fill="x", pady=(5,10))  # Increased bottom padding
         self.text_input.bind(f"<KeyRelease>", self._on_text_modified)
+        self._track_text_edits()
 
         # ===== Waveform Display =====
         self._create_waveform_display(main_frame)
@@ -1743,10 +2026,31 @@ class VoxiomTTSApp(ctk.CTk):
             format_frame,
             variable=self.voice_var,
             values=["Select model first"],
-            width=150
+            width=150,
+            command=self._on_voice_changed
         )
         self.voice_menu.pack(side="left", padx=5)
 
+        self.preview_btn = ctk.CTkButton(
+            format_frame,
+            text="▶",
+            width=28,
+            command=self._preview_voice
+        )
+        self.preview_btn.pack(side="left", padx=(0, 5))
+        self._create_button_tooltip(self.preview_btn, "Preview the selected voice")
+
+        self.gallery_btn = ctk.CTkButton(
+            format_frame,
+            text="Gallery",
+            width=70,
+            command=self._render_voice_gallery
+        )
+        self.gallery_btn.pack(side="left", padx=(0, 5))
+        self._create_button_tooltip(self.gallery_btn,
+                                  "Render previews for every voice of this model\n"
+                                  "so browsing voices plays them instantly")
+
         # Action buttons
         # Action buttons frame
         action_frame = ctk.CTkFrame(bottom_frame, fg_color="transparent")
@@ -1789,6 +2093,20 @@ class VoxiomTTSApp(ctk.CTk):
         )
         self.export_btn.pack(side="left", padx=button_padx)
 
+        self.book_btn = ctk.CTkButton(
+            action_frame,
+            text="Book…",
+            image=self.icons.get("export", (16,16)),
+            compound="left",
+            command=self._render_document,
+            width=button_width,
+            height=button_height
+        )
+        self.book_btn.pack(side="left", padx=button_padx)
+        self._create_button_tooltip(self.book_btn,
+                                  "Render a text/markdown document to per-chapter files\n"
+                                  "(resumes an interrupted render in the same folder)")
+
     def _play_audio(self):
         if not hasattr(self, 'audio_data') or self.audio_data is None:
             return
@@ -1817,8 +2135,9 @@ class VoxiomTTSApp(ctk.CTk):
                 self.canvas.draw_idle()
 
             # Start playback
-            self.playback_start_time = time.time()
-            sd.play(self.audio_data, 48000, blocking=False)
+            with tracer.span("gui.playback_start", samples=len(self.audio_data)):
+                self.playback_start_time = time.time()
+                sd.play(self.audio_data, self.audio_sample_rate, blocking=False)
             self._animate_playback_cursor()
 
         except Exception as e:
@@ -1884,51 +2203,56 @@ class VoxiomTTSApp(ctk.CTk):
             self.toggle_btn.configure(image=self.collapse_icon)
 
     def _calculate_audio_duration(self, text):
-        """Estimate audio duration based on text content"""
-        word_count = len(text.split())
-        comma_pauses = text.count(f", — ") * 0.75
-        base_duration = word_count * 0.35
-        return base_duration + comma_pauses
+        """Estimate audio duration from speaking rates measured for the current voice"""
+        return self.duration_estimator.estimate(text, self.tts.current_model, self.voice_var.get())
 
     def _insert_justification(self, text):
-        """Insert justification characters and calculate timing"""
+        """Insert justification characters; the timing display follows the edit"""
         cursor_pos = self.text_input.index("insert")
         self.text_input.insert(cursor_pos, text)
 
-        if text == ", — ":
-            # Calculate and display pause duration
-            self._update_timing_display(added_pause=0.75)  # 750ms for comma+em dash
+    def _track_text_edits(self):
+        """Proxy the text widget's Tcl command so every insert/delete updates text_stats as a delta"""
+        widget = self.text_input._textbox._w
+        original = f"{widget}_orig"
+        self.tk.call("rename", widget, original)
+
+        def proxy(command, *args):
+            if command == "insert":
+                result = self.tk.call(original, command, *args)
+                self.text_stats.insert(''.join(args[1::2]))
+            elif command == "delete" and len(args) <= 2:
+                removed = self.tk.call(original, "get", *args)
+                result = self.tk.call(original, command, *args)
+                self.text_stats.delete(removed)
+            elif command == "replace":
+                removed = self.tk.call(original, "get", *args[:2])
+                result = self.tk.call(original, command, *args)
+                self.text_stats.delete(removed)
+                self.text_stats.insert(''.join(args[2::2]))
+            elif command == "delete" or command == "edit" and args[:1] in (("undo",), ("redo",)):
+                # Multi-range deletes and undo/redo bypass the deltas; recount once
+                result = self.tk.call(original, command, *args)
+                self.text_stats.reset(self.tk.call(original, "get", "1.0", "end-1c"))
+            else:
+                return self.tk.call(original, command, *args)
+            self._schedule_timing_update()
+            return result
 
-        self._update_audio_timing()
+        self.tk.createcommand(widget, proxy)
 
-    def _update_audio_timing(self):
-        """Calculate total audio duration based on text"""
-        text = self.text_input.get("1.0", "end-1c")
+    def _schedule_timing_update(self):
+        if self._timing_after_id is None:
+            self._timing_after_id = self.after_idle(self._update_audio_timing)
 
-        # Basic estimation (adjust these values as needed)
-        word_count = len(text.split())
-        comma_pauses = text.count(f", — ") * 0.75  # 750ms per comma+em dash
-        base_duration = word_count * 0.35  # 350ms per word
-
-        total_seconds = base_duration + comma_pauses
+    def _update_audio_timing(self):
+        """Show the estimated duration of the text; O(1), computed from the tracked totals"""
+        self._timing_after_id = None
+        total_seconds = self.duration_estimator.estimate_features(
+            self.text_stats.features, self.tts.current_model, self.voice_var.get()
+        )
         mins, secs = divmod(total_seconds, 60)
-        self.time_display.configure(text=f"{int(mins):02d}:{int(secs):02d}")
-
-    def _update_timing_display(self, added_pause=0):
-        """Update the time display with added pause duration"""
-        current_text = self.time_display.cget("text")
-        if "/" in current_text:
-            current, total = current_text.split("/")
-            try:
-                # Update total time
-                mins, secs = map(int, total.strip().split(":"))
-                new_total = mins * 60 + secs + added_pause
-                new_mins, new_secs = divmod(new_total, 60)
-                self.time_display.configure(
-                    text=f"{current.strip()} / {int(new_mins):02d}:{int(new_secs):02d}"
-                )
-            except:
-                pass
+        self.time_display.configure(text=f"00:00 / {int(mins):02d}:{int(secs):02d}")
 
     def _get_safe_categories(self):
         """Get available categories without any SSML support"""
@@ -2001,9 +2325,18 @@ class VoxiomTTSApp(ctk.CTk):
         tooltip.lift()
 
     def _create_settings_tab(self):
+        """Add the Settings tab; its contents are built the first time it is opened"""
         self.settings_tab = ctk.CTkFrame(self.notebook, fg_color=self.dark_frame)
         self.notebook.add(self.settings_tab, text="Settings")
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
 
+    def _on_tab_changed(self, event=None):
+        if not self._settings_built and self.notebook.select() == str(self.settings_tab):
+            self._settings_built = True
+            with tracer.span("gui.build_settings"):
+                self._build_settings_tab()
+
+    def _build_settings_tab(self):
         main_frame = ctk.CTkFrame(self.settings_tab)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
@@ -2060,7 +2393,7 @@ class VoxiomTTSApp(ctk.CTk):
 
         # Initialize checkboxes
         self.model_vars = {}
-        for model in get_available_models():
+        for model in download_models.get_available_models(str(self.models_dir)):
             self.model_vars[model["name"]] = ctk.BooleanVar(value=False)
             cb = ctk.CTkCheckBox(
                 self.model_checkbox_frame,
@@ -2095,6 +2428,16 @@ class VoxiomTTSApp(ctk.CTk):
         )
         self.download_btn.pack(side="left", padx=5)
 
+        # Cancel Button (enabled while a verify/download job runs)
+        self.cancel_job_btn = ctk.CTkButton(
+            btn_frame,
+            text="Cancel",
+            command=self._cancel_model_job,
+            state="disabled",
+            width=120
+        )
+        self.cancel_job_btn.pack(side="left", padx=5)
+
         # Status label
         self.model_update_status = ctk.CTkLabel(
             selector_frame,
@@ -2103,6 +2446,10 @@ class VoxiomTTSApp(ctk.CTk):
         )
         self.model_update_status.pack(pady=(5, 0))
 
+        # Job progress (shown only while a job runs)
+        self.model_job_progress = ctk.CTkProgressBar(selector_frame)
+        self.model_job_progress.set(0)
+
         # Credits section
         credits_frame = ctk.CTkFrame(main_frame)
         credits_frame.pack(fill="x", padx=5, pady=5)
@@ -2259,18 +2606,13 @@ class VoxiomTTSApp(ctk.CTk):
                 if not preset_name:
                     return
 
-            # Save the preset - MODIFIED THIS PART
-            if category not in self.presets:
-                self.presets[category] = {}
-
-            self.presets[category][preset_name] = {
+            # Single-row transactional write; listeners refresh dependent state
+            get_store().save(category, preset_name, {
                 "text": text,
                 "language": "ru" if "Russian" in category else "en",
                 "timestamp": time.strftime("%Y-%m-%d %H:%M")
-            }
+            })
 
-            # Save to file and update UI
-            self._save_presets_to_file()
             self.preset_var.set(preset_name)
             self._update_preset_options()
             self.status_icon.configure(image=self.icons.get("verify", (16,16)))
@@ -2332,6 +2674,33 @@ class VoxiomTTSApp(ctk.CTk):
         )
         self.model_indicator.pack(side="right", padx=10)
 
+        # Throughput counters from the engine's metrics registry
+        self.metrics_label = ctk.CTkLabel(
+            status_frame,
+            text="",
+            font=("Consolas", 10),
+            anchor="e"
+        )
+        self.metrics_label.pack(side="right", padx=10)
+        self._refresh_metrics_display()
+
+    def _refresh_metrics_display(self):
+        """Show synthesis totals and real-time factor in the status bar"""
+        try:
+            stats = metrics.summary()
+            if stats["requests"]:
+                rtf = stats["real_time_factor"]
+                mins, secs = divmod(stats["audio_seconds"], 60)
+                text = f"{int(stats['requests'])} req · {int(mins):02d}:{int(secs):02d} audio"
+                if rtf is not None:
+                    text += f" · RTF {rtf:.2f}"
+                if stats["cache_hit_rate"] is not None:
+                    text += f" · cache {stats['cache_hit_rate']:.0%}"
+                self.metrics_label.configure(text=text)
+        except Exception as e:
+            logger.debug(f"Metrics display error: {e}")
+        self.after(2000, self._refresh_metrics_display)
+
     def _create_colored_icon(self, size, color):
         """Create fallback colored circle icons"""
         from PIL import Image, ImageDraw
@@ -2367,7 +2736,7 @@ class VoxiomTTSApp(ctk.CTk):
 
     def _load_model(self, model_name: str) -> bool:
         """Robust model loading with error reporting"""
-        print(f"\nAttempting to load model: {model_name}")
+        logger.debug(f"Attempting to load model: {model_name}")
 
         if not hasattr(self, 'tts'):
             self.status_var.set(f"TTS engine not initialized")
@@ -2390,14 +2759,15 @@ class VoxiomTTSApp(ctk.CTk):
                 raise FileNotFoundError(f"Model file not found: {model_path}")
 
             # Try loading
-            print(f"Loading model from: {model_path}")
-            success = self.tts.load_model(model_name)
+            logger.debug(f"Loading model from: {model_path}")
+            with tracer.span("gui.model_load", model=model_name):
+                success = self.tts.load_model(model_name)
             if not success:
                 raise RuntimeError(f"TTS engine returned False when loading model")
 
             # Update voices
             voices = self.tts.get_voices()
-            print(f"Model loaded successfully. Available voices: {voices}")
+            logger.info(f"Model loaded: {model_name} ({len(voices)} voices)")
 
             # Update UI
             self.model_var.set(model_name)
@@ -2414,13 +2784,11 @@ class VoxiomTTSApp(ctk.CTk):
             if hasattr(self, 'model_indicator'):
                 self.model_indicator.configure(text=model_name)
 
+            self._schedule_background_renders()
             return True
 
         except Exception as e:
-            error_msg = f"Failed to load model {model_name}: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
-            self._handle_error(f"Model loading error", e)
+            self._handle_error(f"Failed to load model {model_name}", e)
             return False
 
     def _update_presets_for_model(self, model_name: str):
@@ -2496,26 +2864,104 @@ class VoxiomTTSApp(ctk.CTk):
         except Exception as e:
             self.status_var.set(f"Update failed: {str(e)}")
 
+    def _run_model_job(self, description: str, work, on_done):
+        """Run a verify/download job off the main thread with progress and cancel.
+
+        work(progress, cancel) runs on a worker thread and calls
+        progress(fraction, text); on_done(result) runs on the main thread.
+        """
+        if self._model_job is not None:
+            return
+        cancel = self._model_job = threading.Event()
+        self.check_btn.configure(state="disabled")
+        self.download_btn.configure(state="disabled")
+        self.cancel_job_btn.configure(state="normal")
+        self.model_job_progress.set(0)
+        self.model_job_progress.pack(fill="x", pady=(5, 0))
+        self.model_update_status.configure(text=f"{description}...", text_color="#FF9800")
+
+        last_report = [0.0]
+
+        def progress(fraction, text):
+            # Hashing and downloading report per chunk; the UI needs ~10 updates a second
+            now = time.monotonic()
+            if now - last_report[0] >= 0.1:
+                last_report[0] = now
+                self.after(0, self._on_model_job_progress, fraction, text)
+
+        def run():
+            result, error = None, None
+            try:
+                result = work(progress, cancel)
+            except Exception as e:
+                error = e
+            self.after(0, self._finish_model_job, on_done, result, error, cancel.is_set())
+
+        threading.Thread(target=run, name="model-job", daemon=True).start()
+
+    def _on_model_job_progress(self, fraction, text):
+        if self._model_job is not None and not self._model_job.is_set():
+            self.model_job_progress.set(max(0.0, min(1.0, fraction)))
+            self.model_update_status.configure(text=text, text_color="#FF9800")
+
+    def _cancel_model_job(self):
+        if self._model_job is not None:
+            self._model_job.set()
+            self.cancel_job_btn.configure(state="disabled")
+            self.model_update_status.configure(text="Cancelling...", text_color="#FF9800")
+
+    def _finish_model_job(self, on_done, result, error, cancelled):
+        self._model_job = None
+        self.check_btn.configure(state="normal")
+        self.download_btn.configure(state="normal")
+        self.cancel_job_btn.configure(state="disabled")
+        self.model_job_progress.pack_forget()
+        if error is not None:
+            self.model_update_status.configure(text=f"Failed: {error}", text_color="#FF5252")
+            logger.error(f"Model job failed: {error}")
+            return
+        on_done(result, cancelled)
+
     def _verify_installed_models(self):
-        """Check installed models and update checkbox states"""
-        updater = ModelUpdater()
-        for model_name, var in self.model_vars.items():
-            status = updater.check_model(model_name)
-            var.set(status["valid"])
-
-            # Visual feedback
-            for widget in self.model_checkbox_frame.winfo_children():
-                if model_name in widget.cget("text"):
-                    color = "#4CAF50" if status["valid"] else "#FF5252"
-                    widget.configure(text_color=color)
-
-        self.model_update_status.configure(
-            text="Verification completed",
-            text_color="#4CAF50"
-        )
+        """Check installed models in the background and update checkbox states"""
+        names = list(self.model_vars)
+        models_dir = str(self.models_dir)
+
+        def work(progress, cancel):
+            updater = download_models.ModelUpdater(models_dir)
+            statuses = {}
+            for index, model_name in enumerate(names):
+                if cancel.is_set():
+                    break
+
+                def report(done, total, index=index, model_name=model_name):
+                    progress((index + done / max(total, 1)) / len(names), f"Verifying {model_name}...")
+                # Hash only: the engine process does the real load, the GUI never imports torch
+                status = updater.check_model(model_name, load=False, progress=report, cancel=cancel)
+                if cancel.is_set():
+                    break  # interrupted mid-hash, so this status is incomplete
+                statuses[model_name] = status
+            return statuses
+
+        def done(statuses, cancelled):
+            for model_name, status in statuses.items():
+                self.model_vars[model_name].set(status["valid"])
+
+                # Visual feedback
+                for widget in self.model_checkbox_frame.winfo_children():
+                    if model_name in widget.cget("text"):
+                        color = "#4CAF50" if status["valid"] else "#FF5252"
+                        widget.configure(text_color=color)
+
+            self.model_update_status.configure(
+                text="Verification cancelled" if cancelled else "Verification completed",
+                text_color="#FF9800" if cancelled else "#4CAF50"
+            )
+
+        self._run_model_job("Verifying models", work, done)
 
     def _download_selected_models(self):
-        """Download selected models with progress feedback"""
+        """Download selected models in the background with progress feedback"""
         selected = [name for name, var in self.model_vars.items() if var.get()]
         if not selected:
             self.model_update_status.configure(
@@ -2523,36 +2969,36 @@ class VoxiomTTSApp(ctk.CTk):
                 text_color="#FF5252"
             )
             return
-
-        self.model_update_status.configure(
-            text=f"Downloading {len(selected)} models...",
-            text_color="#FF9800"
-        )
-        self.update()  # Force UI update
-
-        try:
-            updater = ModelUpdater()
-            results = updater.update_models(selected, str(self.models_dir))  # Pass models directory
-
-            # Process results
-            success = sum(1 for r in results.values() if r.get("success", False))
+        models_dir = str(self.models_dir)
+
+        def work(progress, cancel):
+            updater = download_models.ModelUpdater(models_dir)
+
+            def report(model_name, done, total):
+                fraction = (selected.index(model_name) + done / max(total, 1)) / len(selected)
+                progress(fraction, f"{model_name}: {done / 1048576:.0f} / {total / 1048576:.0f} MB")
+            return updater.update_models(selected, progress=report, cancel=cancel)
+
+        def done(results, cancelled):
+            success = sum(1 for r in results.values()
+                          if r in ("Successfully updated", "Already up-to-date"))
+            failed = [f"{name}: {r}" for name, r in results.items() if r.startswith("Error")]
+            text = f"Completed: {success}/{len(selected)} succeeded"
+            if cancelled:
+                text = f"Cancelled: {success}/{len(selected)} ready"
+            if failed:
+                text += "\n" + "\n".join(failed)
             self.model_update_status.configure(
-                text=f"Completed: {success}/{len(selected)} succeeded",
+                text=text,
                 text_color="#4CAF50" if success == len(selected) else "#FF9800"
             )
 
-            # Re-verify models
-            self._verify_models()
-
-            # Reload UI if needed
+            # Pick up new files; checksums are verified on the next start-up
+            self.available_models = self._installed_models()
             if success > 0 and hasattr(self, 'model_menu'):
                 self.model_menu.configure(values=self.available_models)
 
-        except Exception as e:
-            self.model_update_status.configure(
-                text=f"Download failed: {str(e)}",
-                text_color="#FF5252"
-            )
+        self._run_model_job(f"Downloading {len(selected)} models", work, done)
 
         # Dynamic preset loader
     def _update_presets(self):
@@ -2590,8 +3036,8 @@ class VoxiomTTSApp(ctk.CTk):
             if not category or not hasattr(self, 'presets'):
                 return
 
-            presets = self.presets.get(category, {})
-            preset_names = list(presets.keys())
+            preset_names = (self.presets.names(category) if hasattr(self.presets, 'names')
+                            else list(self.presets.get(category, {}).keys()))
 
             # Auto-select first preset if none selected
             if preset_names and not self.preset_var.get():
@@ -2637,7 +3083,9 @@ class VoxiomTTSApp(ctk.CTk):
 
         threading.Thread(
             target=self._generate_and_play,
-            args=(text,),
+            args=(text, self.tts.current_model, self.voice_var.get(),
+                  self._selected_sample_rate(self.tts.current_model)),
+            kwargs={'ssml': self._is_ssml_mode(), 'preset': self._preset_selection()},
             daemon=True
         ).start()
 
@@ -2652,13 +3100,77 @@ class VoxiomTTSApp(ctk.CTk):
                 filetypes=[(f"WAV files", f"*.wav")]
             )
             if file_path:
-                sf.write(file_path, self.audio_data, 48000)
+                sf.write(file_path, self.audio_data, self.audio_sample_rate)
                 self.status_var.set(f"Exported: {os.path.basename(file_path)}")
         except Exception as e:
             self.status_var.set(f"Export failed: {str(e)}")
 
+    def _render_document(self):
+        """Render a long document to per-chapter files in the background; click again to stop"""
+        if self._book_stop is not None:
+            self._book_stop.set()
+            self.status_var.set("Stopping book render after the current sentence...")
+            return
+
+        source = filedialog.askopenfilename(
+            filetypes=[("Text documents", "*.txt *.md *.markdown"), ("All files", "*.*")]
+        )
+        if not source:
+            return
+        output_dir = filedialog.askdirectory(title="Choose output folder")
+        if not output_dir:
+            return
+
+        try:
+            sample_rate = int(self.sample_rate_var.get())
+        except ValueError:
+            sample_rate = None
+
+        self._book_stop = threading.Event()
+        renderer = AudiobookRenderer(
+            self.tts, output_dir,
+            speaker=self.voice_var.get() or None,
+            sample_rate=sample_rate,
+            model_name=self.tts.current_model,
+            progress_callback=lambda p: self.after(0, lambda: self.status_var.set(
+                f"Book: chapter {p['chapter']}/{p['chapters']}, "
+                f"{p['done_chunks']}/{p['total_chunks']} sentences"
+            )),
+            stop_event=self._book_stop
+        )
+        self.book_btn.configure(text="Stop")
+        self._begin_engine_job()
+
+        def run():
+            try:
+                manifest = renderer.render_file(source)
+                done = sum(1 for c in manifest["chapters"] if c["done"])
+                message = f"Book: {done}/{len(manifest['chapters'])} chapters rendered"
+                self.after(0, lambda: self.status_var.set(message))
+            except Exception as e:
+                self.after(0, lambda err=e: self._handle_error("Book render failed", err))
+            finally:
+                self._end_engine_job()
+                self._book_stop = None
+                self.after(0, lambda: self.book_btn.configure(text="Book…"))
+
+        self._book_thread = threading.Thread(target=run, name="book-render", daemon=True)
+        self._book_thread.start()
+
     def _on_close(self):
         """Handle window closing"""
+        if self._book_thread is not None and self._book_thread.is_alive():
+            # Let the sentence in flight reach the manifest before the engine goes away;
+            # the next render into the same folder resumes from there. Polled rather than
+            # joined: the render thread posts to this thread while it winds down
+            if self._book_stop is not None:
+                self._book_stop.set()
+            if self._close_deadline is None:
+                self._close_deadline = time.monotonic() + BOOK_STOP_WAIT
+                self.status_var.set("Stopping book render before closing...")
+            if time.monotonic() < self._close_deadline:
+                self.after(100, self._on_close)
+                return
         # Clean up tooltips
         for tip in self.tooltips:
             try:
@@ -2673,10 +3185,20 @@ class VoxiomTTSApp(ctk.CTk):
                 except:
                     pass
 
+        if self.preset_cache is not None:
+            self.preset_cache.stop()
+        if self._model_job is not None:
+            self._model_job.set()  # Removes the partial download
+        if self.voice_preview_cache is not None:
+            self.voice_preview_cache.stop()
+        self.duration_estimator.save()
+
         # Only try to stop TTS if it was initialized
         if hasattr(self, 'tts'):
             if hasattr(self.tts, 'watcher') and self.tts.watcher:
                 self.tts.watcher.stop()
+            if hasattr(self.tts, 'close'):
+                self.tts.close()  # Shuts down the engine process
 
         """Clean up resources"""
         # Stop any active playback
@@ -2687,5 +3209,9 @@ class VoxiomTTSApp(ctk.CTk):
         if hasattr(self, 'fig'):
             plt.close(self.fig)
 
+        # Keep the last session's spans around for inspection in debug mode
+        if self.debug_mode and tracer.enabled:
+            tracer.export_chrome_trace(str(self.base_dir / "voxiom_trace.json"))
+
         # Destroy window
         self.destroy()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Automatic language routing for mixed English/Russian text.
+
+Text is split into sentences first. Every character is classified by
+script in one vectorized pass over its code points: Latin, Cyrillic or
+neutral (digits, punctuation, spaces). Inside a sentence, neutral
+characters join the run of letters before them. A sentence that mixes
+scripts is split at every script change. Letters of one script are never
+sent to the other language's model, because that model drops them.
+A sentence without letters keeps the language of the sentence before it.
+
+Each run is routed to a model of its language, with a speaker of that
+model. The runs then go through the ScriptRenderer:
+- each model gets its own group, and the groups synthesize concurrently
+- every model stays resident in the engine after its first load
+- the audio is stitched back in text order: a sentence pause between
+  sentences and a shorter pause where the language switches mid-sentence
+
+    router = LanguageRouter(tts)
+    audio, sample_rate = router.render("Release notes: новая версия is out.", speaker="baya")
+
+    python language_router.py mixed.txt -o mixed.wav --speaker-en en_12 --speaker-ru baya
+"""
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from script_renderer import ScriptLine, ScriptRenderer
+from text_utils import join_lines, split_sentences
+from tracing import get_logger, tracer
+
+logger = get_logger("language")
+
+NEUTRAL, LATIN, CYRILLIC = 0, 1, 2
+SCRIPT_LANGUAGES = {LATIN: "en", CYRILLIC: "ru"}
+LANGUAGE_SCRIPTS = {language: script for script, language in SCRIPT_LANGUAGES.items()}
+RUN_PAUSE = 0.12        # seconds of silence where the language switches inside a sentence
+SENTENCE_PAUSE = 0.25   # seconds of silence between sentences
+PREFERRED_MODELS = {"en": ["v3_en"], "ru": ["v4_ru", "v3_1_ru"]}
+
+
+def script_classes(text: str) -> np.ndarray:
+    """Per-character script class (NEUTRAL, LATIN or CYRILLIC)"""
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    classes = np.zeros(codepoints.size, dtype=np.int8)
+    latin = (((codepoints | 0x20) >= 0x61) & ((codepoints | 0x20) <= 0x7A)) | \
+            ((codepoints >= 0xC0) & (codepoints <= 0x24F) & (codepoints != 0xD7) & (codepoints != 0xF7))
+    classes[latin] = LATIN
+    classes[(codepoints >= 0x400) & (codepoints <= 0x52F)] = CYRILLIC
+    return classes
+
+
+def is_mixed(text: str, language: Optional[str] = None) -> bool:
+    """True if the text has letters of both scripts, or of a script other than `language`"""
+    scripts = set(np.unique(script_classes(text)).tolist()) - {NEUTRAL}
+    if language in LANGUAGE_SCRIPTS:
+        return bool(scripts - {LANGUAGE_SCRIPTS[language]})
+    return len(scripts) > 1
+
+
+def _sentence_runs(sentence: str, classes: np.ndarray) -> List[Tuple[Optional[str], str]]:
+    letters = np.flatnonzero(classes)
+    if not letters.size:
+        return [(None, sentence)]
+    # Neutral characters take the class of the closest letter before them
+    filled = classes[np.maximum.accumulate(np.where(classes > 0, np.arange(classes.size), letters[0]))]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(filled)) + 1)).tolist()
+    ends = starts[1:] + [classes.size]
+    return [(SCRIPT_LANGUAGES[int(filled[start])], sentence[start:end].strip())
+            for start, end in zip(starts, ends) if sentence[start:end].strip()]
+
+
+def language_runs(text: str) -> List[Tuple[Optional[str], str, bool]]:
+    """Split text into (language, text, starts_sentence) runs.
+
+    The language is None only for letterless text before the first letter.
+    """
+    joined = join_lines(text)
+    classes = script_classes(joined)
+    runs = []
+    language = None
+    cursor = 0
+    for sentence in split_sentences(joined):
+        position = joined.find(sentence, cursor)
+        if position >= 0:
+            cursor = position + len(sentence)
+            sentence_classes = classes[position:cursor]
+        else:
+            sentence_classes = script_classes(sentence)   # re-spaced by the long-sentence splitter
+        for index, (run_language, run) in enumerate(_sentence_runs(sentence, sentence_classes)):
+            language = run_language or language
+            runs.append((language, run, index == 0))
+    return runs
+
+
+class LanguageRouter:
+    def __init__(self, tts, speakers: Optional[Dict[str, str]] = None, workers: int = 2,
+                 pause: float = SENTENCE_PAUSE):
+        self.tts = tts
+        self.speakers = speakers or {}        # language -> speaker
+        self.renderer = ScriptRenderer(tts, workers=workers, pause=pause)
+        self._models: Dict[str, str] = {}     # language -> model that loaded
+
+    def model_for(self, language: str) -> str:
+        """Model for a language other than the selected one: the first that is loaded or
+        can be loaded, preferring PREFERRED_MODELS; kept resident afterwards"""
+        model = self._models.get(language)
+        if model is not None:
+            return model
+        candidates = [name for name in PREFERRED_MODELS.get(language, [])
+                      if name in self.tts.supported_models]
+        candidates += [name for name, config in self.tts.supported_models.items()
+                       if config.get("language") == language and name not in candidates]
+        for name in candidates:
+            if name in self.tts.models or self.tts.load_model(name, activate=False):
+                self._models[language] = name
+                return name
+        raise ValueError(f"No {language} model is available")
+
+    def speaker_for(self, model: str, language: str, speaker: Optional[str]) -> str:
+        voices = self.tts.supported_models[model]["speakers"]
+        for candidate in (self.speakers.get(language), speaker):
+            if candidate in voices:
+                return candidate
+        return voices[0]
+
+    def route(self, text: str, speaker: Optional[str] = None,
+              default_model: Optional[str] = None) -> List[ScriptLine]:
+        """One ScriptLine per language run, with its routed model and speaker.
+
+        Runs in the selected model's language stay on that model; only the
+        other language is routed to a model of its own.
+        """
+        default_model = default_model or self.tts.current_model
+        default_language = self.tts.supported_models.get(default_model, {}).get("language", "en")
+        lines = []
+        for language, run, starts_sentence in language_runs(text):
+            language = language or default_language
+            model = default_model if language == default_language else self.model_for(language)
+            lines.append(ScriptLine(len(lines), model, self.speaker_for(model, language, speaker), run,
+                                    pause=SENTENCE_PAUSE if starts_sentence else RUN_PAUSE))
+        return lines
+
+    def render(self, text: str, speaker: Optional[str] = None, sample_rate: Optional[int] = None,
+               default_model: Optional[str] = None) -> Tuple[np.ndarray, int]:
+        lines = self.route(text, speaker, default_model)
+        if not lines:
+            raise ValueError("Empty text input")
+        with tracer.span("language.render", runs=len(lines)):
+            audio, sample_rate = self.renderer.render(lines, sample_rate)
+        logger.debug(f"Routed {len(lines)} runs: " + ", ".join(f"{l.model}:{l.speaker}" for l in lines))
+        return audio, sample_rate
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import soundfile as sf
+    from tts_engine import SileroTTS
+
+    parser = argparse.ArgumentParser(description="Render mixed English/Russian text, routing each run by language")
+    parser.add_argument("input", help="UTF-8 text file")
+    parser.add_argument("-o", "--output", required=True, help="Output audio file")
+    parser.add_argument("--speaker-en", default=None)
+    parser.add_argument("--speaker-ru", default=None)
+    parser.add_argument("--sample-rate", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--models-dir", default=str(Path(__file__).parent / "models" / "tts"))
+    args = parser.parse_args(argv)
+
+    tts = SileroTTS(args.models_dir)
+    speakers = {language: speaker for language, speaker in
+                (("en", args.speaker_en), ("ru", args.speaker_ru)) if speaker}
+    with open(args.input, 'r', encoding='utf-8-sig') as f:
+        text = f.read()
+
+    started = time.time()
+    try:
+        audio, sample_rate = LanguageRouter(tts, speakers, workers=args.workers).render(
+            text, sample_rate=args.sample_rate, default_model="v3_en")
+    except ValueError as e:
+        print(f"Rendering failed: {e}")
+        return 1
+    sf.write(args.output, audio, sample_rate)
+    print(f"Rendered {len(audio) / sample_rate:.1f}s of audio in {time.time() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
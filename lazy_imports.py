@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Deferred module imports for the GUI start-up path.
+
+torch, matplotlib and the audio libraries take seconds to import. The
+window can be shown before any of them is needed. ``lazy_import`` returns a
+stand-in that imports the real module on first attribute access. ``preload``
+warms modules on a background thread, so by the time the user needs them
+the import has usually already happened.
+
+    torch = lazy_import("torch")          # nothing imported yet
+    preload("torch", "matplotlib.figure")
+    torch.jit.load(...)                   # imports here unless preload finished first
+"""
+import sys
+import time
+import importlib
+import threading
+from types import ModuleType
+from typing import Callable, Dict, Optional
+
+
+class LazyModule:
+    """Module stand-in that imports on first attribute access"""
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            # The import system's per-module locks make concurrent first use safe
+            module = importlib.import_module(self._name)
+            self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not None or self._name in sys.modules
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def preload(*names: str, on_done: Optional[Callable[[Dict[str, float]], None]] = None) -> threading.Thread:
+    """Import modules on a daemon thread; `on_done` receives seconds spent per module"""
+    def run():
+        timings = {}
+        for name in names:
+            started = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"Background import of {name} failed: {e}")
+            timings[name] = time.perf_counter() - started
+        if on_done:
+            on_done(timings)
+
+    thread = threading.Thread(target=run, name="preload", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""Synthesis throughput metrics.
+
+A small in-process registry of counters and histograms. Metrics can be read
+as a snapshot dict (used by the GUI status bar), rendered in Prometheus text
+format, written to a file for node_exporter's textfile collector, or served
+on a local HTTP endpoint.
+
+    VOXIOM_METRICS_PORT=9464        serve http://127.0.0.1:9464/metrics
+    VOXIOM_METRICS_FILE=voxiom.prom rewrite the file every 15 seconds
+"""
+import os
+import math
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def values(self) -> Dict[Tuple[str, ...], dict]:
+        """Per label set: cumulative bucket counts, sum and count"""
+        with self._lock:
+            snapshot = {key: list(state) for key, state in self._values.items()}
+        result = {}
+        for key, state in snapshot.items():
+            cumulative = []
+            running = 0
+            for count in state[:-2]:
+                running += count
+                cumulative.append(running)
+            result[key] = {
+                "buckets": dict(zip(self.buckets, cumulative)),
+                "sum": state[-2],
+                "count": state[-1]
+            }
+        return result
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, value in sorted(self.values().items()):
+            for bound, count in value["buckets"].items():
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(value['sum'])}")
+            lines.append(f"{self.name}_count{labels} {value['count']}")
+        return "\n".join(lines)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.started_at = time.time()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {type(metric).__name__}")
+            return metric
+
+    def snapshot(self) -> Dict[str, dict]:
+        """All metric values keyed by metric name, then by label values"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {",".join(key): value for key, value in metric.values().items()}
+            for metric in metrics
+        }
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+    def write_prometheus(self, path: str) -> bool:
+        """Atomically write the Prometheus text exposition to `path`"""
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            print(f"Failed to write metrics file: {e}")
+            return False
+
+    def start_file_exporter(self, path: str, interval: float = 15.0) -> threading.Thread:
+        """Rewrite the metrics file every `interval` seconds on a daemon thread"""
+        def export_loop():
+            while True:
+                self.write_prometheus(path)
+                time.sleep(interval)
+
+        thread = threading.Thread(target=export_loop, name="metrics-file-exporter", daemon=True)
+        thread.start()
+        return thread
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve /metrics over HTTP on a daemon thread"""
+        if self._server is not None:
+            return self._server
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the console
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server
+
+    def start_from_env(self):
+        """Start the exporters requested through VOXIOM_METRICS_PORT / VOXIOM_METRICS_FILE"""
+        port = os.environ.get("VOXIOM_METRICS_PORT")
+        if port:
+            try:
+                self.serve(int(port))
+            except Exception as e:
+                print(f"Failed to start metrics endpoint: {e}")
+        path = os.environ.get("VOXIOM_METRICS_FILE")
+        if path:
+            self.start_file_exporter(path)
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    "voxiom_synthesis_requests_total", "Synthesis requests", ("model", "speaker", "status"))
+CHARACTERS = registry.counter(
+    "voxiom_synthesis_characters_total", "Characters sent to the model", ("model",))
+AUDIO_SECONDS = registry.counter(
+    "voxiom_audio_seconds_total", "Seconds of audio produced", ("model",))
+SYNTHESIS_SECONDS = registry.counter(
+    "voxiom_synthesis_seconds_total", "Wall time spent in synthesis", ("model",))
+LATENCY = registry.histogram(
+    "voxiom_synthesis_latency_seconds", "Synthesis latency", ("model", "speaker"))
+MODEL_LOADS = registry.counter(
+    "voxiom_model_loads_total", "Model load attempts", ("model", "status"))
+MODEL_LOAD_SECONDS = registry.histogram(
+    "voxiom_model_load_seconds", "Model load time", ("model",))
+CACHE_LOOKUPS = registry.counter(
+    "voxiom_cache_lookups_total", "Audio cache lookups", ("cache", "result"))
+PLANNED_CHUNKS = registry.counter(
+    "voxiom_planner_chunks_total", "Sentence chunks seen by the synthesis planner", ("result",))
+ENGINE_RESTARTS = registry.counter(
+    "voxiom_engine_restarts_total", "Engine process restarts after a crash")
+STAGE_SECONDS = registry.counter(
+    "voxiom_pipeline_stage_seconds_total", "Time pipeline stages spent working or waiting",
+    ("pipeline", "stage", "state"))
+STAGE_ITEMS = registry.counter(
+    "voxiom_pipeline_stage_items_total", "Items processed by pipeline stages", ("pipeline", "stage"))
+
+
+def record_synthesis(model: str, speaker: str, chars: int, audio_seconds: float, latency: float):
+    REQUESTS.inc(model=model, speaker=speaker, status="ok")
+    CHARACTERS.inc(chars, model=model)
+    AUDIO_SECONDS.inc(audio_seconds, model=model)
+    SYNTHESIS_SECONDS.inc(latency, model=model)
+    LATENCY.observe(latency, model=model, speaker=speaker)
+
+
+def record_failure(model: str, speaker: str):
+    REQUESTS.inc(model=model, speaker=speaker, status="error")
+
+
+def record_model_load(model: str, seconds: float, success: bool):
+    MODEL_LOADS.inc(model=model, status="ok" if success else "error")
+    if success:
+        MODEL_LOAD_SECONDS.observe(seconds, model=model)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_plan(total_chunks: int, unique_chunks: int):
+    PLANNED_CHUNKS.inc(unique_chunks, result="synthesized")
+    PLANNED_CHUNKS.inc(total_chunks - unique_chunks, result="reused")
+
+
+def record_engine_restart():
+    ENGINE_RESTARTS.inc()
+
+
+def record_stage(pipeline: str, stage: str, busy: float, starved: float, blocked: float, items: int):
+    STAGE_SECONDS.inc(busy, pipeline=pipeline, stage=stage, state="busy")
+    STAGE_SECONDS.inc(starved, pipeline=pipeline, stage=stage, state="starved")
+    STAGE_SECONDS.inc(blocked, pipeline=pipeline, stage=stage, state="blocked")
+    STAGE_ITEMS.inc(items, pipeline=pipeline, stage=stage)
+
+
+def summary() -> dict:
+    """Headline numbers for status displays"""
+    audio_seconds = AUDIO_SECONDS.total()
+    synthesis_seconds = SYNTHESIS_SECONDS.total()
+    cache = CACHE_LOOKUPS.values()
+    hits = sum(v for k, v in cache.items() if k[1] == "hit")
+    lookups = sum(cache.values())
+    return {
+        "requests": sum(v for k, v in REQUESTS.values().items() if k[2] == "ok"),
+        "errors": sum(v for k, v in REQUESTS.values().items() if k[2] == "error"),
+        "characters": CHARACTERS.total(),
+        "audio_seconds": audio_seconds,
+        "synthesis_seconds": synthesis_seconds,
+        "real_time_factor": synthesis_seconds / audio_seconds if audio_seconds else None,
+        "cache_hit_rate": hits / lookups if lookups else None,
+        "model_loads": MODEL_LOADS.total()
+    }
@@ -3,8 +3,8 @@ import os
 import hashlib
 import requests
 from pathlib import Path
-from omegaconf import OmegaConf
 from typing import Dict, List, Optional
+from model_registry import get_registry, reload_registry
 
 class ModelManager:
     def __init__(self, models_dir: str):
@@ -22,24 +22,21 @@ class ModelManager:
             response.raise_for_status()
             with open(self.local_models_yml, 'wb') as f:
                 f.write(response.content)
+            reload_registry(str(self.models_dir))
             return True
         except Exception as e:
             print(f"Failed to fetch models.yml: {e}")
             return False
 
     def load_models_config(self) -> Dict:
-        """Load models config from local YAML"""
+        """Load the models table; models.yml is compiled once and cached by the registry"""
         try:
             if not self.local_models_yml.exists():
-                if not self.fetch_models_yml():
-                    return {}
+                self.fetch_models_yml()   # the built-in table is used if this fails
 
-            config = OmegaConf.load(self.local_models_yml)
-            self.tts_models = [
-                model for model in config.tts_models
-                if not model.get('disabled', False)
-            ]
-            return config
+            registry = get_registry(str(self.models_dir))
+            self.tts_models = [dict(config, name=name) for name, config in registry.models.items()]
+            return registry.models
         except Exception as e:
             print(f"Error loading models config: {e}")
             return {}
@@ -48,9 +45,9 @@ class ModelManager:
         """Check which models are actually downloaded"""
         self.available_models = {}
         for model in self.tts_models:
-            model_file = self.models_dir / model.file
+            model_file = self.models_dir / model['file']
             if model_file.exists():
-                self.available_models[model.name] = OmegaConf.to_container(model)
+                self.available_models[model['name']] = model
         return self.available_models
 
     def verify_model(self, model_name: str) -> bool:
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Frozen, inference-optimized TorchScript models with an on-disk cache.
+
+``torch.jit.freeze`` inlines parameters and attributes into the graph as
+constants. ``torch.jit.optimize_for_inference`` then folds conv/batch-norm
+pairs and picks inference-friendly kernels. Both steps take seconds, so the
+result is saved next to the model in ``optimized/``, keyed by the model's
+SHA-256, the torch version and the device type. Later start-ups load the
+optimized graph directly.
+
+Only plain TorchScript archives can be optimized. Models shipped as
+torch.package archives fail ``torch.jit.load`` and are loaded unchanged by
+the caller. A module that does not survive freezing is also used unchanged,
+and an empty ``.unoptimizable`` marker under the same key records that, so
+the freeze is not attempted again on every start-up.
+
+    VOXIOM_OPTIMIZE_MODELS=1   optimize on load (off by default)
+"""
+import os
+from typing import List, Optional
+from lazy_imports import lazy_import
+from tracing import get_logger, tracer
+
+torch = lazy_import("torch")
+
+logger = get_logger("optimizer")
+
+CACHE_DIR = "optimized"
+UNOPTIMIZABLE = ".unoptimizable"   # suffix of the marker left for models optimize() rejects
+ENTRY_POINTS = ("apply_tts",)   # methods callers rely on, besides forward
+
+
+def enabled() -> bool:
+    return os.environ.get("VOXIOM_OPTIMIZE_MODELS", "").lower() in ("1", "true", "yes")
+
+
+def cache_path(models_dir: str, model_name: str, sha256: str, device) -> str:
+    version = torch.__version__.split("+")[0]
+    return os.path.join(models_dir, CACHE_DIR,
+                        f"{model_name}-{sha256[:16]}-torch{version}-{torch.device(device).type}.pt")
+
+
+def _preserved_methods(module) -> List[str]:
+    names = set(module._c._method_names())
+    return [name for name in ENTRY_POINTS if name in names]
+
+
+def optimize(module):
+    """Frozen (and, where supported, inference-optimized) copy of a ScriptModule, or None"""
+    if not isinstance(module, torch.jit.ScriptModule):
+        return None
+    preserved = _preserved_methods(module)
+    module.eval()
+    try:
+        frozen = torch.jit.freeze(module, preserved_attrs=preserved)
+    except Exception as e:
+        logger.info(f"Model cannot be frozen, using it as-is: {e}")
+        return None
+    try:
+        # Only forward is rewritten; the preserved entry points stay as frozen
+        frozen = torch.jit.optimize_for_inference(frozen, other_methods=preserved)
+    except Exception as e:
+        logger.info(f"optimize_for_inference skipped: {e}")
+    if _preserved_methods(frozen) != preserved:
+        logger.info("Frozen model lost an entry point, using the original")
+        return None
+    return frozen
+
+
+def load_optimized(model_path: str, model_name: str, sha256: Optional[str], device):
+    """Load a TorchScript model, preferring (and filling) the optimized cache.
+
+    Raises whatever ``torch.jit.load`` raises for the original file, so
+    callers can fall back to other formats.
+    """
+    cached = cache_path(os.path.dirname(model_path), model_name, sha256, device) if sha256 else None
+    if cached and os.path.exists(cached):
+        try:
+            with tracer.span("optimizer.load_cached", model=model_name):
+                return torch.jit.load(cached, map_location=device)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable optimized model {cached}: {e}")
+            os.remove(cached)
+
+    model = torch.jit.load(model_path, map_location=device)
+    if cached is None or os.path.exists(cached + UNOPTIMIZABLE):
+        return model
+    with tracer.span("optimizer.optimize", model=model_name):
+        optimized = optimize(model)
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    if optimized is None:
+        try:
+            open(cached + UNOPTIMIZABLE, 'w').close()
+        except OSError as e:
+            logger.warning(f"Could not mark {model_name} as unoptimizable: {e}")
+        return model
+    tmp_path = cached + ".tmp"
+    try:
+        torch.jit.save(optimized, tmp_path)
+        os.replace(tmp_path, cached)
+        logger.info(f"Saved optimized {model_name} to {cached}")
+    except Exception as e:
+        logger.warning(f"Could not cache optimized {model_name}: {e}")
+    return optimized
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""The one table of Silero models.
+
+The engine, the GUI, the downloader and ModelManager used to keep separate
+copies of the model list, checksums and capabilities. This module holds the
+built-in table. When ``models.yml`` exists next to the models, it is merged
+over the built-in table, which allows newer URLs, sample rates or
+additional models. The merged table is compiled once to
+``models.compiled.json`` and reused until models.yml changes, so start-up
+does not parse YAML with OmegaConf.
+
+Lookups by name, file, language, speaker and feature are dict lookups:
+
+    registry = get_registry("models/tts")
+    registry.get("v4_ru")["sample_rates"]
+    registry.by_language("ru")          # ["v3_1_ru", "v4_ru"]
+    registry.by_speaker("en_12")        # ["v3_en"]
+    registry.with_feature("ssml")       # ["v4_ru"]
+"""
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from tracing import get_logger
+
+logger = get_logger("registry")
+
+COMPILED_NAME = "models.compiled.json"
+COMPILED_VERSION = 1
+RU_SPEAKERS = ['aidar', 'baya', 'kseniya', 'xenia', 'eugene', 'random']
+# A different voice on every call: the engine accepts it, but it isn't listed,
+# previewed or cached as a voice
+RANDOM_SPEAKERS = frozenset({'random'})
+LANGUAGE_LABELS = {"en": "English", "ru": "Russian", "de": "German", "es": "Spanish", "fr": "French"}
+
+BUILTIN_MODELS = {
+    "v3_en": {
+        "file": "v3_en.pt",
+        "url": "https://models.silero.ai/models/tts/en/v3_en.pt",
+        "sha256": "02b71034d9f13bc4001195017bac9db1c6bb6115e03fea52983e8abcff13b665",
+        "sample_rates": [8000, 24000, 48000],
+        "speakers": [f'en_{i}' for i in range(118)],
+        "default_rate": 48000,
+        "language": "en",
+        "label": "English",
+        "supports_ssml": False
+    },
+    "v3_1_ru": {
+        "file": "v3_1_ru.pt",
+        "url": "https://models.silero.ai/models/tts/ru/v3_1_ru.pt",
+        "sha256": "cf60b47ec8a9c31046021d2d14b962ea56b8a5bf7061c98accaaaca428522f85",
+        "sample_rates": [8000, 24000, 48000],
+        "speakers": RU_SPEAKERS,
+        "default_rate": 48000,
+        "language": "ru",
+        "label": "Russian",
+        "supports_ssml": False
+    },
+    "v4_ru": {
+        "file": "v4_ru.pt",
+        "url": "https://models.silero.ai/models/tts/ru/v4_ru.pt",
+        "sha256": "896ab96347d5bd781ab97959d4fd6885620e5aab52405d3445626eb7c1414b00",
+        "sample_rates": [8000, 24000, 48000],
+        "speakers": RU_SPEAKERS,
+        "default_rate": 48000,
+        "language": "ru",
+        "label": "Russian (SSML)",
+        "supports_ssml": True
+    }
+}
+
+
+def _features(config: dict) -> List[str]:
+    features = []
+    if config.get("supports_ssml"):
+        features.append("ssml")
+    if len(config.get("sample_rates", [])) > 1:
+        features.append("sample_rate")
+    return features
+
+
+class ModelRegistry:
+    def __init__(self, models: Dict[str, dict]):
+        self.models = models
+        self._by_file: Dict[str, str] = {}
+        self._by_language: Dict[str, List[str]] = {}
+        self._by_speaker: Dict[str, List[str]] = {}
+        self._by_feature: Dict[str, List[str]] = {}
+        for name, config in models.items():
+            config.setdefault("supports_sample_rate", "sample_rate" in _features(config))
+            self._by_file[config["file"]] = name
+            self._by_language.setdefault(config["language"], []).append(name)
+            for speaker in config["speakers"]:
+                self._by_speaker.setdefault(speaker, []).append(name)
+            for feature in _features(config):
+                self._by_feature.setdefault(feature, []).append(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.models
+
+    def get(self, name: str) -> dict:
+        if name not in self.models:
+            raise ValueError(f"Model {name} not supported")
+        return self.models[name]
+
+    def names(self) -> List[str]:
+        return list(self.models)
+
+    def by_file(self, file_name: str) -> Optional[str]:
+        return self._by_file.get(file_name)
+
+    def by_language(self, language: str) -> List[str]:
+        return self._by_language.get(language, [])
+
+    def by_speaker(self, speaker: str) -> List[str]:
+        return self._by_speaker.get(speaker, [])
+
+    def with_feature(self, feature: str) -> List[str]:
+        return self._by_feature.get(feature, [])
+
+    def synthesis_models(self) -> Dict[str, dict]:
+        """Models the engine can run: those with a known speaker list"""
+        return {name: config for name, config in self.models.items() if config["speakers"]}
+
+    def checksums(self) -> Dict[str, str]:
+        """File name -> lower-case SHA-256, for models that publish one"""
+        return {config["file"]: config["sha256"] for config in self.models.values() if config.get("sha256")}
+
+
+# ----- models.yml -----
+def _yml_entries(config: dict) -> Dict[str, dict]:
+    """Flatten models.yml into name -> fields.
+
+    Two layouts are accepted: Silero's own (tts_models -> language -> model
+    -> latest -> package/sample_rate), and a list of entries that carry name,
+    file and optionally url, sha256, disabled.
+    """
+    entries = {}
+    models = config.get("tts_models") or {}
+    if isinstance(models, list):
+        for model in models:
+            if model.get("name") and not model.get("disabled", False):
+                entries[model["name"]] = dict(model)
+        return entries
+    for language, by_name in models.items():
+        for name, versions in (by_name or {}).items():
+            latest = (versions or {}).get("latest") or {}
+            package = latest.get("package")
+            if not package or not str(package).endswith(".pt"):
+                continue
+            rates = latest.get("sample_rate")
+            entry = {"language": language, "url": package, "file": os.path.basename(package)}
+            if rates:
+                entry["sample_rates"] = sorted(rates) if isinstance(rates, list) else [rates]
+            entries[name] = entry
+    return entries
+
+
+def _merge(entries: Dict[str, dict]) -> Dict[str, dict]:
+    merged = {name: dict(config) for name, config in BUILTIN_MODELS.items()}
+    for name, entry in entries.items():
+        if name in merged:
+            config = merged[name]
+            if entry.get("url") and entry["url"] != config["url"]:
+                # A different package may have different contents; without a checksum
+                # of its own it is installed and used unverified
+                config.pop("sha256", None)
+        else:
+            language = entry.get("language", "en")
+            config = merged[name] = {
+                "file": entry.get("file", f"{name}.pt"),
+                "url": entry.get("url"),
+                "sample_rates": [],
+                "speakers": [],
+                "language": language,
+                "label": LANGUAGE_LABELS.get(language, language),
+                "supports_ssml": False
+            }
+        for field in ("file", "url", "sha256", "sample_rates", "speakers", "supports_ssml", "label"):
+            if entry.get(field) is not None:
+                config[field] = entry[field]
+        if config.get("sha256"):
+            config["sha256"] = config["sha256"].lower()
+        if config["sample_rates"]:
+            config["default_rate"] = max(config["sample_rates"])
+    return merged
+
+
+def compile_registry(yml_path: Path) -> Dict[str, dict]:
+    """Parse models.yml (the slow part) and merge it over the built-in table"""
+    from omegaconf import OmegaConf
+    config = OmegaConf.to_container(OmegaConf.load(yml_path), resolve=True)
+    return _merge(_yml_entries(config or {}))
+
+
+def _builtin_digest() -> str:
+    """Changes whenever BUILTIN_MODELS does, so an upgrade recompiles the merged table"""
+    table = json.dumps(BUILTIN_MODELS, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(table.encode('utf-8')).hexdigest()[:16]
+
+
+def _load_compiled(yml_path: Path) -> Dict[str, dict]:
+    compiled_path = yml_path.with_name(COMPILED_NAME)
+    stat = yml_path.stat()
+    source = [COMPILED_VERSION, stat.st_mtime_ns, stat.st_size, _builtin_digest()]
+    try:
+        with open(compiled_path, 'r', encoding='utf-8') as f:
+            compiled = json.load(f)
+        if compiled.get("source") == source:
+            return compiled["models"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    models = compile_registry(yml_path)
+    tmp_path = compiled_path.with_suffix(".tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"source": source, "models": models}, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, compiled_path)
+    except OSError as e:
+        logger.warning(f"Could not cache compiled model registry: {e}")
+    return models
+
+
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(models_dir: str = "models/tts") -> ModelRegistry:
+    """Registry for a models directory, built once per process"""
+    key = os.path.normpath(os.path.abspath(models_dir))
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            yml_path = Path(key) / "models.yml"
+            models = {name: dict(config) for name, config in BUILTIN_MODELS.items()}
+            if yml_path.exists():
+                try:
+                    models = _load_compiled(yml_path)
+                except Exception as e:
+                    print(f"Error loading models config: {e}")
+            registry = _registries[key] = ModelRegistry(models)
+        return registry
+
+
+def reload_registry(models_dir: str = "models/tts") -> ModelRegistry:
+    """Forget the cached registry, e.g. after models.yml was downloaded"""
+    with _registries_lock:
+        _registries.pop(os.path.normpath(os.path.abspath(models_dir)), None)
+    return get_registry(models_dir)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Staged processing with bounded queues.
+
+Each stage of a ``Pipeline`` runs on its own thread. Stages are connected by
+small bounded queues, so a later stage works on item k while an earlier one
+is already on item k+1. For example, synthesis of the next sentence overlaps
+with post-processing and writing of the current one. A full queue blocks its
+producer, which keeps a fast stage from running far ahead of a slow one.
+
+Every stage records three times:
+- busy: time spent in its function
+- starved: time spent waiting for input
+- blocked: time spent waiting for room downstream
+``report()`` turns these into utilization and names the bottleneck.
+
+    pipeline = Pipeline([Stage("inference", synthesize), Stage("dsp", trim),
+                         Stage("sink", write)], name="audiobook")
+    pipeline.run(chunks)
+    logger.info(pipeline.report())  # "inference 97% | dsp 2% | sink 4% -> bottleneck: inference"
+"""
+import time
+import queue
+import threading
+from typing import Any, Callable, Iterable, List, Optional
+import metrics
+from tracing import get_logger, tracer
+
+logger = get_logger("pipeline")
+
+QUEUE_SIZE = 2     # items buffered between two stages
+_END = object()
+
+
+class Stage:
+    def __init__(self, name: str, fn: Callable[[Any], Any]):
+        self.name = name
+        self.fn = fn
+        self.items = 0
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+
+    def reset(self):
+        self.items = 0
+        self.busy = self.starved = self.blocked = 0.0
+
+
+class Pipeline:
+    def __init__(self, stages: List[Stage], queue_size: int = QUEUE_SIZE,
+                 stop_event: Optional[threading.Event] = None, name: str = "pipeline"):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.stop_event = stop_event
+        self.name = name
+        self.wall = 0.0
+
+    def run(self, items: Iterable) -> list:
+        """Push items through every stage; returns the last stage's outputs in order.
+
+        An exception in any stage stops the feed, drains the stages and is
+        re-raised here. Setting `stop_event` stops feeding new items. Items
+        already in flight still finish.
+        """
+        for stage in self.stages:
+            stage.reset()
+        queues = [queue.Queue(self.queue_size) for _ in self.stages]
+        results = []
+        failures = []
+        abort = threading.Event()
+
+        def put(target: queue.Queue, item, stage: Optional[Stage] = None) -> bool:
+            started = time.perf_counter()
+            while True:
+                try:
+                    target.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    if abort.is_set():
+                        return False
+            if stage is not None:
+                stage.blocked += time.perf_counter() - started
+            return True
+
+        def work(index: int, stage: Stage):
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            while True:
+                waited = time.perf_counter()
+                item = inbox.get()
+                stage.starved += time.perf_counter() - waited
+                if item is _END:
+                    break
+                if abort.is_set():
+                    continue   # drain until the end marker arrives
+                started = time.perf_counter()
+                try:
+                    output = stage.fn(item)
+                except BaseException as e:
+                    failures.append(e)
+                    abort.set()
+                    continue
+                finally:
+                    stage.busy += time.perf_counter() - started
+                stage.items += 1
+                if outbox is None:
+                    results.append(output)
+                else:
+                    put(outbox, output, stage)
+            if outbox is not None:
+                outbox.put(_END)   # the next stage is draining, so this never blocks for long
+
+        threads = [threading.Thread(target=work, args=(index, stage), daemon=True,
+                                    name=f"{self.name}-{stage.name}")
+                   for index, stage in enumerate(self.stages)]
+        started = time.perf_counter()
+        with tracer.span(f"{self.name}.pipeline", stages=len(self.stages)):
+            for thread in threads:
+                thread.start()
+            try:
+                for item in items:
+                    if abort.is_set() or (self.stop_event is not None and self.stop_event.is_set()):
+                        break
+                    if not put(queues[0], item):
+                        break
+            finally:
+                queues[0].put(_END)
+                for thread in threads:
+                    thread.join()
+                self.wall = time.perf_counter() - started
+                for stage in self.stages:
+                    metrics.record_stage(self.name, stage.name, stage.busy, stage.starved,
+                                         stage.blocked, stage.items)
+        if failures:
+            raise failures[0]
+        return results
+
+    def stats(self) -> List[dict]:
+        wall = self.wall or 1e-9
+        return [{
+            "stage": stage.name,
+            "items": stage.items,
+            "busy": stage.busy,
+            "starved": stage.starved,
+            "blocked": stage.blocked,
+            "utilization": min(1.0, stage.busy / wall),
+        } for stage in self.stages]
+
+    def bottleneck(self) -> Optional[str]:
+        stats = self.stats()
+        return max(stats, key=lambda s: s["utilization"])["stage"] if self.wall else None
+
+    def report(self) -> str:
+        parts = " | ".join(f"{s['stage']} {s['utilization'] * 100:.0f}%" for s in self.stats())
+        return f"{parts} -> bottleneck: {self.bottleneck()} ({self.wall:.2f}s)"
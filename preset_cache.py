@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import time
+import threading
+from typing import Callable, Iterator, Optional, Tuple
+import numpy as np
+from audio_cache import AudioCache
+from tracing import get_logger
+from presets import preset_fields
+from language_router import is_mixed
+
+logger = get_logger("preset_cache")
+
+MAX_CLIPS = 400   # preset clips kept per model; the selected voice's presets are never evicted
+
+
+def preset_matches_language(preset, language: Optional[str]) -> bool:
+    """True if a preset is meant for `language`: by its tag, or by its script when untagged"""
+    tagged = preset.get("language") if isinstance(preset, dict) else None
+    if tagged:
+        return tagged == language
+    return not is_mixed(preset_fields(preset)[0], language)
+
+
+class PresetAudioCache:
+    """Precomputes and persists audio for the presets of the loaded model's selected voice.
+
+    Only presets in the model's language are rendered, and only for one
+    speaker: some models have over a hundred. Clips of voices selected
+    earlier are kept, oldest evicted first, up to `max_clips`. The cache key
+    includes the preset text and its `timestamp` field, so re-saving a
+    preset (which stamps a new timestamp) invalidates its audio. Clips live
+    under a namespace derived from the model file's hash, so an updated
+    model never serves old audio. Rendering happens on a daemon thread, and
+    only while `is_idle()` is true.
+    """
+
+    def __init__(self, tts, cache_dir: str, presets_provider: Callable[[], dict],
+                 is_idle: Callable[[], bool] = lambda: True, idle_poll: float = 1.0,
+                 max_clips: int = MAX_CLIPS):
+        self.tts = tts
+        self.cache = AudioCache(cache_dir, name="presets")
+        self.presets_provider = presets_provider
+        self.is_idle = is_idle
+        self.idle_poll = idle_poll
+        self.max_clips = max_clips
+        self._generation = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._job: Optional[Tuple[int, str, str, int]] = None
+        self._thread = threading.Thread(target=self._worker, name="preset-precompute", daemon=True)
+        self._thread.start()
+
+    def _namespace(self, model_name: str, compute: bool = True) -> Optional[str]:
+        model_hash = self.tts.model_hash(model_name, compute=compute)
+        return f"{model_name}-{model_hash[:16]}" if model_hash else None
+
+    def key(self, category: str, name: str, preset, speaker: str, sample_rate: int) -> str:
+        text, ssml, timestamp = preset_fields(preset)
+        return AudioCache.make_key(category, name, text, ssml, timestamp, speaker, sample_rate)
+
+    def lookup(self, model_name: str, category: str, name: str, speaker: str,
+               sample_rate: int) -> Optional[np.ndarray]:
+        """Return cached audio for a preset, or None if it hasn't been rendered yet"""
+        preset = self.presets_provider().get(category, {}).get(name)
+        namespace = self._namespace(model_name, compute=False)   # never hash on the Tk thread
+        if preset is None or namespace is None:
+            return None
+        entry = self.cache.get(namespace, self.key(category, name, preset, speaker, sample_rate))
+        if entry is None or entry[1] != sample_rate:
+            return None
+        return entry[0]
+
+    def schedule(self, model_name: str, speaker: Optional[str], sample_rate: int):
+        """(Re)start background rendering of a model's presets for `speaker`, or its first voice"""
+        speakers = self.tts.get_voices(model_name)
+        if speaker not in speakers:
+            if not speakers:
+                return
+            speaker = speakers[0]
+        self._generation += 1
+        self._job = (self._generation, model_name, speaker, sample_rate)
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _iter_work(self, namespace: str, model_name: str, speaker: str,
+                   sample_rate: int) -> Iterator[tuple]:
+        language = self.tts.supported_models[model_name].get("language")
+        presets = [(category, name, preset)
+                   for category, entries in self.presets_provider().items()
+                   for name, preset in entries.items()
+                   if preset_matches_language(preset, language)]
+        # Clips of other voices stay valid until evicted, so switching back is instant
+        valid_keys = {self.key(category, name, preset, voice, sample_rate)
+                      for voice in self.tts.get_voices(model_name)
+                      for category, name, preset in presets}
+        work = [(self.key(category, name, preset, speaker, sample_rate), preset)
+                for category, name, preset in presets[:self.max_clips]]
+        wanted = {key for key, _ in work}
+
+        removed = self.cache.prune(namespace, lambda key: key in valid_keys)
+        missing = [(key, preset) for key, preset in work if not self.cache.contains(namespace, key)]
+        # Make room for what this speaker still needs
+        removed += self.cache.trim(namespace, self.max_clips - len(missing), keep=wanted.__contains__)
+        if removed:
+            logger.debug(f"Removed {removed} stale or evicted preset clips for {model_name}")
+
+        for key, preset in missing:
+            yield key, speaker, preset
+
+    def _worker(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            job = self._job
+            if job is None:
+                continue
+            generation, model_name, speaker, sample_rate = job
+            try:
+                namespace = self._namespace(model_name)
+                if namespace is None:
+                    continue
+                for key, speaker, preset in self._iter_work(namespace, model_name, speaker, sample_rate):
+                    # Yield to foreground work; abandon the job if a newer one was scheduled
+                    while not self.is_idle() and not self._stop.is_set():
+                        time.sleep(self.idle_poll)
+                    if self._stop.is_set() or generation != self._generation:
+                        break
+                    self._render(namespace, model_name, key, speaker, preset, sample_rate)
+            except Exception as e:
+                logger.warning(f"Preset precompute stopped: {e}")
+
+    def _render(self, namespace: str, model_name: str, key: str, speaker: str, preset, sample_rate: int):
+        text, ssml, _ = preset_fields(preset)
+        if not text.strip() or self.tts.current_model != model_name:
+            return
+        try:
+            audio = self.tts.speak(text, speaker=speaker, ssml=ssml and self.tts.supports_ssml(model_name),
+                                   sample_rate=sample_rate, model_name=model_name)
+        except Exception as e:
+            logger.debug(f"Skipping preset precompute for {speaker}: {e}")
+            return
+        # The model may have been switched while we were synthesizing
+        if self.tts.current_model == model_name:
+            self.cache.put(namespace, key, np.asarray(audio, dtype=np.float32), sample_rate)
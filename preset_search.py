@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+import re
+import heapq
+import bisect
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from presets import preset_fields
+
+# Runs of letters or of digits: "preset_12" is "preset" and "12", so numbered
+# names share their word instead of each adding a token of its own
+_TOKEN = re.compile(r"[^\W\d_]+|\d+", re.UNICODE)
+
+NAME_WEIGHT = 3.0
+TEXT_WEIGHT = 1.0
+EXACT_BONUS = 2.0
+MIN_PREFIX = 2
+MAX_EXPANSIONS = 64        # prefix/infix matches per query term, most frequent tokens first
+RANKED_DEPTH = 200         # best postings kept per (token, category); a search needs at most `limit`
+RANKED_CACHE_SIZE = 4096   # (token, category) top lists kept
+WARM_MIN_DOCS = 500        # tokens this common get their top lists built by rebuild()
+TERM_CACHE_SIZE = 256      # query terms whose expansions are remembered until the vocabulary changes
+
+
+def tokenize(text: str) -> List[str]:
+    # Stress marks ("з+емли") shouldn't split words
+    return _TOKEN.findall(text.lower().replace('+', ''))
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _scaled(ranked, quality: float):
+    for weight, name, doc_id in ranked:
+        yield weight * quality, name, doc_id
+
+
+class PresetSearchIndex:
+    """Inverted token and trigram index over preset names and texts.
+
+    Queries match every query term against whole tokens, token prefixes or,
+    for terms of 3+ characters, substrings found through the trigram
+    postings. Results are ranked with name hits above text hits. The index
+    is updated one preset at a time through `on_preset_changed`, which
+    matches the PresetStore listener signature.
+
+    Postings are kept per category, so a category search never touches
+    other categories. Single-term queries, which are what typing produces,
+    merge the best postings of each matching token, sorted by (score, name),
+    and stop after `limit` documents. These top lists are updated in place
+    when presets change, and a term expands to at most MAX_EXPANSIONS tokens.
+    """
+
+    def __init__(self, presets=None):
+        self._lock = threading.RLock()
+        self._docs: Dict[int, Tuple[str, str, str, str]] = {}   # id -> (category, name, name_lc, text_lc)
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._postings: Dict[str, Dict[str, Dict[int, float]]] = {}   # token -> category -> {doc: weight}
+        self._counts: Dict[str, int] = {}                         # token -> documents
+        self._ranked: "OrderedDict[tuple, list]" = OrderedDict()  # (token, category) -> [top, complete]
+        self._grams: Dict[str, Set[str]] = {}                     # trigram -> tokens
+        self._vocabulary: List[str] = []                          # sorted, for prefix lookup
+        self._terms: Dict[str, Dict[str, float]] = {}             # term -> matching tokens
+        self._next_id = 0
+        if presets is not None:
+            self.rebuild(presets)
+
+    def rebuild(self, presets):
+        with self._lock:
+            self._docs.clear()
+            self._ids.clear()
+            self._postings.clear()
+            self._counts.clear()
+            self._ranked.clear()
+            self._grams.clear()
+            self._vocabulary = []
+            self._terms.clear()
+            for category, entries in list(presets.items()):
+                for name, preset in list(entries.items()):
+                    self.add(category, name, preset)
+            # Common words are what short prefixes hit; sort them now, off the Tk thread
+            for token, count in self._counts.items():
+                if count >= WARM_MIN_DOCS:
+                    for category in self._postings[token]:
+                        self._ranked_postings(token, category)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def on_preset_changed(self, event: str, category: str, name: str, preset):
+        if event == "deleted":
+            self.remove(category, name)
+        else:
+            self.add(category, name, preset)
+
+    def add(self, category: str, name: str, preset):
+        text = preset_fields(preset)[0]
+        with self._lock:
+            if (category, name) in self._ids:
+                self.remove(category, name)
+            doc_id = self._next_id
+            self._next_id += 1
+            self._ids[(category, name)] = doc_id
+            self._docs[doc_id] = (category, name, name.lower(), text.lower().replace('+', ''))
+
+            weights: Dict[str, float] = {}
+            for token in tokenize(name):
+                weights[token] = weights.get(token, 0.0) + NAME_WEIGHT
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + TEXT_WEIGHT
+            for token, weight in weights.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    bisect.insort(self._vocabulary, token)
+                    self._terms.clear()
+                    for gram in trigrams(token):
+                        self._grams.setdefault(gram, set()).add(token)
+                postings.setdefault(category, {})[doc_id] = weight
+                self._counts[token] = self._counts.get(token, 0) + 1
+                self._rank_insert(token, category, (-weight, name.lower(), doc_id))
+
+    def remove(self, category: str, name: str):
+        with self._lock:
+            doc_id = self._ids.pop((category, name), None)
+            if doc_id is None:
+                return
+            _, _, name_lc, text_lc = self._docs.pop(doc_id)
+            for token in set(tokenize(name_lc)) | set(tokenize(text_lc)):
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                in_category = postings.get(category)
+                if in_category is not None and doc_id in in_category:
+                    self._rank_remove(token, category, (-in_category.pop(doc_id), name_lc, doc_id))
+                    self._counts[token] -= 1
+                    if not in_category:
+                        del postings[category]
+                if not postings:
+                    del self._postings[token]
+                    del self._counts[token]
+                    self._terms.clear()
+                    index = bisect.bisect_left(self._vocabulary, token)
+                    if index < len(self._vocabulary) and self._vocabulary[index] == token:
+                        del self._vocabulary[index]
+                    for gram in trigrams(token):
+                        tokens = self._grams.get(gram)
+                        if tokens is not None:
+                            tokens.discard(token)
+                            if not tokens:
+                                del self._grams[gram]
+
+    def _category_postings(self, token: str, category: Optional[str]) -> Iterable[Dict[int, float]]:
+        postings = self._postings[token]
+        if category is None:
+            return postings.values()
+        return [postings[category]] if category in postings else []
+
+    def _ranked_postings(self, token: str, category: Optional[str],
+                         depth: int = RANKED_DEPTH) -> List[Tuple[float, str, int]]:
+        """Best `depth` (-weight, name, doc) entries of a token, best first"""
+        key = (token, category)
+        cached = self._ranked.get(key)
+        if cached is not None and (cached[1] or len(cached[0]) >= depth):
+            self._ranked.move_to_end(key)
+            return cached[0]
+        depth = max(depth, RANKED_DEPTH)
+        if category is None:
+            # The overall top is the top of the per-category tops
+            lists = [self._ranked_postings(token, name, depth) for name in self._postings[token]]
+            ranked = list(itertools.islice(heapq.merge(*lists), depth))
+            total = self._counts[token]
+        else:
+            docs = self._docs
+            postings = self._postings[token].get(category, {})
+            ranked = heapq.nsmallest(depth, ((-weight, docs[doc_id][2], doc_id)
+                                             for doc_id, weight in postings.items()))
+            total = len(postings)
+        self._ranked[key] = [ranked, len(ranked) == total]
+        if len(self._ranked) > RANKED_CACHE_SIZE:
+            self._ranked.popitem(last=False)
+        return ranked
+
+    def _rank_insert(self, token: str, category: str, entry: tuple):
+        for key in ((token, category), (token, None)):
+            cached = self._ranked.get(key)
+            if cached is None:
+                continue
+            ranked, complete = cached
+            if complete or entry < ranked[-1]:
+                bisect.insort(ranked, entry)
+                if len(ranked) > RANKED_DEPTH and not complete:
+                    ranked.pop()
+
+    def _rank_remove(self, token: str, category: str, entry: tuple):
+        for key in ((token, category), (token, None)):
+            cached = self._ranked.get(key)
+            if cached is None:
+                continue
+            ranked, complete = cached
+            index = bisect.bisect_left(ranked, entry)
+            if index < len(ranked) and ranked[index] == entry:
+                del ranked[index]
+                if not complete:
+                    del self._ranked[key]   # the next entry is unknown; rebuilt on use
+
+    def _matching_tokens(self, term: str) -> Dict[str, float]:
+        """Vocabulary tokens matching a query term, with a match-quality multiplier"""
+        matches = self._terms.get(term)
+        if matches is None:
+            if len(self._terms) >= TERM_CACHE_SIZE:
+                self._terms.clear()
+            matches = self._terms[term] = self._expand(term)
+        return matches
+
+    def _expand(self, term: str) -> Dict[str, float]:
+        matches = {}
+        if term in self._postings:
+            matches[term] = EXACT_BONUS
+
+        # Prefix matches via the sorted vocabulary; single letters would match
+        # a large share of it, so they only count as whole words. Digits do
+        # expand, so "preset_1" also finds "preset_10"
+        if len(term) >= MIN_PREFIX or term.isdigit():
+            index = bisect.bisect_left(self._vocabulary, term)
+            end = bisect.bisect_left(self._vocabulary, term + '\U0010ffff', index)
+            for token in self._most_frequent(self._vocabulary[index:end]):
+                matches.setdefault(token, 1.0)
+
+        # Infix matches via trigram intersection (smallest posting first)
+        if len(term) >= 3:
+            grams = [g for g in trigrams(term) if g[0] != ' ' and g[-1] != ' ']
+            sets = sorted((self._grams.get(g, set()) for g in grams), key=len)
+            if sets and sets[0]:
+                candidates = set(sets[0])
+                for other in sets[1:]:
+                    candidates &= other
+                    if not candidates:
+                        break
+                for token in self._most_frequent([t for t in candidates if term in t]):
+                    matches.setdefault(token, 0.5)
+        return matches
+
+    def _most_frequent(self, tokens: List[str]) -> List[str]:
+        if len(tokens) <= MAX_EXPANSIONS:
+            return tokens
+        return heapq.nlargest(MAX_EXPANSIONS, tokens, key=self._counts.__getitem__)
+
+    def search(self, query: str, category: Optional[str] = None, limit: int = 50) -> List[Tuple[str, str]]:
+        """Return up to `limit` (category, name) pairs ranked by relevance"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            matches = [self._matching_tokens(term) for term in terms]
+            if len(matches) == 1:
+                ranked = self._top_single(matches[0], category, limit)
+            else:
+                ranked = self._top_multi(matches, category, limit)
+            docs = self._docs
+            return [(docs[doc_id][0], docs[doc_id][1]) for doc_id in ranked]
+
+    def _top_single(self, matches: Dict[str, float], category: Optional[str], limit: int) -> List[int]:
+        """Merge the sorted posting lists of every matching token; a document's first hit is its best"""
+        streams = []
+        for token, quality in matches.items():
+            ranked = self._ranked_postings(token, category, limit)
+            if ranked:
+                streams.append(ranked if quality == 1.0 else _scaled(ranked, quality))
+        seen = set()
+        result = []
+        for _, _, doc_id in heapq.merge(*streams):
+            if doc_id not in seen:
+                seen.add(doc_id)
+                result.append(doc_id)
+                if len(result) == limit:
+                    break
+        return result
+
+    def _top_multi(self, matches: List[Dict[str, float]], category: Optional[str], limit: int) -> List[int]:
+        """Every term must match; each term adds the best score among its tokens"""
+        def size(term_matches):
+            return sum(len(postings) for token in term_matches
+                       for postings in self._category_postings(token, category))
+
+        scores: Optional[Dict[int, float]] = None
+        for term_matches in sorted(matches, key=size):
+            if scores is not None and len(scores) * len(term_matches) < size(term_matches):
+                # Few candidates left: look them up instead of walking the postings
+                lists = [(postings, quality) for token, quality in term_matches.items()
+                         for postings in self._category_postings(token, category)]
+                term_scores = {}
+                for doc_id in scores:
+                    best = max((postings.get(doc_id, 0.0) * quality for postings, quality in lists), default=0.0)
+                    if best:
+                        term_scores[doc_id] = best
+            else:
+                term_scores = {}
+                for token, quality in term_matches.items():
+                    for postings in self._category_postings(token, category):
+                        for doc_id, weight in postings.items():
+                            if scores is not None and doc_id not in scores:
+                                continue
+                            score = weight * quality
+                            if score > term_scores.get(doc_id, 0.0):
+                                term_scores[doc_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: scores[doc_id] + s for doc_id, s in term_scores.items()}
+            if not scores:
+                return []
+
+        docs = self._docs
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], docs[item[0]][2]))
+        return [doc_id for doc_id, _ in best]
@@ -1,16 +1,311 @@
 import json
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-def load_presets(file_path: str = "presets.json") -> Dict[str, Any]:
-    """Load presets from JSON file with error handling"""
+PRESETS_JSON = Path(__file__).parent / "presets.json"
+PRESETS_DB = Path(__file__).parent / "presets.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    category  TEXT NOT NULL,
+    name      TEXT NOT NULL,
+    text      TEXT NOT NULL,
+    language  TEXT,
+    ssml      INTEGER NOT NULL DEFAULT 0,
+    timestamp TEXT,
+    extra     TEXT,
+    legacy    INTEGER NOT NULL DEFAULT 0,
+    position  INTEGER NOT NULL,
+    PRIMARY KEY (category, name)
+);
+CREATE INDEX IF NOT EXISTS idx_presets_language ON presets (language, category);
+CREATE INDEX IF NOT EXISTS idx_presets_position ON presets (category, position);
+"""
+
+_KNOWN_FIELDS = ("text", "language", "ssml", "timestamp")
+
+
+def preset_fields(preset) -> Tuple[str, bool, str]:
+    """(text, ssml, timestamp) for both dict and legacy string presets"""
+    if isinstance(preset, dict):
+        return preset.get("text", ""), bool(preset.get("ssml", False)), preset.get("timestamp", "")
+    return str(preset), False, ""
+
+
+class PresetStore(Mapping):
+    """SQLite-backed preset store with in-memory category and language indexes.
+
+    Reads are served from memory; each save or delete is a single SQLite
+    transaction, so there is no whole-file rewrite and no risk of a torn
+    presets file. A category's dict is replaced, never changed in place, so
+    the mapping returned for a category is a snapshot that other threads can
+    iterate while presets are saved. The store is a read-only mapping of
+    ``category -> {name: preset}`` for code written against the old dict,
+    and listeners registered with ``subscribe`` are told about every change.
+    On first use the database is seeded from presets.json.
+    """
+
+    def __init__(self, db_path: str = str(PRESETS_DB), seed_json: Optional[str] = str(PRESETS_JSON)):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[str, str, str, Any], None]] = []
+        self._categories: Dict[str, Dict[str, Any]] = {}
+        self._by_language: Dict[str, Dict[str, List[str]]] = {}
+        self._next_position = 0
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        empty = self._conn.execute("SELECT COUNT(*) FROM presets").fetchone()[0] == 0
+        if empty and seed_json:
+            self.import_json(seed_json)
+        self._load()
+
+    # ----- Mapping interface -----
+    def __getitem__(self, category: str):
+        with self._lock:
+            return MappingProxyType(self._categories[category])
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._categories))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._categories)
+
+    def items(self) -> List[Tuple[str, Mapping]]:
+        """Snapshot of (category, presets) pairs; the Mapping view would race with deletes"""
+        with self._lock:
+            return [(category, MappingProxyType(entries)) for category, entries in self._categories.items()]
+
+    def values(self) -> List[Mapping]:
+        return [entries for _, entries in self.items()]
+
+    # ----- Queries -----
+    def categories(self, language: Optional[str] = None) -> List[str]:
+        with self._lock:
+            if language is None:
+                return list(self._categories)
+            return list(self._by_language.get(language, {}))
+
+    def names(self, category: str, language: Optional[str] = None) -> List[str]:
+        """Preset names in a category, optionally only those for `language`"""
+        with self._lock:
+            if language is None:
+                return list(self._categories.get(category, {}))
+            return list(self._by_language.get(language, {}).get(category, []))
+
+    def get_preset(self, category: str, name: str) -> Optional[Any]:
+        with self._lock:
+            return self._categories.get(category, {}).get(name)
+
+    # ----- Mutations -----
+    def save(self, category: str, name: str, preset: Any):
+        """Insert or replace one preset atomically"""
+        row = self._to_row(category, name, preset)
+        with self._lock:
+            existing = self.get_preset(category, name)
+            with self._conn:
+                position = self._conn.execute(
+                    "SELECT position FROM presets WHERE category = ? AND name = ?", (category, name)
+                ).fetchone()
+                row["position"] = position[0] if position else self._allocate_position()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO presets "
+                    "(category, name, text, language, ssml, timestamp, extra, legacy, position) "
+                    "VALUES (:category, :name, :text, :language, :ssml, :timestamp, :extra, :legacy, :position)",
+                    row
+                )
+            self._copy_category(category)
+            if existing is not None:
+                self._unindex(category, name, existing)
+            self._index(category, name, preset)
+        self._notify("saved", category, name, preset)
+
+    def delete(self, category: str, name: str) -> bool:
+        with self._lock:
+            existing = self.get_preset(category, name)
+            if existing is None:
+                return False
+            with self._conn:
+                self._conn.execute("DELETE FROM presets WHERE category = ? AND name = ?", (category, name))
+            self._copy_category(category)
+            self._unindex(category, name, existing)
+            if not self._categories[category]:
+                del self._categories[category]
+        self._notify("deleted", category, name, existing)
+        return True
+
+    def add_category(self, category: str):
+        """Categories only persist once they hold a preset; this makes one visible until then"""
+        with self._lock:
+            self._categories.setdefault(category, {})
+
+    def subscribe(self, callback: Callable[[str, str, str, Any], None]):
+        """Register callback(event, category, name, preset) for "saved"/"deleted" events"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ----- Import / export -----
+    def import_json(self, json_path: str) -> int:
+        """Bulk-load a presets.json file in one transaction"""
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Failed to load presets: {e}")
+            return 0
+
+        rows = []
+        with self._lock:
+            for category, entries in data.items():
+                for name, preset in entries.items():
+                    row = self._to_row(category, name, preset)
+                    row["position"] = self._allocate_position()
+                    rows.append(row)
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO presets "
+                    "(category, name, text, language, ssml, timestamp, extra, legacy, position) "
+                    "VALUES (:category, :name, :text, :language, :ssml, :timestamp, :extra, :legacy, :position)",
+                    rows
+                )
+        return len(rows)
+
+    def export_json(self, json_path: str):
+        """Write all presets in the legacy presets.json layout (for backups/sharing)"""
+        data = {category: dict(entries) for category, entries in self.items()}
+        tmp_path = f"{json_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        Path(tmp_path).replace(json_path)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ----- Internals -----
+    def _load(self):
+        with self._lock:
+            # Fresh dicts: mappings handed out before the reload stay as they were
+            self._categories = {}
+            self._by_language = {}
+            rows = self._conn.execute(
+                "SELECT category, name, text, language, ssml, timestamp, extra, legacy, position "
+                "FROM presets ORDER BY position"
+            ).fetchall()
+            for category, name, text, language, ssml, timestamp, extra, legacy, position in rows:
+                self._index(category, name, self._from_row(text, language, ssml, timestamp, extra, legacy))
+                self._next_position = max(self._next_position, position + 1)
+
+    def _copy_category(self, category: str):
+        """Give a category a new dict before changing it; readers keep the old one"""
+        self._categories[category] = dict(self._categories.get(category, {}))
+
+    def _allocate_position(self) -> int:
+        position = self._next_position
+        self._next_position += 1
+        return position
+
+    def _index(self, category: str, name: str, preset: Any):
+        self._categories.setdefault(category, {})[name] = preset
+        language = preset.get("language") if isinstance(preset, dict) else None
+        if language:
+            names = self._by_language.setdefault(language, {}).setdefault(category, [])
+            if name not in names:
+                names.append(name)
+
+    def _unindex(self, category: str, name: str, preset: Any):
+        self._categories.get(category, {}).pop(name, None)
+        language = preset.get("language") if isinstance(preset, dict) else None
+        if language:
+            names = self._by_language.get(language, {}).get(category, [])
+            if name in names:
+                names.remove(name)
+            if not names:
+                self._by_language.get(language, {}).pop(category, None)
+
+    def _notify(self, event: str, category: str, name: str, preset: Any):
+        for callback in list(self._listeners):
+            try:
+                callback(event, category, name, preset)
+            except Exception as e:
+                print(f"Preset listener failed: {e}")
+
+    @staticmethod
+    def _to_row(category: str, name: str, preset: Any) -> dict:
+        if not isinstance(preset, dict):
+            return {"category": category, "name": name, "text": str(preset), "language": None,
+                    "ssml": 0, "timestamp": None, "extra": None, "legacy": 1}
+        extra = {k: v for k, v in preset.items() if k not in _KNOWN_FIELDS}
+        return {
+            "category": category,
+            "name": name,
+            "text": preset.get("text", ""),
+            "language": preset.get("language"),
+            "ssml": 1 if preset.get("ssml") else 0,
+            "timestamp": preset.get("timestamp"),
+            "extra": json.dumps(extra, ensure_ascii=False) if extra else None,
+            "legacy": 0
+        }
+
+    @staticmethod
+    def _from_row(text, language, ssml, timestamp, extra, legacy) -> Any:
+        if legacy:
+            return text
+        preset = {"text": text, "ssml": bool(ssml)}
+        if language is not None:
+            preset["language"] = language
+        if timestamp is not None:
+            preset["timestamp"] = timestamp
+        if extra:
+            preset.update(json.loads(extra))
+        return preset
+
+
+_store: Optional[PresetStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> PresetStore:
+    """Process-wide preset store shared by the engine and the GUI"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PresetStore()
+        return _store
+
+
+def memory_store(presets: Dict[str, Dict[str, Any]]) -> PresetStore:
+    """Unpersisted store holding `presets`, for when the preset database can't be opened"""
+    store = PresetStore(":memory:", seed_json=None)
+    for category, entries in presets.items():
+        store.add_category(category)
+        for name, preset in entries.items():
+            store.save(category, name, preset)
+    return store
+
+
+def load_presets(file_path: str = "presets.json") -> Mapping:
+    """Load presets with error handling (served from the shared preset store)"""
     try:
+        if file_path == "presets.json":
+            return get_store()
         with open(Path(__file__).parent / file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
         print(f"Failed to load presets: {e}")
-        return {
+        return memory_store({
             "Error": {
                 "default": "Presets failed to load. Please check presets.json"
             }
-        }
+        })
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Multi-speaker script rendering.
+
+Each script line may start with a voice tag:
+
+    [en_12] Hello there.
+    [v4_ru:baya] Привет!
+    [v3_1_ru] Тот же голос, другая модель.
+    And this line keeps the previous voice.
+
+A tag names a speaker, a model, or both as ``model:speaker``. Tags are
+validated against the engine's ``supported_models`` speaker lists. Lines are
+grouped by (model, speaker) so each model is used in one run rather than
+switched back and forth. Groups are synthesized in parallel. The result is
+reassembled in script order.
+
+    python script_renderer.py dialogue.txt -o dialogue.wav --model v3_en
+"""
+import re
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from text_utils import split_sentences
+from synthesis_planner import normalize_chunk
+from tracing import get_logger, tracer
+
+logger = get_logger("script")
+
+LINE_PAUSE = 0.35    # seconds of silence between script lines
+
+_TAG = re.compile(r'^\s*\[([^\[\]]+)\]\s*(.*)$')
+
+
+class ScriptLine:
+    def __init__(self, index: int, model: str, speaker: str, text: str, pause: Optional[float] = None):
+        self.index = index
+        self.model = model
+        self.speaker = speaker
+        self.text = text
+        self.pause = pause    # silence before this line; the renderer's default if None
+
+    def __repr__(self):
+        return f"ScriptLine({self.index}, {self.model}:{self.speaker}, {self.text[:30]!r})"
+
+
+def resolve_tag(tag: str, supported_models: dict, default_model: str) -> Tuple[str, str]:
+    """Turn "speaker", "model" or "model:speaker" into a validated (model, speaker)"""
+    tag = tag.strip()
+    if ':' in tag:
+        model, speaker = (part.strip() for part in tag.split(':', 1))
+    elif tag in supported_models:
+        model, speaker = tag, None
+    else:
+        model, speaker = None, tag
+
+    if model is None:
+        # Prefer the default model, then any model that has this speaker
+        candidates = [default_model] + [m for m in supported_models if m != default_model]
+        model = next((m for m in candidates
+                      if speaker in supported_models.get(m, {}).get("speakers", [])), None)
+        if model is None:
+            raise ValueError(f"Unknown speaker '{speaker}'")
+
+    if model not in supported_models:
+        raise ValueError(f"Model {model} not supported")
+    speakers = supported_models[model]["speakers"]
+    if speaker is None:
+        speaker = speakers[0]
+    elif speaker not in speakers:
+        raise ValueError(f"Speaker '{speaker}' is not available in {model}")
+    return model, speaker
+
+
+def parse_script(text: str, supported_models: dict, default_model: str,
+                 default_speaker: Optional[str] = None) -> List[ScriptLine]:
+    """Parse tagged lines; untagged lines keep the voice of the line before"""
+    if default_model not in supported_models:
+        raise ValueError(f"Model {default_model} not supported")
+    voice = (default_model, default_speaker or supported_models[default_model]["speakers"][0])
+
+    lines = []
+    for number, raw in enumerate(text.splitlines(), 1):
+        match = _TAG.match(raw)
+        if match:
+            try:
+                voice = resolve_tag(match.group(1), supported_models, default_model)
+            except ValueError as e:
+                raise ValueError(f"Line {number}: {e}")
+            raw = match.group(2)
+        if raw.strip():
+            lines.append(ScriptLine(len(lines), voice[0], voice[1], raw.strip()))
+    return lines
+
+
+def looks_like_script(text: str, supported_models: dict, default_model: str) -> bool:
+    """True if the first non-blank line starts with a valid voice tag"""
+    for raw in text.splitlines():
+        if raw.strip():
+            match = _TAG.match(raw)
+            if not match:
+                return False
+            try:
+                resolve_tag(match.group(1), supported_models, default_model)
+                return True
+            except ValueError:
+                return False
+    return False
+
+
+class ScriptRenderer:
+    def __init__(self, tts, workers: int = 2, pause: float = LINE_PAUSE):
+        self.tts = tts
+        self.workers = max(1, workers)
+        self.pause = pause
+
+    def render(self, lines: List[ScriptLine], sample_rate: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """Synthesize all lines and return (audio, sample_rate) in script order"""
+        if not lines:
+            raise ValueError("Empty script")
+
+        groups: Dict[Tuple[str, str], List[ScriptLine]] = OrderedDict()
+        for line in sorted(lines, key=lambda l: (l.model, l.index)):
+            groups.setdefault((line.model, line.speaker), []).append(line)
+
+        models = list(OrderedDict.fromkeys(model for model, _ in groups))
+        sample_rate = sample_rate or min(self.tts.supported_models[m]["default_rate"] for m in models)
+        for model in models:
+            if sample_rate not in self.tts.supported_models[model]["sample_rates"]:
+                raise ValueError(f"Sample rate {sample_rate} not supported by {model}")
+            if model not in self.tts.models and not self.tts.load_model(model, activate=False):
+                raise ValueError(f"Model {model} could not be loaded")
+
+        rendered: Dict[int, np.ndarray] = {}
+        with tracer.span("script.render", lines=len(lines), groups=len(groups)):
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(groups)),
+                                    thread_name_prefix="script") as pool:
+                futures = [pool.submit(self._render_group, model, speaker, group, sample_rate)
+                           for (model, speaker), group in groups.items()]
+                for future in futures:
+                    rendered.update(future.result())
+
+        pauses = {line.index: self.pause if line.pause is None else line.pause for line in lines}
+        parts = []
+        for index in range(len(lines)):
+            if index and pauses[index] > 0:
+                parts.append(np.zeros(int(pauses[index] * sample_rate), dtype=np.float32))
+            parts.append(rendered[index])
+        return np.concatenate(parts), sample_rate
+
+    def _render_group(self, model: str, speaker: str, group: List[ScriptLine],
+                      sample_rate: int) -> Dict[int, np.ndarray]:
+        """Render one voice's lines; repeated lines are synthesized once"""
+        seen: Dict[str, np.ndarray] = {}
+        result = {}
+        for line in group:
+            key = normalize_chunk(line.text)
+            if key not in seen:
+                chunks = [
+                    np.asarray(self.tts.speak(chunk, speaker=speaker, sample_rate=sample_rate,
+                                              model_name=model), dtype=np.float32).reshape(-1)
+                    for chunk in split_sentences(line.text)
+                ]
+                seen[key] = np.concatenate(chunks)
+            result[line.index] = seen[key]
+        logger.debug(f"Rendered {len(group)} lines for {model}:{speaker}")
+        return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import soundfile as sf
+    from tts_engine import SileroTTS
+
+    parser = argparse.ArgumentParser(description="Render a speaker-tagged script to one audio file")
+    parser.add_argument("input", help="Script file with [speaker] or [model:speaker] line tags")
+    parser.add_argument("-o", "--output", required=True, help="Output audio file")
+    parser.add_argument("--model", default="v3_en", help="Model for speaker-only and untagged lines")
+    parser.add_argument("--speaker", default=None)
+    parser.add_argument("--sample-rate", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--models-dir", default=str(Path(__file__).parent / "models" / "tts"))
+    args = parser.parse_args(argv)
+
+    tts = SileroTTS(args.models_dir)
+    with open(args.input, 'r', encoding='utf-8-sig') as f:
+        try:
+            lines = parse_script(f.read(), tts.supported_models, args.model, args.speaker)
+        except ValueError as e:
+            print(f"Invalid script: {e}")
+            return 1
+
+    started = time.time()
+    try:
+        audio, sample_rate = ScriptRenderer(tts, workers=args.workers).render(lines, args.sample_rate)
+    except ValueError as e:
+        print(f"Rendering failed: {e}")
+        return 1
+    sf.write(args.output, audio, sample_rate)
+    print(f"Rendered {len(lines)} lines ({len(audio) / sample_rate:.1f}s of audio) "
+          f"in {time.time() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""Start-up time benchmark for the GUI.
+
+Measures two things in fresh interpreters:
+- the import-time profile of ``gui`` (``python -X importtime``)
+- the time from process start until the main window is first mapped
+
+The report lists the slowest imports and fails if a module that should be
+deferred (torch, matplotlib, sounddevice) is imported by ``import gui``, or
+if the first window takes longer than the budget.
+
+    python startup_benchmark.py --output startup.json
+    python startup_benchmark.py --compare old_startup.json startup.json
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).parent
+DEFERRED_MODULES = ("torch", "matplotlib", "sounddevice", "requests")
+WINDOW_BUDGET = 1.0   # seconds from process start to the first mapped window
+
+_FIRST_WINDOW = r"""
+import os, sys, time, json
+started = time.perf_counter()
+from gui import VoxiomTTSApp
+imported = time.perf_counter()
+app = VoxiomTTSApp()
+def mapped(event=None):
+    if event is not None and event.widget is not app:
+        return
+    print(json.dumps({"import_gui": imported - started,
+                      "first_window": time.perf_counter() - started}))
+    sys.stdout.flush()
+    os._exit(0)
+app.bind("<Map>", mapped, add="+")
+app.after(60000, lambda: os._exit(2))
+app.mainloop()
+"""
+
+
+def import_profile(module: str = "gui") -> Dict[str, dict]:
+    """Per-module import times in seconds, parsed from -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=str(ROOT), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "import failed")
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = {
+            "self": int(self_us) / 1e6,
+            "cumulative": int(cumulative_us) / 1e6,
+            "depth": (len(name) - len(name.lstrip())) // 2,
+        }
+    return modules
+
+
+def first_window_time(timeout: float = 90.0) -> Optional[dict]:
+    """Seconds until the main window maps, or None without a display"""
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return None
+    result = subprocess.run([sys.executable, "-c", _FIRST_WINDOW], cwd=str(ROOT),
+                            capture_output=True, text=True, timeout=timeout)
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"GUI did not start: {result.stderr.strip()[-500:]}")
+
+
+def run_benchmark(top: int = 15) -> dict:
+    modules = import_profile()
+    roots = {name: info for name, info in modules.items() if "." not in name}
+    slowest = sorted(roots.items(), key=lambda item: item[1]["cumulative"], reverse=True)[:top]
+    return {
+        "python": sys.version.split()[0],
+        "import_gui": modules.get("gui", {}).get("cumulative"),
+        "eager_heavy_imports": [m for m in DEFERRED_MODULES if m in modules],
+        "slowest_imports": [{"module": name, "seconds": round(info["cumulative"], 4)}
+                            for name, info in slowest],
+        "window": first_window_time(),
+    }
+
+
+def check_report(report: dict, budget: float = WINDOW_BUDGET) -> List[str]:
+    problems = [f"{name} is imported at start-up" for name in report["eager_heavy_imports"]]
+    window = report.get("window")
+    if window and window["first_window"] > budget:
+        problems.append(f"first window after {window['first_window']:.2f}s (budget {budget:.2f}s)")
+    return problems
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float = 0.20) -> List[str]:
+    regressions = []
+    for label, old, new in (
+        ("import gui", baseline.get("import_gui"), current.get("import_gui")),
+        ("first window", (baseline.get("window") or {}).get("first_window"),
+         (current.get("window") or {}).get("first_window")),
+    ):
+        if old and new and new > old * (1 + threshold):
+            regressions.append(f"{label}: {old:.3f}s -> {new:.3f}s (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure GUI start-up time")
+    parser.add_argument("--output", default="startup_output.json")
+    parser.add_argument("--budget", type=float, default=WINDOW_BUDGET,
+                        help="Maximum seconds until the first window")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Compare two reports instead of running")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="Relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.compare[1], 'r', encoding='utf-8') as f:
+            current = json.load(f)
+        regressions = compare_reports(baseline, current, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if not regressions:
+            print("No start-up regressions")
+        return 1 if regressions else 0
+
+    report = run_benchmark(args.top)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"import gui: {report['import_gui']:.3f}s")
+    for entry in report["slowest_imports"]:
+        print(f"  {entry['seconds']:8.3f}s  {entry['module']}")
+    if report["window"]:
+        print(f"first window: {report['window']['first_window']:.3f}s")
+    else:
+        print("first window: skipped (no display)")
+
+    problems = check_report(report, args.budget)
+    for problem in problems:
+        print(f"FAIL {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""Deduplicating synthesis planner.
+
+Scripts such as IVR menus and training material repeat the same sentences
+many times. The planner splits a job into sentence chunks, normalizes and
+hashes each (sentence, speaker) pair, synthesizes every unique pair once and
+assembles the output by reference.
+
+The planner also keeps the per-sentence audio of its last render (the
+"take"). When the text is edited and rendered again, only the sentences
+that are not in the previous take are synthesized. ``render_incremental``
+also reports which sample range of the new audio differs from the old.
+
+Rendering runs as a staged pipeline (see ``pipeline.py``): preprocess,
+inference, DSP, sink and visualize. The model works on the next sentence
+while the previous one is being trimmed and assembled.
+
+    planner = SynthesisPlanner(tts)
+    plan = planner.plan(text, speaker="en_12")
+    audio = planner.render(plan, sample_rate=48000)
+    print(plan.describe())   # "14 chunks, 5 unique, 9 model calls saved"
+
+    plan = planner.plan(edited_text, speaker="en_12")
+    audio, changed = planner.render_incremental(plan, sample_rate=48000)
+"""
+import re
+import difflib
+import hashlib
+import unicodedata
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+import metrics
+from pipeline import Pipeline, Stage
+from text_utils import split_sentences
+from tracing import get_logger, tracer
+
+logger = get_logger("planner")
+
+SENTENCE_PAUSE = 0.25     # seconds of silence between assembled chunks
+TRIM_THRESHOLD = 1e-3     # amplitude below which leading/trailing samples count as silence
+TRIM_KEEP = 0.04          # seconds of silence kept around the trimmed speech
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_chunk(text: str) -> str:
+    """Canonical form of a chunk: NFC, single spaces, no surrounding whitespace"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int, threshold: float = TRIM_THRESHOLD,
+                 keep: float = TRIM_KEEP) -> np.ndarray:
+    """Cut leading and trailing silence so the sentence pause alone sets the spacing"""
+    loud = np.flatnonzero(np.abs(audio) > threshold)
+    if not loud.size:
+        return audio
+    margin = int(keep * sample_rate)
+    return audio[max(0, loud[0] - margin):loud[-1] + margin + 1]
+
+
+def chunk_key(text: str, speaker: Optional[str]) -> str:
+    digest = hashlib.sha1()
+    digest.update((speaker or '').encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class SynthesisPlan:
+    """Ordered chunk references plus the unique (text, speaker) pairs behind them"""
+
+    def __init__(self):
+        self.unique: Dict[str, Tuple[str, Optional[str]]] = {}   # key -> (text, speaker)
+        self.sequence: List[str] = []                            # keys in playback order
+
+    def add(self, text: str, speaker: Optional[str] = None):
+        text = normalize_chunk(text)
+        if not text:
+            return
+        key = chunk_key(text, speaker)
+        if key not in self.unique:
+            self.unique[key] = (text, speaker)
+        self.sequence.append(key)
+
+    @property
+    def total_chunks(self) -> int:
+        return len(self.sequence)
+
+    @property
+    def unique_chunks(self) -> int:
+        return len(self.unique)
+
+    @property
+    def saved_calls(self) -> int:
+        return self.total_chunks - self.unique_chunks
+
+    def describe(self) -> str:
+        return (f"{self.total_chunks} chunks, {self.unique_chunks} unique, "
+                f"{self.saved_calls} model calls saved")
+
+
+class Take:
+    """Per-sentence audio of one render, kept so the next render can reuse it"""
+
+    def __init__(self, model_name: str, sample_rate: int, normalized: bool,
+                 sequence: List[str], clips: Dict[str, np.ndarray], length: int):
+        self.model_name = model_name
+        self.sample_rate = sample_rate
+        self.normalized = normalized
+        self.sequence = sequence    # chunk keys in playback order
+        self.clips = clips          # key -> audio
+        self.length = length        # samples in the assembled audio
+
+    def matches(self, model_name: str, sample_rate: int, normalized: bool) -> bool:
+        return (self.model_name, self.sample_rate, self.normalized) == (model_name, sample_rate, normalized)
+
+
+Segments = Union[str, Iterable[Tuple[Optional[str], str]]]
+
+
+class SynthesisPlanner:
+    def __init__(self, tts, pause: float = SENTENCE_PAUSE):
+        self.tts = tts
+        self.pause = pause
+        self.last_take: Optional[Take] = None
+        self.last_pipeline: Optional[Pipeline] = None
+
+    def plan(self, segments: Segments, speaker: Optional[str] = None) -> SynthesisPlan:
+        """Build a plan from plain text or from (speaker, text) segments"""
+        if isinstance(segments, str):
+            segments = [(speaker, segments)]
+        plan = SynthesisPlan()
+        with tracer.span("planner.plan"):
+            for segment_speaker, text in segments:
+                for chunk in split_sentences(text):
+                    plan.add(chunk, segment_speaker or speaker)
+        return plan
+
+    def render(self, plan: SynthesisPlan, sample_rate: Optional[int] = None,
+               model_name: Optional[str] = None) -> np.ndarray:
+        """Synthesize each unique chunk once and assemble the plan's audio"""
+        return self.render_incremental(plan, sample_rate, model_name)[0]
+
+    def render_incremental(self, plan: SynthesisPlan, sample_rate: Optional[int] = None,
+                           model_name: Optional[str] = None,
+                           progress: Optional[Callable[[int, int], None]] = None
+                           ) -> Tuple[np.ndarray, Optional[Tuple[int, int]]]:
+        """Render a plan, reusing the previous take for sentences that did not change.
+
+        Returns the audio and the (start, end) sample range that differs from
+        the previous take. The range is None if there was no comparable take.
+        `progress(done, total)` is called from the pipeline's visualize stage.
+        """
+        if not plan.sequence:
+            raise ValueError("Empty text input")
+        model_name = model_name or self.tts.current_model
+        sample_rate = sample_rate or self.tts.get_model_info(model_name)["default_rate"]
+        normalized = getattr(self.tts, "text_normalization", True)
+        previous = self.last_take
+        if previous is not None and not previous.matches(model_name, sample_rate, normalized):
+            previous = None
+        reusable = previous.clips if previous is not None else {}
+
+        rendered: Dict[str, np.ndarray] = {}
+        requested = set()
+        gap = np.zeros(int(self.pause * sample_rate), dtype=np.float32)
+        parts = []
+        offsets = []
+        position = 0
+        total = plan.total_chunks
+
+        def preprocess(index: int):
+            # Resolve each sentence to a clip we already have or to a synthesis job
+            key = plan.sequence[index]
+            job = None
+            if key not in reusable and key not in requested:
+                job = plan.unique[key]
+            requested.add(key)
+            return index, key, job
+
+        def inference(item):
+            index, key, job = item
+            audio = None
+            if job is not None:
+                text, speaker = job
+                audio = self.tts.speak(text, speaker=speaker, sample_rate=sample_rate,
+                                       model_name=model_name)
+            return index, key, audio
+
+        def dsp(item):
+            index, key, audio = item
+            if audio is not None:
+                rendered[key] = trim_silence(np.asarray(audio, dtype=np.float32).reshape(-1), sample_rate)
+            elif key not in rendered:
+                rendered[key] = reusable[key]
+            return index, key
+
+        def sink(item):
+            nonlocal position
+            index, key = item
+            if index and gap.size:
+                parts.append(gap)
+                position += gap.size
+            offsets.append(position)
+            parts.append(rendered[key])
+            position += rendered[key].size
+            return index
+
+        def visualize(index: int):
+            if progress is not None:
+                progress(index + 1, total)
+            return index
+
+        pipeline = Pipeline([Stage("preprocess", preprocess), Stage("inference", inference),
+                             Stage("dsp", dsp), Stage("sink", sink), Stage("visualize", visualize)],
+                            name="planner")
+        with tracer.span("planner.render", chunks=plan.total_chunks, unique=plan.unique_chunks):
+            pipeline.run(range(total))
+        self.last_pipeline = pipeline
+
+        synthesized = sum(1 for key in rendered if key not in reusable)
+        metrics.record_plan(plan.total_chunks, synthesized)
+        logger.debug(f"{plan.describe()}, {plan.unique_chunks - synthesized} reused from the last take; "
+                     f"{pipeline.report()}")
+        audio = np.concatenate(parts)
+
+        changed = None
+        if previous is not None:
+            changed = self._changed_range(previous, plan.sequence, offsets, rendered, audio.size)
+        self.last_take = Take(model_name, sample_rate, normalized, list(plan.sequence), rendered, audio.size)
+        return audio, changed
+
+    @staticmethod
+    def _changed_range(previous: Take, sequence: List[str], offsets: List[int],
+                       rendered: Dict[str, np.ndarray], length: int) -> Tuple[int, int]:
+        """Sample range of the new audio covering every sentence-level edit"""
+        edits = [op for op in difflib.SequenceMatcher(None, previous.sequence, sequence,
+                                                      autojunk=False).get_opcodes() if op[0] != 'equal']
+        if not edits:
+            return (0, 0) if length == previous.length else (0, length)
+        first, last = edits[0][3], edits[-1][4]
+        start = offsets[first] if first < len(offsets) else length
+        if length != previous.length:
+            # Everything after the edit moved
+            return start, length
+        end = offsets[last - 1] + rendered[sequence[last - 1]].size if last > first else start
+        return start, end
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+import numpy as np
+import pytest
+from async_engine import AsyncSileroTTS
+
+
+class FakeTTS:
+    current_model = "v3_en"
+    supported_models = {"v3_en": {}}
+    models = {"v3_en": object()}
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def supports_ssml(self, model_name=None):
+        return False
+
+    def speak(self, text, speaker=None, ssml=False, sample_rate=None, model_name=None):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return np.full(len(text), 0.1, dtype=np.float32)
+
+
+def test_stream_yields_each_sentence_in_order():
+    async def main():
+        async with AsyncSileroTTS(FakeTTS()) as tts:
+            return [len(chunk) async for chunk in tts.speak_stream("One. Two words. Three is last.")]
+    assert asyncio.run(main()) == [len("One."), len("Two words."), len("Three is last.")]
+
+
+def test_calls_are_bounded_by_the_worker_pool():
+    fake = FakeTTS(delay=0.02)
+
+    async def main():
+        async with AsyncSileroTTS(fake, max_workers=2, max_pending=4) as tts:
+            results = await asyncio.gather(*(tts.speak(f"Call {i}.") for i in range(10)))
+            assert tts.pending == 0
+            return results
+    assert len(asyncio.run(main())) == 10
+    assert fake.peak == 2
+
+
+def test_timed_out_call_keeps_its_slot_until_the_model_returns():
+    async def main():
+        async with AsyncSileroTTS(FakeTTS(delay=0.2), max_workers=1, max_pending=1) as tts:
+            with pytest.raises(TimeoutError):
+                await tts.speak("Slow.", timeout=0.01)
+            assert tts.pending == 1
+            await tts.speak("Next.")
+            assert tts.pending == 0
+    asyncio.run(main())
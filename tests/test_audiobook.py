@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import threading
+import numpy as np
+import pytest
+
+sf = pytest.importorskip("soundfile")
+from audiobook import SENTENCE_PAUSE, AudiobookRenderer
+
+RATE = 8000
+SENTENCES = [f"Sentence number {i} of the chapter." for i in range(40)]
+TEXT = " ".join(SENTENCES)
+
+
+class FakeTTS:
+    current_model = "v3_en"
+    supported_models = {"v3_en": {"speakers": ["en_0"], "default_rate": RATE}}
+
+    def __init__(self, stop_after=None, stop_event=None):
+        self.calls = 0
+        self.stop_after = stop_after
+        self.stop_event = stop_event
+
+    def speak(self, text, speaker=None, sample_rate=None, model_name=None):
+        self.calls += 1
+        if self.calls == self.stop_after:
+            self.stop_event.set()
+        return np.full(len(text) * 10, 0.5, dtype=np.float32)
+
+
+def expected_frames():
+    pause = int(SENTENCE_PAUSE * RATE)
+    return sum(len(sentence) * 10 + pause for sentence in SENTENCES)
+
+
+def interrupted_render(tmp_path):
+    stop = threading.Event()
+    renderer = AudiobookRenderer(FakeTTS(stop_after=2, stop_event=stop), str(tmp_path), stop_event=stop)
+    manifest = renderer.render_text(TEXT)
+    entry = manifest["chapters"][0]
+    assert not entry["done"] and entry["pcm_bytes"] > 0
+    return tmp_path / f"{entry['file']}.pcm.part", entry
+
+
+def resume(tmp_path):
+    tts = FakeTTS()
+    manifest = AudiobookRenderer(tts, str(tmp_path)).render_text(TEXT)
+    entry = manifest["chapters"][0]
+    assert entry["done"]
+    audio, _ = sf.read(str(tmp_path / entry["file"]), dtype="int16")
+    return tts, audio
+
+
+def test_resume_continues_after_the_checkpoint(tmp_path):
+    interrupted_render(tmp_path)
+    tts, audio = resume(tmp_path)
+    assert tts.calls < len(SENTENCES)
+    assert len(audio) == expected_frames()
+
+
+@pytest.mark.parametrize("damage", ["missing", "short"])
+def test_damaged_part_is_rerendered_not_padded(tmp_path, damage):
+    part_path, entry = interrupted_render(tmp_path)
+    if damage == "missing":
+        part_path.unlink()
+    else:
+        with open(part_path, "r+b") as part:
+            part.truncate(entry["pcm_bytes"] // 2)
+    tts, audio = resume(tmp_path)
+    assert tts.calls == len(SENTENCES)
+    assert len(audio) == expected_frames()
+    assert np.count_nonzero(audio) == expected_frames() - len(SENTENCES) * int(SENTENCE_PAUSE * RATE)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import random
+import pytest
+from duration_estimator import DEFAULT_WEIGHTS, DurationEstimator, TextStats, text_features
+
+TRUE_WEIGHTS = (0.05, 0.25, 0.3)
+WORDS = ["alpha", "speech", "model", "sentence", "a", "voice", "2024", "7", "calibrated"]
+
+
+def sentence(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(3, 15))]
+    return ", ".join(" ".join(words[i:i + 4]) for i in range(0, len(words), 4)) + "."
+
+
+def true_seconds(text):
+    return sum(w * x for w, x in zip(TRUE_WEIGHTS, text_features(text)))
+
+
+def test_uncalibrated_estimate_uses_defaults():
+    estimator = DurationEstimator()
+    assert estimator.weights() == DEFAULT_WEIGHTS
+    assert estimator.estimate("Hi, 42.") == pytest.approx(2 * 0.065 + 2 * 0.3 + 2 * 0.375)
+
+
+def test_observations_calibrate_the_voice():
+    rng = random.Random(1)
+    estimator = DurationEstimator()
+    for _ in range(300):
+        text = sentence(rng)
+        estimator.observe("v3_en", "en_0", text, true_seconds(text))
+    text = "A longer paragraph, with 12 words, some pauses; and numbers 365."
+    assert estimator.estimate(text, "v3_en", "en_0") == pytest.approx(true_seconds(text), rel=0.05)
+
+
+def test_new_speaker_falls_back_to_its_model():
+    rng = random.Random(2)
+    estimator = DurationEstimator()
+    for _ in range(200):
+        text = sentence(rng)
+        estimator.observe("v3_en", "en_0", text, true_seconds(text))
+    assert estimator.samples("v3_en", "en_5") == 0
+    assert estimator.weights("v3_en", "en_5") == estimator.weights("v3_en")
+
+
+def test_stats_survive_a_restart(tmp_path):
+    path = str(tmp_path / "duration_stats.json")
+    rng = random.Random(3)
+    estimator = DurationEstimator(path)
+    for _ in range(50):
+        text = sentence(rng)
+        estimator.observe("v3_en", "en_0", text, true_seconds(text))
+    estimator.save()
+    reloaded = DurationEstimator(path)
+    assert reloaded.samples("v3_en", "en_0") == 50
+    assert reloaded.weights("v3_en", "en_0") == pytest.approx(estimator.weights("v3_en", "en_0"))
+
+
+def test_text_stats_track_edits():
+    stats = TextStats("Hello, world 2024.")
+    stats.insert(" More text, 7!")
+    stats.delete("world")
+    assert stats.features == text_features("Hello,  2024. More text, 7!")
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import threading
+import pytest
+from engine_process import CallTimeout, EngineProcess
+
+
+class FakeProcess:
+    def __init__(self):
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+
+    def is_alive(self):
+        return not self.killed
+
+
+class FakeConn:
+    def __init__(self, on_send=None):
+        self.sent = []
+        self.on_send = on_send
+
+    def send(self, message):
+        self.sent.append(message)
+        if self.on_send:
+            self.on_send()
+
+
+def test_timeout_kills_only_the_process_the_request_went_to(monkeypatch):
+    monkeypatch.setattr(EngineProcess, "_start", lambda self: None)
+    engine = EngineProcess("unused", timeout=0.05)
+    hung, replacement = FakeProcess(), FakeProcess()
+
+    def restart_while_waiting():
+        # The supervisor swaps in the next generation before the caller gives up
+        threading.Timer(0.01, setattr, (engine, "_process", replacement)).start()
+
+    engine._conn, engine._process = FakeConn(restart_while_waiting), hung
+    with pytest.raises(CallTimeout):
+        engine.call("speak", text="hi")
+    assert hung.killed
+    assert not replacement.killed
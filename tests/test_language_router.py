@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import pytest
+from language_router import LanguageRouter, RUN_PAUSE, SENTENCE_PAUSE, is_mixed, language_runs
+
+RU_SPEAKERS = ["aidar", "baya"]
+MODELS = {
+    "v3_en": {"language": "en", "speakers": ["en_0", "en_12"]},
+    "v3_1_ru": {"language": "ru", "speakers": RU_SPEAKERS},
+    "v4_ru": {"language": "ru", "speakers": RU_SPEAKERS},
+}
+
+
+class FakeTTS:
+    def __init__(self, current_model):
+        self.supported_models = MODELS
+        self.current_model = current_model
+        self.models = {current_model: object()}
+        self.loaded = []
+
+    def load_model(self, model_name, activate=True):
+        self.loaded.append(model_name)
+        self.models[model_name] = object()
+        return True
+
+
+def test_runs_split_per_sentence_and_script():
+    assert language_runs("Hi. Привет, world!") == [
+        ("en", "Hi.", True), ("ru", "Привет,", True), ("en", "world!", False)]
+
+
+def test_letterless_sentence_keeps_previous_language():
+    assert language_runs("Привет! (2024)") == [("ru", "Привет!", True), ("ru", "(2024)", True)]
+
+
+@pytest.mark.parametrize("text, language, expected", [
+    ("Hi. Привет.", None, True),
+    ("Hello there.", None, False),
+    ("Hello there.", "ru", True),
+    ("Привет 2024!", "ru", False),
+])
+def test_is_mixed(text, language, expected):
+    assert is_mixed(text, language) is expected
+
+
+def test_selected_model_serves_its_own_language():
+    tts = FakeTTS("v3_1_ru")
+    lines = LanguageRouter(tts).route("Релиз вышел. New release is out.", speaker="baya")
+    assert [(line.model, line.speaker) for line in lines] == [("v3_1_ru", "baya"), ("v3_en", "en_0")]
+    assert tts.loaded == ["v3_en"]
+
+
+def test_other_language_prefers_listed_model_and_pauses():
+    tts = FakeTTS("v3_en")
+    lines = LanguageRouter(tts, speakers={"ru": "aidar"}).route("Release: новая версия is out.")
+    assert [line.model for line in lines] == ["v3_en", "v4_ru", "v3_en"]
+    assert [line.speaker for line in lines] == ["en_0", "aidar", "en_0"]
+    assert [line.pause for line in lines] == [SENTENCE_PAUSE, RUN_PAUSE, RUN_PAUSE]
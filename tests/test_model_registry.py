@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import pytest
+import model_registry
+from model_registry import BUILTIN_MODELS, _merge
+
+pytest.importorskip("omegaconf")
+
+YML = """tts_models:
+  ru:
+    v4_ru:
+      latest:
+        package: https://models.silero.ai/models/tts/ru/v4_ru.pt
+        sample_rate: [8000, 24000, 48000]
+"""
+
+
+def test_compiled_cache_follows_the_builtin_table(tmp_path, monkeypatch):
+    (tmp_path / "models.yml").write_text(YML, encoding="utf-8")
+    compiled = model_registry._load_compiled(tmp_path / "models.yml")
+    assert compiled["v4_ru"]["label"] == "Russian (SSML)"
+
+    table = {name: dict(config) for name, config in BUILTIN_MODELS.items()}
+    table["v4_ru"]["label"] = "Russian v4"
+    monkeypatch.setattr(model_registry, "BUILTIN_MODELS", table)
+    assert model_registry._load_compiled(tmp_path / "models.yml")["v4_ru"]["label"] == "Russian v4"
+
+
+def test_same_url_keeps_the_builtin_checksum():
+    merged = _merge({"v4_ru": {"url": BUILTIN_MODELS["v4_ru"]["url"], "file": "v4_ru.pt"}})
+    assert merged["v4_ru"]["sha256"] == BUILTIN_MODELS["v4_ru"]["sha256"]
+
+
+def test_url_override_uses_its_own_checksum_or_none():
+    url = "https://example.com/v4_ru.pt"
+    assert "sha256" not in _merge({"v4_ru": {"url": url}})["v4_ru"]
+    assert _merge({"v4_ru": {"url": url, "sha256": "AB12"}})["v4_ru"]["sha256"] == "ab12"
+
+
+def test_random_speaker_is_accepted_but_not_listed(tmp_path):
+    from backends import StubBackend
+    from tts_engine import SileroTTS
+    tts = SileroTTS(str(tmp_path), backend=StubBackend())
+    assert "random" in tts.supported_models["v4_ru"]["speakers"]
+    assert "random" not in tts.get_voices("v4_ru")
+    assert tts.get_voices("v4_ru")[0] == "aidar"
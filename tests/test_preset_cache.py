@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import time
+import threading
+import numpy as np
+import pytest
+
+pytest.importorskip("soundfile")
+from preset_cache import PresetAudioCache
+
+SPEAKERS = ["en_0", "en_1", "en_2"]
+
+
+class FakeTTS:
+    current_model = "v3_en"
+    supported_models = {"v3_en": {"language": "en", "speakers": SPEAKERS}}
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def model_hash(self, model_name, compute=True):
+        return "0" * 64
+
+    def get_voices(self, model_name=None):
+        return SPEAKERS
+
+    def supports_ssml(self, model_name=None):
+        return False
+
+    def speak(self, text, speaker=None, ssml=False, sample_rate=None, model_name=None):
+        with self.lock:
+            self.calls.append((text, speaker))
+        return np.full(240, 0.1, dtype=np.float32)
+
+
+def presets(count):
+    return {"General": {f"p{i}": {"text": f"Preset number {i}.", "timestamp": "t"} for i in range(count)}}
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "background render did not finish"
+        time.sleep(0.01)
+
+
+def cached(cache, speaker, store):
+    return [name for name in store["General"]
+            if cache.lookup("v3_en", "General", name, speaker, 24000) is not None]
+
+
+def test_renders_only_the_selected_speaker(tmp_path):
+    tts, store = FakeTTS(), presets(4)
+    cache = PresetAudioCache(tts, str(tmp_path), lambda: store, idle_poll=0.01)
+    cache.schedule("v3_en", "en_1", 24000)
+    wait_for(lambda: len(cached(cache, "en_1", store)) == 4)
+    cache.stop()
+    assert {speaker for _, speaker in tts.calls} == {"en_1"}
+    assert len(tts.calls) == 4
+
+
+def test_unknown_speaker_falls_back_to_first_voice(tmp_path):
+    tts, store = FakeTTS(), presets(2)
+    cache = PresetAudioCache(tts, str(tmp_path), lambda: store, idle_poll=0.01)
+    cache.schedule("v3_en", "random", 24000)
+    wait_for(lambda: len(cached(cache, "en_0", store)) == 2)
+    cache.stop()
+
+
+def test_size_cap_evicts_other_voices_first(tmp_path):
+    tts, store = FakeTTS(), presets(3)
+    cache = PresetAudioCache(tts, str(tmp_path), lambda: store, idle_poll=0.01, max_clips=4)
+    cache.schedule("v3_en", "en_0", 24000)
+    wait_for(lambda: len(cached(cache, "en_0", store)) == 3)
+    cache.schedule("v3_en", "en_1", 24000)
+    wait_for(lambda: len(cached(cache, "en_1", store)) == 3)
+    cache.stop()
+    assert len(list(tmp_path.rglob("*.flac"))) <= 4
+    assert len(cached(cache, "en_0", store)) <= 1
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import random
+import statistics
+import time
+import pytest
+import preset_search
+from preset_search import PresetSearchIndex, tokenize
+
+
+def preset(text):
+    return {"text": text, "ssml": False}
+
+
+def brute_force(index, query, category=None, limit=50):
+    """Reference ranking: score every document, then sort"""
+    scores = None
+    for term in tokenize(query):
+        term_scores = {}
+        for token, quality in index._matching_tokens(term).items():
+            for postings in index._category_postings(token, category):
+                for doc_id, weight in postings.items():
+                    term_scores[doc_id] = max(term_scores.get(doc_id, 0.0), weight * quality)
+        scores = term_scores if scores is None else {
+            doc_id: scores[doc_id] + score for doc_id, score in term_scores.items() if doc_id in scores}
+    docs = index._docs
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], docs[item[0]][2]))[:limit]
+    return [(docs[doc_id][0], docs[doc_id][1]) for doc_id, _ in ranked]
+
+
+@pytest.fixture
+def small_index():
+    return PresetSearchIndex({
+        "greetings": {"Hello": preset("Welcome to the show"), "Welcome": preset("Hello there")},
+        "ivr": {"Menu": preset("Press one for sales"), "preset_12": preset("Press two"),
+                "preset_120": preset("Goodbye")},
+    })
+
+
+def test_tokens_split_at_underscores_and_digits():
+    assert tokenize("preset_12 v3en З+емля") == ["preset", "12", "v", "3", "en", "земля"]
+
+
+def test_name_hits_rank_above_text_hits(small_index):
+    assert small_index.search("hello")[:2] == [("greetings", "Hello"), ("greetings", "Welcome")]
+
+
+def test_exact_word_ranks_above_prefix(small_index):
+    small_index.add("ivr", "Pressure", preset("Gauge"))
+    small_index.add("ivr", "Press", preset("Gauge"))
+    assert small_index.search("press")[:2] == [("ivr", "Press"), ("ivr", "Pressure")]
+
+
+def test_category_filter_and_numbered_names(small_index):
+    assert small_index.search("preset_12", category="ivr") == [("ivr", "preset_12"), ("ivr", "preset_120")]
+    assert small_index.search("hello", category="ivr") == []
+
+
+def test_updates_are_searchable(small_index):
+    small_index.add("ivr", "Farewell", preset("Goodbye and thanks"))
+    assert ("ivr", "Farewell") in small_index.search("thanks")
+    small_index.on_preset_changed("deleted", "ivr", "Farewell", None)
+    assert small_index.search("thanks") == []
+
+
+@pytest.fixture(scope="module")
+def large_index():
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8)))
+             for _ in range(3000)]
+    common = "the of and press prepare present preset prefix preview pretty".split()
+    presets = {}
+    for c in range(10):
+        entries = presets[f"cat{c}"] = {}
+        for i in range(2000):
+            name = f"preset_{c * 2000 + i}" if i % 2 else f"{rng.choice(words)} {rng.choice(common)}"
+            entries[name] = preset(" ".join(rng.choice(common if rng.random() < 0.4 else words)
+                                            for _ in range(15)))
+    return PresetSearchIndex(presets)
+
+
+@pytest.mark.parametrize("query", ["pre", "preset", "preset_1", "th", "the", "press the"])
+@pytest.mark.parametrize("category", [None, "cat3"])
+def test_ranking_matches_full_scoring(large_index, query, category):
+    assert large_index.search(query, category) == brute_force(large_index, query, category)
+
+
+def test_ranking_stays_exact_after_edits(large_index):
+    large_index.search("pre")
+    large_index.add("cat3", "Pre-roll", preset("prepare the preset"))
+    assert large_index.search("pre", "cat3") == brute_force(large_index, "pre", "cat3")
+    large_index.remove("cat3", "Pre-roll")
+    assert large_index.search("pre") == brute_force(large_index, "pre")
+
+
+@pytest.mark.parametrize("query", ["p", "pr", "pre", "preset", "preset_1", "the"])
+def test_typing_latency(large_index, query):
+    large_index.search(query, "cat3")
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        large_index.search(query, "cat3")
+        large_index.search(query)
+        timings.append(time.perf_counter() - started)
+    assert statistics.median(timings) < 0.005
+
+
+def test_prefix_expansion_is_capped(large_index):
+    assert len(large_index._matching_tokens("p")) <= 1
+    assert len(large_index._matching_tokens("1")) <= preset_search.MAX_EXPANSIONS + 1
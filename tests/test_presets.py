@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import threading
+from presets import PresetStore, memory_store
+
+
+def store_with(count):
+    return memory_store({"General": {f"p{i}": {"text": f"Preset {i}."} for i in range(count)}})
+
+
+def test_memory_store_is_a_full_store():
+    store = memory_store({"Error": {"default": "Presets failed to load"}, "Empty": {}})
+    assert isinstance(store, PresetStore)
+    assert store.categories() == ["Error", "Empty"]
+    assert store.get_preset("Error", "default") == "Presets failed to load"
+    events = []
+    store.subscribe(lambda *event: events.append(event[:3]))
+    store.save("Empty", "new", {"text": "Hi."})
+    assert events == [("saved", "Empty", "new")]
+
+
+def test_category_mapping_is_a_snapshot():
+    store = store_with(3)
+    before = store["General"]
+    store.save("General", "p3", {"text": "Preset 3."})
+    store.delete("General", "p0")
+    assert list(before) == ["p0", "p1", "p2"]
+    assert list(store["General"]) == ["p1", "p2", "p3"]
+
+
+def test_iterating_while_another_thread_saves():
+    store = store_with(200)
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            store.save("General", f"w{i}", {"text": "x"})
+            store.save(f"Extra{i % 5}", "x", {"text": "x"})
+            store.delete(f"Extra{(i + 2) % 5}", "x")
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(200):
+            for category, entries in store.items():
+                for name, preset in entries.items():
+                    pass
+            store.names("General")
+    except RuntimeError as e:
+        errors.append(e)
+    finally:
+        stop.set()
+        thread.join()
+    assert not errors
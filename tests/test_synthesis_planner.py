@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from synthesis_planner import SynthesisPlanner
+
+SAMPLE_RATE = 8000
+
+
+class FakeTTS:
+    """Renders one sample per character, so clip lengths identify the text"""
+
+    current_model = "v3_en"
+    text_normalization = True
+
+    def __init__(self):
+        self.calls = []
+
+    def get_model_info(self, model_name):
+        return {"default_rate": SAMPLE_RATE}
+
+    def speak(self, text, speaker=None, sample_rate=None, model_name=None):
+        self.calls.append(text)
+        return np.ones(len(text), dtype=np.float32)
+
+
+@pytest.mark.parametrize("text, chunks", [
+    ("Стоимость 5 тыс. руб. Спасибо.", ["Стоимость 5 тыс. руб.", "Спасибо."]),
+    ("Meet Dr. Smith. He is late.", ["Meet Dr. Smith.", "He is late."]),
+    ("Это т. е. Москва.", ["Это т. е. Москва."]),
+])
+def test_chunks_do_not_split_abbreviations(text, chunks):
+    plan = SynthesisPlanner(FakeTTS()).plan(text, speaker="en_0")
+    assert [plan.unique[key][0] for key in plan.sequence] == chunks
+
+
+def test_repeated_sentences_are_synthesized_once():
+    tts = FakeTTS()
+    planner = SynthesisPlanner(tts, pause=0.0)
+    plan = planner.plan("Press one. Press two. Press one.", speaker="en_0")
+    assert (plan.total_chunks, plan.unique_chunks, plan.saved_calls) == (3, 2, 1)
+    audio = planner.render(plan, SAMPLE_RATE)
+    assert sorted(tts.calls) == ["Press one.", "Press two."]
+    assert audio.size == len("Press one.") * 2 + len("Press two.")
+
+
+def test_edit_only_resynthesizes_changed_sentences():
+    tts = FakeTTS()
+    planner = SynthesisPlanner(tts, pause=0.0)
+    planner.render_incremental(planner.plan("First. Second. Third."), SAMPLE_RATE)
+    tts.calls.clear()
+    audio, changed = planner.render_incremental(planner.plan("First. Changed. Third."), SAMPLE_RATE)
+    assert tts.calls == ["Changed."]
+    start = len("First.")
+    assert changed == (start, audio.size)
+
+
+def test_empty_plan_is_rejected():
+    planner = SynthesisPlanner(FakeTTS())
+    with pytest.raises(ValueError):
+        planner.render(planner.plan("   "))
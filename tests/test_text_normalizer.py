@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import pytest
+from text_normalizer import normalize_ssml, normalize_text
+
+CASES = [
+    # English
+    ("en", "Meet Dr. Smith on 05/03/2024 at 9:30, $5.50 each.",
+     "Meet Doctor Smith on May third, twenty twenty-four at nine thirty, five dollars fifty cents each."),
+    ("en", "Mr. Jones vs. Mrs. Smith", "Mister Jones versus Missus Smith"),
+    ("en", "Version 1.2.3", "Version one point two point three"),
+    ("en", "Jan 5", "January fifth"),
+    ("en", "Mar. 3, 2021", "March third, twenty twenty-one"),
+    ("en", "The 1990s", "The nineteen nineties"),
+    ("en", "the '80s", "the eighties"),
+    ("en", "-5°C outside", "minus five degrees Celsius outside"),
+    ("en", "It was 1990.", "It was nineteen ninety."),
+    ("en", "No. 7 is 50%", "number seven is fifty percent"),
+    # Russian
+    ("ru", "Встреча 03.05.2024 в 14:30, билет 250 руб.",
+     "Встреча третье мая две тысячи двадцать четвёртого года в четырнадцать тридцать, "
+     "билет двести пятьдесят рублей."),
+    ("ru", "1 января 2020 года", "первое января две тысячи двадцатого года"),
+    ("ru", "1 января 2020", "первое января две тысячи двадцатого года"),
+    ("ru", "Он родился 12.12.1990 г.", "Он родился двенадцатое декабря тысяча девятьсот девяностого года."),
+    ("ru", "в 2020 году", "в две тысячи двадцатом году"),
+    ("ru", "См. рис. 3", "Смотри рисунок три"),
+    ("ru", "Длина 5 см.", "Длина пять сантиметров."),
+    ("ru", "Стоимость 5 тыс. руб.", "Стоимость пять тысяч рублей."),
+    ("ru", "21 яблоко", "двадцать одно яблоко"),
+    ("ru", "1 книга и 2 книги", "одна книга и две книги"),
+    ("ru", "1 дом, 2 или 3", "один дом, два или три"),
+    ("ru", "11 книг", "одиннадцать книг"),
+    ("ru", "-5°C", "минус пять градусов Цельсия"),
+    ("ru", "т. е. дома", "то есть дома"),
+]
+
+
+@pytest.mark.parametrize("language, text, expected", CASES)
+def test_normalize_text(language, text, expected):
+    assert normalize_text(text, language) == expected
+
+
+def test_unknown_language_is_left_alone():
+    assert normalize_text("5 €", "de") == "5 €"
+
+
+def test_ssml_markup_is_untouched():
+    assert normalize_ssml('<speak>Жди <break time="5s"/> 5 минут</speak>', "ru") == \
+        '<speak>Жди <break time="5s"/> пять минут</speak>'
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import pytest
+from text_utils import sentence_parts, split_sentences
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("One. Two! Three?", ["One.", "Two!", "Three?"]),
+    ("Meet Dr. Smith today. He is late.", ["Meet Dr. Smith today.", "He is late."]),
+    ("Mr. and Mrs. Smith vs. Jones e.g. Bob.", ["Mr. and Mrs. Smith vs. Jones e.g. Bob."]),
+    ("Стоимость 5 тыс. руб. Далее.", ["Стоимость 5 тыс. руб.", "Далее."]),
+    ("Это т. е. Москва. Да.", ["Это т. е. Москва.", "Да."]),
+    ("См. рис. 3. Готово.", ["См. рис. 3.", "Готово."]),
+    ("Hello. — Привет!", ["Hello.", "— Привет!"]),
+    ("Version 1.2. then lower case.", ["Version 1.2. then lower case."]),
+    ("Wait… What?", ["Wait…", "What?"]),
+])
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_split_sentences_joins_lines():
+    assert split_sentences("First line\ncontinues. Second.") == ["First line continues.", "Second."]
+
+
+def test_long_sentences_are_broken_up():
+    text = ", ".join(["word"] * 400) + "."
+    chunks = split_sentences(text, max_chars=100)
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks).replace(" ", "") == text.replace(" ", "")
+
+
+def test_sentence_parts_keep_separators():
+    text = "One.  Two. Dr. Who."
+    parts = sentence_parts(text)
+    assert "".join(parts) == text
+    assert parts[::2] == ["One.", "Two.", "Dr. Who."]
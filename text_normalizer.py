@@ -0,0 +1,582 @@
+# -*- coding: utf-8 -*-
+"""Rule-based text normalization for English and Russian.
+
+The Silero models read letters only. Digits are dropped or spelled out
+unpredictably. Currency signs, dates and abbreviations come out wrong. This
+stage expands them into words before synthesis:
+
+    normalize_text("Meet Dr. Smith on 05/03/2024 at 9:30, $5.50 each.", "en")
+    -> "Meet Doctor Smith on May third, twenty twenty-four at nine thirty,
+        five dollars fifty cents each."
+
+    normalize_text("Встреча 03.05.2024 в 14:30, билет 250 руб.", "ru")
+    -> "Встреча третье мая две тысячи двадцать четвёртого года в
+        четырнадцать тридцать, билет двести пятьдесят рублей"
+
+All patterns and word tables are compiled at import time. Results are
+memoized per sentence, so documents that repeat sentences skip the work,
+and sentences without digits or abbreviations take a fast path.
+"""
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+from text_utils import sentence_parts
+
+SENTENCE_CACHE_SIZE = 8192
+MAX_SPELLED_NUMBER = 10 ** 15    # longer digit runs are read digit by digit
+
+
+# ----- Shared helpers -----
+
+def _digits(number: str, words: List[str]) -> str:
+    return ' '.join(words[int(d)] for d in number if d.isdigit())
+
+
+def _keep_period(m) -> str:
+    """'.' if a match swallowed a full stop that also ends the sentence"""
+    if not m.group(0).endswith('.'):
+        return ""
+    rest = m.string[m.end():].lstrip()
+    return "." if not rest or rest[0].isupper() else ""
+
+
+def ru_plural(n: int, forms: Tuple[str, str, str]) -> str:
+    """Pick the Russian noun form for a count: (1 рубль, 2 рубля, 5 рублей)"""
+    n = abs(n) % 100
+    if 10 < n < 20:
+        return forms[2]
+    n %= 10
+    if n == 1:
+        return forms[0]
+    if 2 <= n <= 4:
+        return forms[1]
+    return forms[2]
+
+
+# ----- English -----
+
+_EN_ONES = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+            "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+            "seventeen", "eighteen", "nineteen"]
+_EN_TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+_EN_SCALES = [(10 ** 12, "trillion"), (10 ** 9, "billion"), (10 ** 6, "million"), (1000, "thousand")]
+_EN_ORDINAL_IRREGULAR = {"one": "first", "two": "second", "three": "third", "five": "fifth",
+                         "eight": "eighth", "nine": "ninth", "twelve": "twelfth"}
+_EN_MONTH_ABBREVIATIONS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8,
+                           "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12}
+_EN_MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+              "August", "September", "October", "November", "December"]
+_EN_CURRENCY = {"$": (("dollar", "dollars"), ("cent", "cents")),
+                "€": (("euro", "euros"), ("cent", "cents")),
+                "£": (("pound", "pounds"), ("penny", "pence"))}
+_EN_UNITS = {"km": ("kilometer", "kilometers"), "kg": ("kilogram", "kilograms"),
+             "cm": ("centimeter", "centimeters"), "mm": ("millimeter", "millimeters"),
+             "mph": ("mile per hour", "miles per hour"), "kph": ("kilometer per hour", "kilometers per hour"),
+             "min": ("minute", "minutes"), "hrs": ("hour", "hours"), "GB": ("gigabyte", "gigabytes"),
+             "MB": ("megabyte", "megabytes")}
+# Titles precede a name, so their period never ends the sentence
+_EN_TITLES = {"Dr.": "Doctor", "Mr.": "Mister", "Mrs.": "Missus", "Ms.": "Miz", "Prof.": "Professor",
+              "Jr.": "Junior", "Sr.": "Senior"}
+_EN_ABBREVIATIONS = {"etc.": "et cetera", "e.g.": "for example", "i.e.": "that is", "vs.": "versus",
+                     "approx.": "approximately", "a.m.": "A M", "p.m.": "P M"}
+# Abbreviations that never end a sentence; their period is not re-emitted
+_EN_NON_TERMINAL = set(_EN_TITLES) | {"vs.", "e.g.", "i.e.", "approx."}
+
+
+def en_cardinal(n: int) -> str:
+    if n < 20:
+        return _EN_ONES[n]
+    if n < 100:
+        tens, ones = divmod(n, 10)
+        return _EN_TENS[tens] + (f"-{_EN_ONES[ones]}" if ones else "")
+    if n < 1000:
+        hundreds, rest = divmod(n, 100)
+        return f"{_EN_ONES[hundreds]} hundred" + (f" {en_cardinal(rest)}" if rest else "")
+    for scale, name in _EN_SCALES:
+        if n >= scale:
+            high, rest = divmod(n, scale)
+            return f"{en_cardinal(high)} {name}" + (f" {en_cardinal(rest)}" if rest else "")
+    return str(n)
+
+
+def en_ordinal(n: int) -> str:
+    words = en_cardinal(n)
+    head, sep, last = words.rpartition(' ')
+    prefix, dash, part = last.rpartition('-')
+    if part in _EN_ORDINAL_IRREGULAR:
+        part = _EN_ORDINAL_IRREGULAR[part]
+    elif part.endswith('y'):
+        part = part[:-1] + "ieth"
+    else:
+        part += "th"
+    return f"{head}{sep}{prefix}{dash}{part}"
+
+
+def en_year(n: int) -> str:
+    if 1000 <= n < 10000 and not 2000 <= n < 2010:
+        high, low = divmod(n, 100)
+        if low == 0:
+            return f"{en_cardinal(high)} hundred"
+        return en_cardinal(high) + (f" oh {_EN_ONES[low]}" if low < 10 else f" {en_cardinal(low)}")
+    return en_cardinal(n)
+
+
+def _en_number(text: str) -> str:
+    integer, _, fraction = text.replace(',', '').partition('.')
+    if len(integer) > 1 and integer.startswith('0') or int(integer) >= MAX_SPELLED_NUMBER:
+        words = _digits(integer, _EN_ONES)
+    else:
+        words = en_cardinal(int(integer))
+    if fraction:
+        words += " point " + _digits(fraction, _EN_ONES)
+    return words
+
+
+def _en_count(text: str, forms: Tuple[str, str]) -> str:
+    return f"{_en_number(text)} {forms[0] if text == '1' else forms[1]}"
+
+
+def _en_date(month: int, day: int, year: str = None) -> str:
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    words = f"{_EN_MONTHS[month - 1]} {en_ordinal(day)}"
+    return words + (f", {en_year(int(year))}" if year else "")
+
+
+def _en_iso_date(m):
+    return _en_date(int(m.group(2)), int(m.group(3)), m.group(1)) or m.group(0)
+
+
+def _en_us_date(m):
+    return _en_date(int(m.group(1)), int(m.group(2)), m.group(3)) or m.group(0)
+
+
+def _en_time(m):
+    hours, minutes = int(m.group(1)), int(m.group(2))
+    if hours > 24 or minutes > 59:
+        return m.group(0)
+    if minutes == 0:
+        return f"{en_cardinal(hours)} o'clock"
+    return en_cardinal(hours) + (f" oh {_EN_ONES[minutes]}" if minutes < 10 else f" {en_cardinal(minutes)}")
+
+
+def _en_currency(m):
+    (major, minor) = _EN_CURRENCY[m.group(1)]
+    units = m.group(2).replace(',', '')
+    words = f"{_en_number(units)} {major[0] if units == '1' else major[1]}"
+    if m.group(3) and int(m.group(3)):
+        cents = int(m.group(3))
+        words += f" {en_cardinal(cents)} {minor[0] if cents == 1 else minor[1]}"
+    return words
+
+
+def _en_month_day(m):
+    name = m.group(1).lower()
+    month = _EN_MONTH_ABBREVIATIONS.get(name) or [n.lower() for n in _EN_MONTHS].index(name) + 1
+    return _en_date(month, int(m.group(2)), m.group(3)) or m.group(0)
+
+
+def _en_plural(words: str) -> str:
+    head, sep, last = words.rpartition(' ')
+    if last.endswith('y'):
+        last = last[:-1] + "ies"
+    elif last.endswith('x'):
+        last += "es"
+    else:
+        last += "s"
+    return head + sep + last
+
+
+def _en_decade(m):
+    """1990s -> nineteen nineties, '80s -> eighties"""
+    number = int(m.group(1))
+    return _en_plural(en_year(number) if number >= 1000 else en_cardinal(number))
+
+
+def _en_temperature(m):
+    number = m.group(2).replace(',', '.')
+    words = _en_count(number, ("degree", "degrees"))
+    if m.group(1):
+        words = "minus " + words
+    scale = {"C": " Celsius", "F": " Fahrenheit"}.get((m.group(3) or "").upper().replace('С', 'C'), "")
+    return words + scale
+
+
+def _en_year_or_number(m):
+    number = m.group(0)
+    if len(number) == 4 and number[0] in '12' and number.isdigit():
+        return en_year(int(number))
+    return _en_number(number)
+
+
+# ----- Russian -----
+
+_RU_UNITS = {"m": ["ноль", "один", "два", "три", "четыре", "пять", "шесть", "семь", "восемь", "девять"],
+             "f": ["ноль", "одна", "две", "три", "четыре", "пять", "шесть", "семь", "восемь", "девять"],
+             "n": ["ноль", "одно", "два", "три", "четыре", "пять", "шесть", "семь", "восемь", "девять"]}
+_RU_TEENS = ["десять", "одиннадцать", "двенадцать", "тринадцать", "четырнадцать", "пятнадцать",
+             "шестнадцать", "семнадцать", "восемнадцать", "девятнадцать"]
+_RU_TENS = ["", "", "двадцать", "тридцать", "сорок", "пятьдесят", "шестьдесят", "семьдесят",
+            "восемьдесят", "девяносто"]
+_RU_HUNDREDS = ["", "сто", "двести", "триста", "четыреста", "пятьсот", "шестьсот", "семьсот",
+                "восемьсот", "девятьсот"]
+_RU_SCALES = [(10 ** 12, ("триллион", "триллиона", "триллионов"), "m"),
+              (10 ** 9, ("миллиард", "миллиарда", "миллиардов"), "m"),
+              (10 ** 6, ("миллион", "миллиона", "миллионов"), "m"),
+              (1000, ("тысяча", "тысячи", "тысяч"), "f")]
+
+_RU_ORD_UNITS = ["", "первый", "второй", "третий", "четвёртый", "пятый", "шестой", "седьмой",
+                 "восьмой", "девятый"]
+_RU_ORD_TEENS = ["десятый", "одиннадцатый", "двенадцатый", "тринадцатый", "четырнадцатый",
+                 "пятнадцатый", "шестнадцатый", "семнадцатый", "восемнадцатый", "девятнадцатый"]
+_RU_ORD_TENS = ["", "", "двадцатый", "тридцатый", "сороковой", "пятидесятый", "шестидесятый",
+                "семидесятый", "восьмидесятый", "девяностый"]
+_RU_ORD_HUNDREDS = ["", "сотый", "двухсотый", "трёхсотый", "четырёхсотый", "пятисотый",
+                    "шестисотый", "семисотый", "восьмисотый", "девятисотый"]
+_RU_THOUSANDS_PREFIX = ["", "", "двух", "трёх", "четырёх", "пяти", "шести", "семи", "восьми", "девяти"]
+# Ending replacements from the masculine nominative, by form
+_RU_ORD_ENDINGS = {"m": ("ий", "ый", "ой"), "n": ("ье", "ое", "ое"), "f": ("ья", "ая", "ая"),
+                   "gen": ("ьего", "ого", "ого"), "dat": ("ьему", "ому", "ому"),
+                   "prep": ("ьем", "ом", "ом")}
+
+_RU_MONTHS = ["января", "февраля", "марта", "апреля", "мая", "июня", "июля", "августа",
+              "сентября", "октября", "ноября", "декабря"]
+_RU_CURRENCY = {"₽": (("рубль", "рубля", "рублей"), "m", ("копейка", "копейки", "копеек"), "f"),
+                "руб": (("рубль", "рубля", "рублей"), "m", ("копейка", "копейки", "копеек"), "f"),
+                "р": (("рубль", "рубля", "рублей"), "m", ("копейка", "копейки", "копеек"), "f"),
+                "$": (("доллар", "доллара", "долларов"), "m", ("цент", "цента", "центов"), "m"),
+                "€": (("евро", "евро", "евро"), "n", ("цент", "цента", "центов"), "m")}
+_RU_UNITS_OF_MEASURE = {"км": (("километр", "километра", "километров"), "m"),
+                        "кг": (("килограмм", "килограмма", "килограммов"), "m"),
+                        "см": (("сантиметр", "сантиметра", "сантиметров"), "m"),
+                        "мм": (("миллиметр", "миллиметра", "миллиметров"), "m"),
+                        "ч": (("час", "часа", "часов"), "m"),
+                        "мин": (("минута", "минуты", "минут"), "f"),
+                        "сек": (("секунда", "секунды", "секунд"), "f"),
+                        "коп": (("копейка", "копейки", "копеек"), "f"),
+                        "тыс": (("тысяча", "тысячи", "тысяч"), "f"),
+                        "млн": (("миллион", "миллиона", "миллионов"), "m"),
+                        "млрд": (("миллиард", "миллиарда", "миллиардов"), "m"),
+                        "%": (("процент", "процента", "процентов"), "m")}
+_RU_ORDINAL_SUFFIX = {"й": "m", "ый": "m", "ой": "m", "ий": "m", "е": "n", "ое": "n",
+                      "я": "f", "ая": "f", "го": "gen", "ого": "gen"}
+_RU_ABBREVIATIONS = {"т.е.": "то есть", "т.д.": "так далее", "т.п.": "тому подобное", "т.к.": "так как",
+                     "и др.": "и другие", "ул.": "улица", "им.": "имени", "напр.": "например",
+                     "см.": "смотри", "стр.": "страница", "рис.": "рисунок"}
+_RU_NON_TERMINAL = {"ул.", "им.", "см.", "стр.", "напр.", "т.е.", "т.к.", "рис."}
+# "см." after a number is centimetres, left for the unit rule
+_RU_UNIT_ABBREVIATIONS = {"см."}
+_RU_MULTIPLIERS = {"тыс": (("тысяча", "тысячи", "тысяч"), "f"), "млн": (("миллион", "миллиона", "миллионов"), "m"),
+                   "млрд": (("миллиард", "миллиарда", "миллиардов"), "m")}
+_RU_DECIMAL_POINT = re.compile(r'(?<=\d),(?=\d)')
+# "год" after a year picks the ordinal's case; "к 2020 году" is dative, "в 2020 году" prepositional
+_RU_YEAR_WORD_FORMS = {"год": "m", "года": "gen", "году": "prep"}
+_RU_DATIVE_PREPOSITIONS = {"к", "ко", "по"}
+# Words after a number that are not the counted noun ("2 или 3")
+_RU_NOT_NOUNS = {"и", "или", "а", "но", "на", "до", "по", "за", "из", "от", "для", "при", "под", "над",
+                 "без", "же", "ли", "не", "ни", "то", "это", "года", "лет", "раза", "раз"}
+
+
+def ru_cardinal(n: int, gender: str = "m") -> str:
+    if n == 0:
+        return "ноль"
+    words = []
+    for scale, forms, scale_gender in _RU_SCALES:
+        if n >= scale:
+            high, n = divmod(n, scale)
+            # "тысяча", not "одна тысяча"; millions keep "один"
+            words += ([] if high == 1 and scale == 1000 else [ru_cardinal(high, scale_gender)])
+            words.append(ru_plural(high, forms))
+    hundreds, rest = divmod(n, 100)
+    if hundreds:
+        words.append(_RU_HUNDREDS[hundreds])
+    if 10 <= rest < 20:
+        words.append(_RU_TEENS[rest - 10])
+    else:
+        tens, ones = divmod(rest, 10)
+        if tens:
+            words.append(_RU_TENS[tens])
+        if ones:
+            words.append(_RU_UNITS[gender][ones])
+    return ' '.join(words)
+
+
+def _ru_inflect(word: str, form: str) -> str:
+    soft, hard, stressed = _RU_ORD_ENDINGS[form]
+    if word.endswith("ий"):
+        return word[:-2] + soft
+    return word[:-2] + (stressed if word.endswith("ой") else hard)
+
+
+def ru_ordinal(n: int, form: str = "m") -> str:
+    """Ordinal in masculine ("m"), neuter ("n"), feminine ("f") nominative or genitive ("gen")"""
+    if n == 0:
+        return _ru_inflect("нулевой", form)
+    if n % 1000 == 0 and n < 10000:
+        return _ru_inflect(_RU_THOUSANDS_PREFIX[n // 1000] + "тысячный", form)
+    rest = n % 1000
+    prefix = [ru_cardinal(n - rest)] if n - rest else []
+    if rest == 0:
+        # Compound forms for round numbers above 10 000 are rare enough to read as cardinals
+        return ru_cardinal(n)
+    if rest % 100 == 0:
+        last = _RU_ORD_HUNDREDS[rest // 100]
+    else:
+        if rest >= 100:
+            prefix.append(_RU_HUNDREDS[rest // 100])
+        tail = rest % 100
+        if tail < 10:
+            last = _RU_ORD_UNITS[tail]
+        elif tail < 20:
+            last = _RU_ORD_TEENS[tail - 10]
+        elif tail % 10 == 0:
+            last = _RU_ORD_TENS[tail // 10]
+        else:
+            prefix.append(_RU_TENS[tail // 10])
+            last = _RU_ORD_UNITS[tail % 10]
+    return ' '.join(prefix + [_ru_inflect(last, form)])
+
+
+def _ru_integer(text: str, gender: str = "m") -> Tuple[str, int]:
+    digits = re.sub(r'\D', '', text)
+    if len(digits) > 1 and digits.startswith('0') or int(digits) >= MAX_SPELLED_NUMBER:
+        return _digits(digits, _RU_UNITS["m"]), int(digits)
+    return ru_cardinal(int(digits), gender), int(digits)
+
+
+def _ru_number(text: str, gender: str = "m") -> Tuple[str, bool, int]:
+    """Spell a number; returns (words, is_fraction, integer value)"""
+    integer, _, fraction = _RU_DECIMAL_POINT.sub('.', text).partition('.')
+    if not fraction:
+        words, value = _ru_integer(integer, gender)
+        return words, False, value
+    whole, value = _ru_integer(integer, "f")
+    words = f"{whole} {'целая' if ru_plural(value, ('1', '2', '5')) == '1' else 'целых'}"
+    if len(fraction) <= 3:
+        part = int(fraction)
+        denominator = ("десят", "сот", "тысячн")[len(fraction) - 1]
+        ending = "ая" if ru_plural(part, ('1', '2', '5')) == '1' else "ых"
+        words += f" {ru_cardinal(part, 'f')} {denominator}{ending}"
+    else:
+        words += " " + _digits(fraction, _RU_UNITS["m"])
+    return words, True, value
+
+
+def _ru_count(number: str, forms: Tuple[str, str, str], gender: str) -> str:
+    words, is_fraction, value = _ru_number(number, gender)
+    return f"{words} {forms[1] if is_fraction else ru_plural(value, forms)}"
+
+
+def _ru_date(m):
+    day, month = int(m.group(1)), int(m.group(2))
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return m.group(0)
+    words = f"{ru_ordinal(day, 'n')} {_RU_MONTHS[month - 1]}"
+    if m.group(3):
+        words += f" {ru_ordinal(int(m.group(3)), 'gen')} года"
+    return words + _keep_period(m)
+
+
+def _ru_iso_date(m):
+    day, month = int(m.group(3)), int(m.group(2))
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return m.group(0)
+    return (f"{ru_ordinal(day, 'n')} {_RU_MONTHS[month - 1]} {ru_ordinal(int(m.group(1)), 'gen')} года"
+            + _keep_period(m))
+
+
+def _ru_time(m):
+    hours, minutes = int(m.group(1)), int(m.group(2))
+    if hours > 24 or minutes > 59:
+        return m.group(0)
+    words = ru_cardinal(hours)
+    if minutes:
+        words += (" ноль " if minutes < 10 else " ") + ru_cardinal(minutes, "f")
+    return words
+
+
+def _ru_currency_after(m):
+    major, major_gender, minor, minor_gender = _RU_CURRENCY[m.group(4).rstrip('.').lower()]
+    if m.group(3):
+        # "5 тыс. руб." -> "пять тысяч рублей"
+        forms, gender = _RU_MULTIPLIERS[m.group(3).rstrip('.')]
+        number = m.group(1) + (f",{m.group(2)}" if m.group(2) else "")
+        return f"{_ru_count(number, forms, gender)} {major[2]}{_keep_period(m)}"
+    words = _ru_count(m.group(1), major, major_gender)
+    if m.group(2) and int(m.group(2)):
+        words += " " + _ru_count(m.group(2), minor, minor_gender)
+    return words + _keep_period(m)
+
+
+def _ru_year_form(m, word_group: int) -> str:
+    word = (m.group(word_group) or "").lower()
+    if word == "году":
+        before = m.string[:m.start()].split()
+        return "dat" if before and before[-1].lower() in _RU_DATIVE_PREPOSITIONS else "prep"
+    return _RU_YEAR_WORD_FORMS.get(word, "gen")
+
+
+def _ru_day_month(m):
+    words = f"{ru_ordinal(int(m.group(1)), 'n')} {m.group(2)}"
+    if m.group(3):
+        # "1 января 2020 года": the year is a genitive ordinal, with or without "года"
+        words += f" {ru_ordinal(int(m.group(3)), 'gen')} года"
+    return words + _keep_period(m)
+
+
+def _ru_year(m):
+    form = _ru_year_form(m, 2)
+    return f"{ru_ordinal(int(m.group(1)), form)} {m.group(2)}"
+
+
+def _ru_noun_gender(noun: str, value: int) -> str:
+    """Gender a numeral must agree with, guessed from the noun's ending after it"""
+    noun = noun.lower()
+    if noun in _RU_NOT_NOUNS or 10 < value % 100 < 20:
+        return "m"
+    if value % 10 == 1:
+        # Nominative singular: "одна книга", "одно яблоко", "один дом"
+        return "f" if noun[-1] in "ая" else "n" if noun[-1] in "оеё" else "m"
+    if value % 10 == 2:
+        # Genitive singular: "две книги", but "два дома", "два яблока"
+        return "f" if noun[-1] in "ыи" else "m"
+    return "m"
+
+
+def _ru_counted(m):
+    digits = re.sub(r'\D', '', m.group(1))
+    return _ru_integer(m.group(1), _ru_noun_gender(m.group(2), int(digits)))[0]
+
+
+def _ru_temperature(m):
+    number = m.group(2)
+    words = _ru_count(number, ("градус", "градуса", "градусов"), "m")
+    if m.group(1):
+        words = "минус " + words
+    scale = {"C": " Цельсия", "F": " по Фаренгейту"}.get((m.group(3) or "").upper().replace('С', 'C'), "")
+    return words + scale
+
+
+def _ru_currency_before(m):
+    major, major_gender, minor, minor_gender = _RU_CURRENCY[m.group(1)]
+    words = _ru_count(m.group(2), major, major_gender)
+    if m.group(3) and int(m.group(3)):
+        words += " " + _ru_count(m.group(3), minor, minor_gender)
+    return words
+
+
+# ----- Rule tables -----
+
+_AFTER_NUMBER = re.compile(r'\d\s?$')
+# Versions and addresses ("1.2.3") are read part by part, never as a decimal
+_DOTTED_NUMBER = re.compile(r'(?<![\d.,])\d+(?:\.\d+){2,}(?!\d)')
+
+def _abbreviation_rule(table: Dict[str, str], non_terminal, unit_abbreviations=()) -> Tuple[re.Pattern, Callable]:
+    """One alternation over all abbreviations (longest first); "т.е." also matches "т. е." """
+    patterns = []
+    for key in sorted(table, key=len, reverse=True):
+        pattern = re.escape(key).replace(r'\ ', r'\s+').replace(r'\.', r'\.\s?')
+        patterns.append(pattern[:-3] if pattern.endswith(r'\s?') else pattern)
+    lookup = {re.sub(r'\s+', '', k).lower(): v for k, v in table.items()}
+    lookup_non_terminal = {re.sub(r'\s+', '', k).lower() for k in non_terminal}
+    lookup_units = {re.sub(r'\s+', '', k).lower() for k in unit_abbreviations}
+
+    def expand(m):
+        key = re.sub(r'\s+', '', m.group(0)).lower()
+        if key in lookup_units and _AFTER_NUMBER.search(m.string, 0, m.start()):
+            return m.group(0)
+        words = lookup[key]
+        if m.group(0)[0].isupper() and words[0].islower():
+            words = words[0].upper() + words[1:]   # "См." starts a sentence: "Смотри"
+        rest = m.string[m.end():].lstrip()
+        # Keep the full stop when the abbreviation also ends the sentence
+        if key.endswith('.') and key not in lookup_non_terminal and (not rest or rest[0].isupper()):
+            words += '.'
+        return words
+
+    return re.compile(r'(?<!\w)(?:' + '|'.join(patterns) + r')(?!\w)', re.IGNORECASE), expand
+
+
+_EN_ABBREVIATION_RULE = _abbreviation_rule({**_EN_TITLES, **_EN_ABBREVIATIONS}, _EN_NON_TERMINAL)
+_TEMPERATURE = r'(?<![\w.,])([-−–])?(\d+(?:[.,]\d+)?)\s?°\s?([CСF](?!\w))?'
+_EN_MONTH_NAMES = '|'.join(sorted(list(_EN_MONTHS) + [name.capitalize() for name in _EN_MONTH_ABBREVIATIONS],
+                                  key=len, reverse=True))
+_EN_RULES = [
+    (re.compile(r'\bNo\.\s?(?=\d)'), lambda m: "number "),
+    (re.compile(_TEMPERATURE), _en_temperature),
+    (re.compile(r'([$€£])\s?(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{2}))?\b'), _en_currency),
+    (re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b'), _en_iso_date),
+    (re.compile(r'\b(\d{1,2})/(\d{1,2})/(\d{4})\b'), _en_us_date),
+    (re.compile(r'\b(' + _EN_MONTH_NAMES + r')\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(\d{4})\b)?'),
+     _en_month_day),
+    (re.compile(r'\b(\d{1,2}):(\d{2})\b'), _en_time),
+    (re.compile(r"(?:\b|')(\d{3}0|\d0)'?s\b"), _en_decade),
+    (re.compile(r'\b(\d+(?:\.\d+)?)\s?%'), lambda m: f"{_en_number(m.group(1))} percent"),
+    (re.compile(r'\b(\d+(?:\.\d+)?)\s?(' + '|'.join(map(re.escape, _EN_UNITS)) + r')\b'),
+     lambda m: _en_count(m.group(1), _EN_UNITS[m.group(2)])),
+    (re.compile(r'\b(\d+)(?:st|nd|rd|th)\b'), lambda m: en_ordinal(int(m.group(1)))),
+    (_DOTTED_NUMBER, lambda m: ' point '.join(_en_number(part) for part in m.group(0).split('.'))),
+    (re.compile(r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?'), _en_year_or_number),
+]
+
+_RU_NUMBER = r'\d{1,3}(?:[ \u00a0\u202f]\d{3})+|\d+'
+_RU_UNIT_NAMES = '|'.join(sorted(map(re.escape, _RU_UNITS_OF_MEASURE), key=len, reverse=True))
+_RU_ABBREVIATION_RULE = _abbreviation_rule(_RU_ABBREVIATIONS, _RU_NON_TERMINAL, _RU_UNIT_ABBREVIATIONS)
+# "г." after a year; a date already says "года", so its "г." is consumed with it
+_RU_YEAR_MARK = r'\s?г(?:\.|(?=[\s,;:!?]|$))'
+_RU_RULES = [
+    # Dates first, so their year is not taken by the year rule and "12.12" not read as a decimal
+    (re.compile(r'\b(\d{4})-(\d{2})-(\d{2})\b(?:' + _RU_YEAR_MARK + ')?'), _ru_iso_date),
+    (re.compile(r'\b(\d{1,2})\.(\d{1,2})\.(\d{4})\b(?:' + _RU_YEAR_MARK + ')?'), _ru_date),
+    (re.compile(r'\b(\d{1,2})\s+(' + '|'.join(_RU_MONTHS) + r')(?:\s+(\d{4})(?:\s+года|' + _RU_YEAR_MARK + r')?)?(?!\w)'),
+     _ru_day_month),
+    (re.compile(r'(?<!\w)(\d{4})' + _RU_YEAR_MARK),
+     lambda m: f"{ru_ordinal(int(m.group(1)), 'gen')} года" + _keep_period(m)),
+    (re.compile(r'(?<!\w)(\d{4})\s+(год|года|году)(?!\w)', re.IGNORECASE), _ru_year),
+    (re.compile(_TEMPERATURE), _ru_temperature),
+    (re.compile(r'(' + _RU_NUMBER + r')(?:[,.](\d{1,2}))?\s?(тыс\.?|млн|млрд)?\s?(₽|руб\.?|р\.)(?!\w)',
+                re.IGNORECASE), _ru_currency_after),
+    (re.compile(r'([$€])\s?(' + _RU_NUMBER + r')(?:[,.](\d{2}))?'), _ru_currency_before),
+    (re.compile(r'\b(\d{1,2}):(\d{2})\b'), _ru_time),
+    (re.compile(r'(\d+(?:[,.]\d+)?)\s?(' + _RU_UNIT_NAMES + r')\.?(?!\w)'),
+     lambda m: _ru_count(m.group(1), *_RU_UNITS_OF_MEASURE[m.group(2)]) + _keep_period(m)),
+    (re.compile(r'\b(\d+)-(' + '|'.join(sorted(_RU_ORDINAL_SUFFIX, key=len, reverse=True)) + r')\b'),
+     lambda m: ru_ordinal(int(m.group(1)), _RU_ORDINAL_SUFFIX[m.group(2)])),
+    (_DOTTED_NUMBER, lambda m: ' точка '.join(_ru_number(part)[0] for part in m.group(0).split('.'))),
+    (re.compile(r'(?<![\d.,])(' + _RU_NUMBER + r')(?=\s([а-яё]+))', re.IGNORECASE), _ru_counted),
+    (re.compile(r'(?:' + _RU_NUMBER + r')(?:[,.]\d+)?'),
+     lambda m: _ru_number(m.group(0))[0]),
+]
+
+_RULES = {"en": (_EN_ABBREVIATION_RULE, _EN_RULES), "ru": (_RU_ABBREVIATION_RULE, _RU_RULES)}
+# Every number rule needs a digit; sentences without one only get abbreviations expanded
+_HAS_DIGIT = re.compile(r'\d')
+
+
+@lru_cache(maxsize=SENTENCE_CACHE_SIZE)
+def normalize_sentence(sentence: str, language: str) -> str:
+    (pattern, replace), number_rules = _RULES[language]
+    sentence = pattern.sub(replace, sentence)
+    if _HAS_DIGIT.search(sentence):
+        for pattern, replace in number_rules:
+            sentence = pattern.sub(replace, sentence)
+    return sentence
+
+
+def normalize_text(text: str, language: str = "en") -> str:
+    """Expand numbers, dates, currency and abbreviations into words"""
+    if language not in _RULES:
+        return text
+    parts = sentence_parts(text)
+    # Odd indexes are the whitespace separators kept by the split
+    return ''.join(part if i % 2 else normalize_sentence(part, language) for i, part in enumerate(parts))
+
+
+_SSML_TEXT = re.compile(r'(?<=>)([^<]+)(?=<)')
+
+
+def normalize_ssml(ssml: str, language: str = "en") -> str:
+    """Normalize only the text between SSML tags, leaving the markup untouched"""
+    if language not in _RULES:
+        return ssml
+    return _SSML_TEXT.sub(lambda m: normalize_text(m.group(1), language), ssml)
@@ -0,0 +1,72 @@
+import re
+from typing import List
+
+# Silero models degrade (or fail outright) on very long inputs, so longer
+# texts are fed to the model one sentence-sized chunk at a time.
+MAX_CHUNK_CHARS = 800
+
+# A sentence ends at [.!?…] only when the next one starts like a sentence: with a
+# capital, a quote, a bracket or a dialogue dash. "5 тыс. руб." stays in one piece.
+_SENTENCE_END = re.compile(r'(?<=[.!?…])(\s+)(?=[A-ZА-ЯЁ"«“(\[—–])')
+_CLAUSE_END = re.compile(r'(?<=[,;:—])\s+')
+# Abbreviations that are followed by a capital without ending the sentence
+NON_TERMINAL_ABBREVIATIONS = {
+    "mr.", "mrs.", "ms.", "dr.", "prof.", "st.", "jr.", "sr.", "vs.", "no.", "e.g.", "i.e.", "approx.",
+    "jan.", "feb.", "mar.", "apr.", "jun.", "jul.", "aug.", "sep.", "sept.", "oct.", "nov.", "dec.",
+    "г-н.", "г-жа.", "ул.", "им.", "см.", "рис.", "стр.", "напр.", "т.е.", "т.к.", "проф.", "акад.",
+}
+
+
+def join_lines(text: str) -> str:
+    """Collapse multiline text into a single line, dropping blank lines"""
+    return ' '.join(line.strip() for line in text.split('\n') if line.strip())
+
+
+def _ends_with_abbreviation(text: str) -> bool:
+    words = text.rsplit(None, 2)
+    return bool(words) and (words[-1].lower() in NON_TERMINAL_ABBREVIATIONS
+            or ''.join(words[-2:]).lower() in NON_TERMINAL_ABBREVIATIONS)   # "т. е."
+
+
+def sentence_parts(text: str) -> List[str]:
+    """Split at sentence ends, keeping the separators: [sentence, space, sentence, ...]"""
+    parts = _SENTENCE_END.split(text)
+    merged = parts[:1]
+    for i in range(1, len(parts), 2):
+        if _ends_with_abbreviation(merged[-1]):
+            merged[-1] += parts[i] + parts[i + 1]
+        else:
+            merged += parts[i:i + 2]
+    return merged
+
+
+def split_sentences(text: str, max_chars: int = MAX_CHUNK_CHARS) -> List[str]:
+    """Split text into sentences, breaking up any that exceed max_chars"""
+    text = join_lines(text)
+    chunks = []
+    for sentence in sentence_parts(text)[::2]:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            chunks.append(sentence)
+        else:
+            chunks.extend(_split_long(sentence, max_chars))
+    return chunks
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Break an overlong sentence on clause boundaries, then on words"""
+    parts = []
+    current = ""
+    for piece in _CLAUSE_END.split(sentence):
+        for word in piece.split(' ') if len(piece) > max_chars else [piece]:
+            candidate = f"{current} {word}".strip()
+            if current and len(candidate) > max_chars:
+                parts.append(current)
+                current = word
+            else:
+                current = candidate
+    if current:
+        parts.append(current)
+    return parts
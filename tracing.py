@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""Lightweight tracing spans and asynchronous logging.
+
+Spans are recorded into a bounded in-memory ring buffer and can be exported
+as Chrome trace JSON (open in chrome://tracing or https://ui.perfetto.dev).
+When the tracer is disabled, ``span()`` returns a shared no-op context
+manager, so instrumented hot paths pay only an attribute check.
+
+Set ``VOXIOM_TRACE=trace.json`` to enable tracing at startup and write the
+trace to that path on exit.
+"""
+import os
+import json
+import queue
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOGGER_NAME = "voxiom"
+
+
+class _NullSpan:
+    """Shared no-op span returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "name", "args", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: dict):
+        self._tracer = tracer
+        self.name = name
+        self.args = args
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self._tracer._record(self.name, self._start, end, self.args)
+        return False
+
+    def set(self, **args):
+        """Attach extra arguments to the span while it is open"""
+        self.args.update(args)
+
+
+class Tracer:
+    def __init__(self, capacity: int = 20000):
+        self.enabled = False
+        self._events = deque(maxlen=capacity)
+        self._pid = os.getpid()
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def span(self, name: str, **args):
+        """Time a block of code: ``with tracer.span("tts.apply_tts", model=name):``"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def _record(self, name: str, start_ns: int, end_ns: int, args: dict):
+        # deque.append is atomic, so no lock is needed on the hot path
+        self._events.append((name, start_ns, end_ns, threading.get_ident(), args))
+
+    def clear(self):
+        self._events.clear()
+
+    def summary(self) -> dict:
+        """Aggregate count and total/max duration (ms) per span name"""
+        stats = {}
+        for name, start, end, _, _ in list(self._events):
+            duration = (end - start) / 1e6
+            entry = stats.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += duration
+            entry["max_ms"] = max(entry["max_ms"], duration)
+        return stats
+
+    def to_chrome_trace(self) -> dict:
+        """Return buffered spans in Chrome trace event format"""
+        events = []
+        for name, start, end, tid, args in list(self._events):
+            events.append({
+                "name": name,
+                "cat": name.split('.', 1)[0],
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self._pid,
+                "tid": tid,
+                "args": {k: str(v) for k, v in args.items()}
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> bool:
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome_trace(), f)
+            return True
+        except Exception as e:
+            print(f"Failed to export trace: {e}")
+            return False
+
+
+tracer = Tracer()
+
+_listener: Optional[QueueListener] = None
+
+
+def get_logger(name: str = "") -> logging.Logger:
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def setup_logging(log_file: str = "error_log.txt", level: int = logging.INFO,
+                  console: bool = True) -> logging.Logger:
+    """Route voxiom logs through a background thread so callers never block on file I/O"""
+    global _listener
+    logger = get_logger()
+    if _listener is not None:
+        return logger
+
+    handlers = []
+    file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+    file_handler.setLevel(logging.ERROR)
+    file_handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s\n"))
+    handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def shutdown_logging():
+    """Flush pending log records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _init_from_env():
+    trace_path = os.environ.get("VOXIOM_TRACE")
+    if trace_path:
+        tracer.enable()
+        atexit.register(tracer.export_chrome_trace, trace_path)
+
+
+_init_from_env()
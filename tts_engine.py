@@ -1,44 +1,57 @@
+from __future__ import annotations
+
 import os
-import json
-import torch
+import hashlib
+import time
+import threading
+import numpy as np
+import metrics
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from text_utils import join_lines, split_sentences
+from text_normalizer import normalize_ssml, normalize_text
+from tracing import tracer
+from presets import get_store, memory_store
+import model_optimizer
+from backends import InferenceBackend, create_backend
+from model_registry import RANDOM_SPEAKERS, get_registry
+
+WARMUP_TEXT = {"en": "Hello.", "ru": "Привет."}
+GALLERY_TEXT = {"en": "Hello! This is how my voice sounds.", "ru": "Привет! Так звучит мой голос."}
+
+
+class SynthesisError(ValueError):
+    """The model itself failed on a valid request"""
+
 
 class SileroTTS:
-    def __init__(self, models_dir: str = 'models/tts'):
+    def __init__(self, models_dir: str = 'models/tts', backend: Optional[InferenceBackend] = None):
         self.models_dir = os.path.normpath(models_dir)
         os.makedirs(self.models_dir, exist_ok=True)
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.backend = backend or create_backend()
 
         self.models = {}
+        # Default model for callers that don't name one; requests resolve it once,
+        # so switching it never affects a synthesis that is already under way
         self.current_model = None
+        self._model_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._warm_voices = set()   # (model, speaker) pairs that have been through apply_tts
+        self._local = threading.local()   # per-thread (chars, seconds) of the last synthesis
+        self._hashes: Dict[str, tuple] = {}
+        self.text_normalization = True   # expand numbers, dates and abbreviations before synthesis
+        self.duration_estimator = None   # calibrated from every plain-text synthesis when set
+        self.optimize_models = model_optimizer.enabled()   # freeze TorchScript models on load
 
-        self.supported_models = {
-            "v3_en": {
-                "file": "v3_en.pt",
-                "sample_rates": [8000, 24000, 48000],  # Note: plural
-                "speakers": [f'en_{i}' for i in range(118)],
-                "default_rate": 48000
-            },
-            "v3_1_ru": {
-                "file": "v3_1_ru.pt",
-                "sample_rates": [8000, 24000, 48000],  # Note: plural
-                "speakers": ['aidar', 'baya', 'kseniya', 'xenia', 'eugene', 'random'],
-                "default_rate": 48000
-            },
-            "v4_ru": {
-                "file": "v4_ru.pt",
-                "sample_rates": [8000, 24000, 48000],  # Note: plural
-                "speakers": ['aidar', 'baya', 'kseniya', 'xenia', 'eugene', 'random'],
-                "default_rate": 48000,
-                "supports_ssml": True
-            }
-        }
+        self.supported_models = get_registry(self.models_dir).synthesis_models()
 
         self.presets = self._load_presets()
 
-    def _load_presets(self) -> dict:
-        presets_path = os.path.join(os.path.dirname(__file__), 'presets.json')
+    @property
+    def device(self):
+        return self.backend.device
+
+    def _load_presets(self):
         default_presets = {
             "General": {
                 "default": {
@@ -49,107 +62,221 @@ class SileroTTS:
         }
 
         try:
-            with open(presets_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError as e:
-            print(f"Invalid JSON in presets file: {e}")
-            return default_presets
+            return get_store()
         except Exception as e:
             print(f"Failed to load presets: {e}")
-            return default_presets
+            # Same interface as the real store (subscribe, save, names...), just not persisted
+            return memory_store(default_presets)
 
-    def load_model(self, model_name: str) -> bool:
+    def _model_lock(self, model_name: str) -> threading.Lock:
+        """One inference lock per model: a model runs one request at a time, different models in parallel"""
+        with self._locks_guard:
+            lock = self._model_locks.get(model_name)
+            if lock is None:
+                lock = self._model_locks[model_name] = threading.Lock()
+            return lock
+
+    def load_model(self, model_name: str, activate: bool = True) -> bool:
+        """Load a model; with activate=False it is only made available to speak(model_name=...)"""
+        if model_name in self.models:
+            # Already loaded: don't queue behind a synthesis holding the model's lock
+            if activate:
+                self.current_model = model_name
+            return True
+        with self._model_lock(model_name), tracer.span("tts.load_model", model=model_name):
+            if model_name in self.models:
+                success = True   # loaded by another thread while this one waited
+            else:
+                start = time.perf_counter()
+                success = self._load_model(model_name)
+                metrics.record_model_load(model_name, time.perf_counter() - start, success)
+            if success and activate:
+                self.current_model = model_name
+        return success
+
+    def _load_model(self, model_name: str) -> bool:
         try:
             if model_name not in self.supported_models:
                 raise ValueError(f"Model {model_name} not supported")
 
             model_path = os.path.join(self.models_dir, self.supported_models[model_name]["file"])
 
-            if not os.path.exists(model_path):
+            if self.backend.needs_model_file and not os.path.exists(model_path):
                 raise FileNotFoundError(f"Model file not found: {model_path}")
 
-            # Clear CUDA cache before loading
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-
-            # Try standard loading first
-            try:
-                model = torch.jit.load(model_path, map_location=self.device)
-            except Exception:
-                # Fallback to PackageImporter
-                importer = torch.package.PackageImporter(model_path)
-                model = importer.load_pickle("tts_models", "model")
-
-            model.to(self.device)
-            self.models[model_name] = model
-            self.current_model = model_name
+            sha256 = self.model_hash(model_name) if self.optimize_models else None
+            self.models[model_name] = self.backend.load(model_name, model_path, sha256)
             return True
 
         except Exception as e:
             print(f"Model loading failed: {str(e)}")
             return False
 
+    def model_hash(self, model_name: str, compute: bool = True) -> Optional[str]:
+        """SHA-256 of a model file, memoized until the file's size or mtime changes.
+
+        With compute=False only a memoized hash is returned; the file is never
+        read, so it is safe to call on the Tk thread.
+        """
+        path = os.path.join(self.models_dir, self.get_model_info(model_name)["file"])
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._hashes.get(model_name)
+        if cached and cached[0] == signature:
+            return cached[1]
+        if not compute:
+            return None
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self._hashes[model_name] = (signature, digest.hexdigest())
+        return self._hashes[model_name][1]
+
     def get_model_info(self, model_name: str) -> dict:
         """Get complete model configuration"""
         if model_name not in self.supported_models:
             raise ValueError(f"Model {model_name} not supported")
         return self.supported_models[model_name]
 
-    def speak(self, text: str, speaker: str = None, ssml: bool = False) -> torch.Tensor:
-        if not self.current_model:
+    def speak(self, text: str, speaker: str = None, ssml: bool = False,
+              sample_rate: Optional[int] = None, model_name: Optional[str] = None) -> np.ndarray:
+        """Synthesize text to mono float32 audio"""
+        model_name = model_name or self.current_model
+        if not model_name:
             raise ValueError("No model loaded")
-
-        model = self.models[self.current_model]
-        config = self.supported_models[self.current_model]
+        model = self.models.get(model_name)
+        if model is None:
+            raise ValueError(f"Model {model_name} is not loaded")
+        config = self.supported_models[model_name]
 
         if not speaker:
             speaker = config["speakers"][0]
 
-        # Clean and prepare text
-        text = text.strip()
-        if not text:
-            raise ValueError("Empty text input")
+        if sample_rate is None:
+            sample_rate = config["default_rate"]
+        elif sample_rate not in config["sample_rates"]:
+            raise ValueError(f"Sample rate {sample_rate} not supported by {model_name}")
 
-        # Handle multiline text
-        text = ' '.join(line.strip() for line in text.split('\n') if line.strip())
+        observed_text = None
+        with tracer.span("tts.preprocess", chars=len(text)):
+            # Clean and prepare text
+            text = text.strip()
+            if not text:
+                raise ValueError("Empty text input")
 
-        try:
-            if self.current_model == "v4_ru":
-                if ssml:
-                    if not text.startswith("<speak>"):
-                        text = f"<speak>{text}</speak>"
-                    return model.apply_tts(
-                        ssml_text=text,
-                        speaker=speaker,
-                        sample_rate=config["default_rate"]
-                    )
-                else:
-                    # Remove any SSML tags if not in SSML mode
-                    text = text.replace("<speak>", "").replace("</speak>", "")
-                    text = text.replace("<prosody", "").replace(">", "")
-                    text = text.replace("<break", "").replace("/>", "")
-                    return model.apply_tts(
-                        text=text,
-                        speaker=speaker,
-                        sample_rate=config["default_rate"]
-                    )
-            else:  # v3 models
-                # Always remove SSML tags for non-SSML models
+            # Handle multiline text
+            text = join_lines(text)
+
+            if ssml and self.supports_ssml(model_name):
+                if not text.startswith("<speak>"):
+                    text = f"<speak>{text}</speak>"
+                if self.text_normalization:
+                    text = normalize_ssml(text, config.get("language"))
+                text_args = {"ssml_text": text}
+            else:
+                # Remove any SSML tags if not in SSML mode (v3 models never support it)
                 text = text.replace("<speak>", "").replace("</speak>", "")
                 text = text.replace("<prosody", "").replace(">", "")
                 text = text.replace("<break", "").replace("/>", "")
-                return model.apply_tts(
-                    text=text,
-                    speaker=speaker,
-                    sample_rate=config["default_rate"]
-                )
+                observed_text = text
+                if self.text_normalization:
+                    text = normalize_text(text, config.get("language"))
+                text_args = {"text": text}
+
+        try:
+            with self._model_lock(model_name), \
+                    tracer.span("tts.apply_tts", model=model_name, speaker=speaker, chars=len(text)):
+                # Timed inside the lock: waiting for another caller's synthesis is not latency
+                start = time.perf_counter()
+                audio = self.backend.synthesize(model, speaker=speaker, sample_rate=sample_rate,
+                                                **text_args)
+                elapsed = time.perf_counter() - start
         except Exception as e:
-            raise ValueError(f"Speech generation failed: {str(e)}")
+            metrics.record_failure(model_name, speaker)
+            raise SynthesisError(f"Speech generation failed: {str(e)}")
+
+        audio_seconds = audio.shape[-1] / sample_rate
+        self._local.synthesis = (len(text), elapsed)
+        metrics.record_synthesis(model_name, speaker, len(text), audio_seconds, elapsed)
+        if self.duration_estimator is not None and observed_text:
+            # Calibrate on the text as written, which is what estimates are made from
+            self.duration_estimator.observe(model_name, speaker, observed_text, audio_seconds)
+        self._warm_voices.add((model_name, speaker))
+        return audio
+
+    def last_synthesis(self) -> Tuple[int, float]:
+        """(characters sent to the model, seconds in the model) of this thread's last speak call"""
+        return getattr(self._local, "synthesis", (0, 0.0))
+
+    def is_voice_warm(self, speaker: str, model_name: Optional[str] = None) -> bool:
+        return ((model_name or self.current_model), speaker) in self._warm_voices
+
+    def warm_voice(self, speaker: Optional[str] = None, model_name: Optional[str] = None,
+                   sample_rate: Optional[int] = None) -> bool:
+        """Run a tiny synthesis the first time a voice is used; returns True if it ran.
 
-    def get_voices(self) -> List[str]:
-        if not self.current_model:
+        The TorchScript models resolve the speaker and specialise their graphs
+        inside apply_tts and expose no conditioning tensors to cache. Running
+        one short sentence per voice therefore takes that cost off the first
+        real request.
+        """
+        model_name = model_name or self.current_model
+        config = self.supported_models.get(model_name)
+        if config is None or model_name not in self.models:
+            return False
+        speaker = speaker or config["speakers"][0]
+        if (model_name, speaker) in self._warm_voices:
+            return False
+        with tracer.span("tts.warm_voice", model=model_name, speaker=speaker):
+            self.speak(WARMUP_TEXT.get(config.get("language"), WARMUP_TEXT["en"]), speaker=speaker,
+                       sample_rate=sample_rate, model_name=model_name)
+        return True
+
+    def render_gallery(self, speakers: Optional[Iterable[str]] = None, text: Optional[str] = None,
+                       model_name: Optional[str] = None, sample_rate: Optional[int] = None,
+                       stop_event: Optional[threading.Event] = None) -> Iterator[Tuple[str, np.ndarray]]:
+        """Render one short preview per speaker in a single pass, yielding (speaker, audio)"""
+        model_name = model_name or self.current_model
+        config = self.get_model_info(model_name)
+        text = text or GALLERY_TEXT.get(config.get("language"), GALLERY_TEXT["en"])
+        with tracer.span("tts.render_gallery", model=model_name):
+            for speaker in (speakers or self.get_voices(model_name)):
+                if stop_event is not None and stop_event.is_set():
+                    return
+                yield speaker, self.speak(text, speaker=speaker, sample_rate=sample_rate,
+                                          model_name=model_name)
+
+    def speak_stream(self, text: str, speaker: str = None, ssml: bool = False,
+                     sample_rate: Optional[int] = None,
+                     model_name: Optional[str] = None) -> Iterator[np.ndarray]:
+        """Yield audio sentence by sentence so playback can start early"""
+        model_name = model_name or self.current_model
+        if ssml and self.supports_ssml(model_name):
+            # SSML documents can't be split without breaking the markup
+            yield self.speak(text, speaker=speaker, ssml=True, sample_rate=sample_rate,
+                             model_name=model_name)
+            return
+
+        chunks = split_sentences(text)
+        if not chunks:
+            raise ValueError("Empty text input")
+        for chunk in chunks:
+            yield self.speak(chunk, speaker=speaker, sample_rate=sample_rate, model_name=model_name)
+
+    def get_voices(self, model_name: Optional[str] = None) -> List[str]:
+        """Selectable voices; speak() also accepts the random ones, which this leaves out"""
+        model_name = model_name or self.current_model
+        if not model_name:
             return []
-        return self.supported_models[self.current_model]["speakers"]
+        return [s for s in self.supported_models[model_name]["speakers"] if s not in RANDOM_SPEAKERS]
+
+    def capabilities(self, model_name: Optional[str] = None) -> dict:
+        return self.backend.capabilities(self.get_model_info(model_name or self.current_model))
 
-    def supports_ssml(self) -> bool:
-        return self.supported_models.get(self.current_model, {}).get("supports_ssml", False)
+    def supports_ssml(self, model_name: Optional[str] = None) -> bool:
+        config = self.supported_models.get(model_name or self.current_model)
+        return bool(config) and self.backend.capabilities(config)["ssml"]
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import time
+import threading
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from audio_cache import AudioCache
+from tracing import get_logger
+from tts_engine import GALLERY_TEXT
+
+logger = get_logger("voice_previews")
+
+PREVIEW_SAMPLE_RATE = 24000
+
+
+class VoicePreviewCache:
+    """Short per-speaker preview clips, pre-rendered in the background.
+
+    Clips are stored as FLAC under a namespace derived from the model file's
+    hash, so a re-downloaded or updated model never serves stale previews and
+    the clips survive restarts. The worker renders only while `is_idle()` is
+    true and renders the selected speaker first.
+    """
+
+    def __init__(self, tts, cache_dir: str, is_idle: Callable[[], bool] = lambda: True,
+                 sample_rate: int = PREVIEW_SAMPLE_RATE, idle_poll: float = 1.0):
+        self.tts = tts
+        self.cache = AudioCache(cache_dir, name="voice_previews", memory_items=16)
+        self.is_idle = is_idle
+        self.sample_rate = sample_rate
+        self.idle_poll = idle_poll
+        self._generation = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._job: Optional[Tuple[int, str, List[str]]] = None
+        self._thread = threading.Thread(target=self._worker, name="voice-previews", daemon=True)
+        self._thread.start()
+
+    def _namespace(self, model_name: str, compute: bool = True) -> Optional[str]:
+        model_hash = self.tts.model_hash(model_name, compute=compute)
+        return f"{model_name}-{model_hash[:16]}" if model_hash else None
+
+    def _key(self, model_name: str, speaker: str) -> str:
+        language = self.tts.supported_models[model_name].get("language")
+        return AudioCache.make_key(speaker, GALLERY_TEXT.get(language, GALLERY_TEXT["en"]), self.sample_rate)
+
+    def lookup(self, model_name: str, speaker: str) -> Optional[Tuple[np.ndarray, int]]:
+        """Return (audio, sample_rate) for a rendered preview, or None.
+
+        Called on the Tk thread, so a model whose hash is not known yet
+        counts as a miss instead of hashing the file here.
+        """
+        namespace = self._namespace(model_name, compute=False)
+        if namespace is None:
+            return None
+        return self.cache.get(namespace, self._key(model_name, speaker))
+
+    def store(self, model_name: str, speaker: str, audio) -> bool:
+        namespace = self._namespace(model_name)
+        if namespace is None:
+            return False
+        return self.cache.put(namespace, self._key(model_name, speaker),
+                              np.asarray(audio, dtype=np.float32), self.sample_rate)
+
+    def missing(self, model_name: str, speakers: List[str]) -> List[str]:
+        """Speakers without a rendered preview; all of them while the model's hash is unknown"""
+        namespace = self._namespace(model_name, compute=False)
+        if namespace is None:
+            return list(speakers)
+        return [s for s in speakers if not self.cache.contains(namespace, self._key(model_name, s))]
+
+    def schedule(self, model_name: str, preferred_speaker: Optional[str] = None):
+        """(Re)start background rendering for a model's speakers"""
+        speakers = list(self.tts.get_voices(model_name))
+        if preferred_speaker in speakers:
+            speakers.remove(preferred_speaker)
+            speakers.insert(0, preferred_speaker)
+        self._generation += 1
+        self._job = (self._generation, model_name, speakers)
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _worker(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            job = self._job
+            if job is None:
+                continue
+            generation, model_name, speakers = job
+            try:
+                if self._namespace(model_name) is None:   # hashes the model here, off the Tk thread
+                    continue
+                for speaker in self.missing(model_name, speakers):
+                    while not self.is_idle() and not self._stop.is_set():
+                        time.sleep(self.idle_poll)
+                    if self._stop.is_set() or generation != self._generation:
+                        break
+                    if not self.missing(model_name, [speaker]):
+                        continue    # rendered by the gallery in the meantime
+                    for _, audio in self.tts.render_gallery([speaker], model_name=model_name,
+                                                            sample_rate=self.sample_rate):
+                        self.store(model_name, speaker, audio)
+            except Exception as e:
+                logger.warning(f"Voice preview rendering stopped: {e}")